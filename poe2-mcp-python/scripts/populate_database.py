@@ -22,7 +22,7 @@ from src.database.manager import DatabaseManager
 from src.database.models import Item, UniqueItem, SkillGem, SupportGem, GameDataVersion
 from src.utils.scraper import PoE2DataScraper
 from src.api.poe_ninja_api import PoeNinjaAPI
-from src.api.rate_limiter import RateLimiter
+from src.api.rate_limiter import RateLimiter, request_priority
 
 logging.basicConfig(
     level=logging.INFO,
@@ -354,7 +354,9 @@ async def main():
 
     try:
         await populator.initialize()
-        await populator.populate_all()
+        # Bulk scraping: never delays interactive requests sharing a limiter
+        with request_priority("background"):
+            await populator.populate_all()
 
     except KeyboardInterrupt:
         logger.info("Population interrupted by user")
@@ -5,24 +5,36 @@ Finds top ladder players using similar skills for comparison
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
 
 try:
-    from ..api.poe_ninja_api import PoeNinjaAPI
+    from ..config import settings
     from ..api.character_fetcher import CharacterFetcher
     from ..api.cache_manager import CacheManager
-    from ..api.rate_limiter import RateLimiter
+    from ..api.http_client import HTTPClientFactory
+    from ..api.circuit_breaker import CircuitBreakerRegistry
+    from ..api.ladder_snapshot import LadderSnapshotStore
+    from ..api.rate_limiter import MultiRateLimiter, RateLimiter, request_priority
     from .character_comparator import CharacterComparator
 except ImportError:
-    from src.api.poe_ninja_api import PoeNinjaAPI
+    from src.config import settings
     from src.api.character_fetcher import CharacterFetcher
     from src.api.cache_manager import CacheManager
-    from src.api.rate_limiter import RateLimiter
+    from src.api.http_client import HTTPClientFactory
+    from src.api.circuit_breaker import CircuitBreakerRegistry
+    from src.api.ladder_snapshot import LadderSnapshotStore
+    from src.api.rate_limiter import MultiRateLimiter, RateLimiter, request_priority
     from src.analyzer.character_comparator import CharacterComparator
 
 logger = logging.getLogger(__name__)
 
 
+class SimilarPlayers(NamedTuple):
+    """Result of TopPlayerFetcher.find_similar_top_players()"""
+    players: List[Dict[str, Any]]
+    complete: bool = True  # False when the search stopped at its deadline
+
+
 class TopPlayerFetcher:
     """
     Fetch top ladder players using similar skills for comparison
@@ -31,18 +43,26 @@ class TopPlayerFetcher:
     def __init__(
         self,
         cache_manager: Optional[CacheManager] = None,
-        rate_limiter: Optional[RateLimiter] = None
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limiters: Optional[MultiRateLimiter] = None,
+        http_clients: Optional[HTTPClientFactory] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        ladder_snapshots: Optional[LadderSnapshotStore] = None
     ):
         self.cache_manager = cache_manager
-        self.rate_limiter = rate_limiter or RateLimiter(rate_limit=5)
-        self.ninja_api = PoeNinjaAPI(
-            rate_limiter=self.rate_limiter,
-            cache_manager=self.cache_manager
-        )
+        self.rate_limiters = rate_limiters or MultiRateLimiter.from_config()
+        # poe.ninja limiter; ladder requests use the registry's pathofexile.com one
+        self.rate_limiter = rate_limiter or self.rate_limiters.get_limiter("poe_ninja")
         self.char_fetcher = CharacterFetcher(
             cache_manager=self.cache_manager,
-            rate_limiter=self.rate_limiter
+            rate_limiter=self.rate_limiter,
+            rate_limiters=self.rate_limiters,
+            http_clients=http_clients,
+            circuit_breakers=circuit_breakers,
+            ladder_snapshots=ladder_snapshots
         )
+        # Same poe.ninja client as the character fetcher's
+        self.ninja_api = self.char_fetcher.ninja_api
         self.comparator = CharacterComparator()
 
     async def find_similar_top_players(
@@ -50,19 +70,29 @@ class TopPlayerFetcher:
         user_character: Dict[str, Any],
         league: str = "Standard",
         min_level: int = None,
-        limit: int = 10
-    ) -> List[Dict[str, Any]]:
+        limit: int = 10,
+        deadline: Optional[float] = None
+    ) -> SimilarPlayers:
         """
         Find top players using similar skills
 
+        Ladder pages stream into a pool of character fetches (see
+        CharacterFetcher.stream_characters) and every character is checked
+        for skill overlap as soon as it arrives. The search stops, cancelling
+        the fetches still running, once `limit` matches are found or the
+        deadline passes; the result's complete flag tells which.
+
         Args:
             user_character: User's character data
             league: League to search in
             min_level: Minimum level filter (defaults to user level)
             limit: Maximum number of characters to return
+            deadline: Seconds the search may take (default
+                TOP_PLAYER_SEARCH_DEADLINE, 0 = no limit)
 
         Returns:
-            List of similar character data
+            SimilarPlayers with the similar character data, in ladder order,
+            and whether the search finished before its deadline
         """
         logger.info("Finding similar top players...")
 
@@ -74,47 +104,60 @@ class TopPlayerFetcher:
         if not min_level:
             min_level = user_level
 
+        if deadline is None:
+            deadline = settings.TOP_PLAYER_SEARCH_DEADLINE
+
         logger.info(f"User skills: {user_skills}")
         logger.info(f"Searching for players level {min_level}+ in {league}")
 
-        # Get top characters from official ladder API
-        ladder_characters = await self.char_fetcher.get_top_ladder_characters(
-            league=league,
-            limit=limit * 5,  # Get more to filter by skills
-            min_level=min_level,
-            class_filter=user_class if user_class not in ["Unknown", ""] else None
-        )
-
-        logger.info(f"Found {len(ladder_characters)} characters from ladder")
+        # Ladder entries seen so far, with their position on the ladder
+        candidates: Dict[Tuple[str, str, str], Tuple[int, Dict[str, Any]]] = {}
+
+        async def ladder_batches() -> AsyncIterator[List[Tuple[str, str, str]]]:
+            # Get top characters from official ladder API, a page at a time
+            async for page in self.char_fetcher.iter_top_ladder_pages(
+                league=league,
+                limit=limit * 5,  # Get more to filter by skills
+                min_level=min_level,
+                class_filter=user_class if user_class not in ["Unknown", ""] else None
+            ):
+                batch = []
+                for ladder_entry in page:
+                    account = ladder_entry.get("account", "")
+                    character = ladder_entry.get("character", "")
+                    # Skip dead characters in hardcore
+                    if ladder_entry.get("dead", False) or not account or not character:
+                        continue
+                    request = (account, character, league)
+                    candidates.setdefault(request, (len(candidates), ladder_entry))
+                    batch.append(request)
+                yield batch
+
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline if deadline > 0 else None
+        similar: List[Tuple[int, Dict[str, Any]]] = []
+        complete = True
+
+        # Character fetches are bulk work, so they yield to interactive requests
+        results = self.char_fetcher.stream_characters(ladder_batches())
+        try:
+            with request_priority("background"):
+                while len(similar) < limit:
+                    timeout = None
+                    if deadline_at is not None:
+                        timeout = deadline_at - loop.time()
+                        if timeout <= 0:
+                            raise asyncio.TimeoutError()
+                    try:
+                        result = await asyncio.wait_for(results.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        break
+
+                    char_data = result.data
+                    if not char_data:
+                        logger.debug(f"Failed to fetch {result.character}: {result.error}")
+                        continue
 
-        if not ladder_characters:
-            logger.warning("No characters found on ladder for this league")
-            return []
-
-        # Filter and fetch full character data
-        similar_characters = []
-
-        for ladder_entry in ladder_characters:
-            # Skip dead characters in hardcore
-            if ladder_entry.get("dead", False):
-                continue
-
-            account = ladder_entry.get("account", "")
-            character = ladder_entry.get("character", "")
-            level = ladder_entry.get("level", 0)
-
-            if not account or not character:
-                continue
-
-            try:
-                # Fetch full character data
-                char_data = await self.char_fetcher.get_character(
-                    account,
-                    character,
-                    league
-                )
-
-                if char_data:
                     # Check if skills match
                     char_skills = self.comparator.extract_main_skills(char_data)
 
@@ -125,21 +168,29 @@ class TopPlayerFetcher:
                     # 1. We have skill overlap
                     # 2. OR we couldn't extract user skills (compare all top players)
                     if overlap > 0 or not user_skills:
-                        similar_characters.append(char_data)
-                        logger.info(f"Added {character} (Level {level}, Rank #{ladder_entry.get('rank', '?')}, {overlap} matching skills)")
-
-                        if len(similar_characters) >= limit:
-                            break
+                        position, ladder_entry = candidates[
+                            (result.account, result.character, result.league)
+                        ]
+                        similar.append((position, char_data))
+                        logger.info(f"Added {result.character} (Level {ladder_entry.get('level', 0)}, Rank #{ladder_entry.get('rank', '?')}, {overlap} matching skills)")
+        except asyncio.TimeoutError:
+            complete = False
+            logger.warning(
+                f"Top player search hit its {deadline:g}s deadline with "
+                f"{len(similar)}/{limit} matches"
+            )
+        finally:
+            # Stops the fetches still running
+            await results.aclose()
 
-            except Exception as e:
-                logger.debug(f"Failed to fetch {character}: {e}")
-                continue
+        if not candidates:
+            logger.warning("No characters found on ladder for this league")
 
-            # Rate limiting between character fetches
-            await asyncio.sleep(0.5)
+        # Results arrive in completion order; report them in ladder order
+        similar_characters = [char_data for _, char_data in sorted(similar, key=lambda item: item[0])]
 
         logger.info(f"Found {len(similar_characters)} similar characters")
-        return similar_characters
+        return SimilarPlayers(similar_characters, complete)
 
     async def compare_with_top_players(
         self,
@@ -165,7 +216,7 @@ class TopPlayerFetcher:
         logger.info("Starting comparison with top players...")
 
         # Find similar players
-        top_players = await self.find_similar_top_players(
+        top_players, complete = await self.find_similar_top_players(
             user_character,
             league=league,
             min_level=min_level,
@@ -176,7 +227,12 @@ class TopPlayerFetcher:
             logger.warning("No similar top players found")
             return {
                 "success": False,
-                "message": "Could not find similar top players for comparison",
+                "complete": complete,
+                "message": (
+                    "Could not find similar top players for comparison"
+                    if complete
+                    else "Timed out before any similar top players were found"
+                ),
                 "suggestions": [
                     "Try a different league",
                     "Lower the minimum level requirement",
@@ -192,7 +248,10 @@ class TopPlayerFetcher:
         )
 
         comparison["success"] = True
+        comparison["complete"] = complete
         comparison["message"] = f"Compared against {len(top_players)} top players"
+        if not complete:
+            comparison["message"] += " (search stopped at its deadline; results may be partial)"
 
         return comparison
 
@@ -290,6 +349,5 @@ class TopPlayerFetcher:
         return highlights
 
     async def close(self):
-        """Cleanup resources"""
-        await self.ninja_api.close()
+        """Cleanup resources (the character fetcher also closes the ninja API)"""
         await self.char_fetcher.close()
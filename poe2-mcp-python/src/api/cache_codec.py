@@ -0,0 +1,224 @@
+"""
+Cache value codec
+Compact, versioned binary encoding shared by the Redis and SQLite cache tiers
+"""
+
+import logging
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import msgpack
+import orjson
+
+from .cache_metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class CacheCodecError(Exception):
+    """Raised when a value cannot be encoded or a blob cannot be decoded"""
+    pass
+
+
+# Blob layout: [format version][serializer | compression][payload]
+FORMAT_VERSION = 1
+
+SERIALIZER_MSGPACK = 0x01
+SERIALIZER_ORJSON = 0x02
+_SERIALIZER_MASK = 0x0F
+
+COMPRESSION_NONE = 0x00
+COMPRESSION_ZLIB = 0x10
+COMPRESSION_ZSTD = 0x20
+_COMPRESSION_MASK = 0xF0
+
+_SERIALIZERS = {"msgpack": SERIALIZER_MSGPACK, "orjson": SERIALIZER_ORJSON}
+_COMPRESSIONS = {None: COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+# msgpack extension type for datetimes (stored as ISO strings)
+_EXT_DATETIME = 1
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode("utf-8"))
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode("utf-8"))
+    return msgpack.ExtType(code, data)
+
+
+class CacheCodec:
+    """
+    Serialize cache values to compact, self-describing blobs
+
+    Every blob starts with a format version byte and a byte naming the
+    serializer and compression used, so blobs written with other settings
+    (or by an older version) are still decoded correctly, and unknown
+    formats fail cleanly instead of returning garbage.
+
+    Values must be plain data (dicts, lists, strings, numbers, datetimes);
+    tuples come back as lists.
+    """
+
+    def __init__(
+        self,
+        serializer: str = "msgpack",
+        compression: Optional[str] = "zlib",
+        compress_threshold: int = 1024,
+        compression_level: int = 6
+    ) -> None:
+        """
+        Args:
+            serializer: "msgpack" or "orjson"
+            compression: "zlib", "zstd" or None
+            compress_threshold: Only compress payloads at least this many bytes
+            compression_level: zlib/zstd compression level
+        """
+        if serializer not in _SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        if compression not in _COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard module not installed, falling back to zlib")
+            compression = "zlib"
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+        self.compression_level = compression_level
+
+        self._serializer_id = _SERIALIZERS[serializer]
+        self._compression_id = _COMPRESSIONS[compression]
+        if compression == "zstd":
+            self._zstd_compressor = zstandard.ZstdCompressor(level=compression_level)
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+        # Statistics
+        self.encodes = 0
+        self.decodes = 0
+        self.encode_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.encode_latency = LatencyHistogram()
+        self.decode_latency = LatencyHistogram()
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value to a blob"""
+        return self.encode_with_size(value)[0]
+
+    def encode_with_size(self, value: Any) -> Tuple[bytes, int]:
+        """
+        Encode a value to a blob
+
+        Returns:
+            (blob, uncompressed payload size in bytes)
+
+        Raises:
+            CacheCodecError: If the value is not serializable
+        """
+        started = time.perf_counter()
+        try:
+            if self._serializer_id == SERIALIZER_MSGPACK:
+                payload = msgpack.packb(value, use_bin_type=True, default=_msgpack_default)
+            else:
+                payload = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise CacheCodecError(f"Cannot encode {type(value).__name__}: {e}") from e
+
+        compression_id = COMPRESSION_NONE
+        body = payload
+        if self._compression_id != COMPRESSION_NONE and len(payload) >= self.compress_threshold:
+            if self._compression_id == COMPRESSION_ZLIB:
+                compressed = zlib.compress(payload, self.compression_level)
+            else:
+                compressed = self._zstd_compressor.compress(payload)
+            # Incompressible payloads are stored as-is
+            if len(compressed) < len(payload):
+                compression_id = self._compression_id
+                body = compressed
+
+        blob = bytes((FORMAT_VERSION, self._serializer_id | compression_id)) + body
+
+        elapsed = time.perf_counter() - started
+        self.encodes += 1
+        self.encode_seconds += elapsed
+        self.encode_latency.observe(elapsed)
+        self.raw_bytes += len(payload)
+        self.encoded_bytes += len(blob)
+        return blob, len(payload)
+
+    def decode(self, blob: bytes) -> Any:
+        """
+        Decode a blob produced by encode()
+
+        Raises:
+            CacheCodecError: If the blob is not in a supported format
+        """
+        started = time.perf_counter()
+        if len(blob) < 2 or blob[0] != FORMAT_VERSION:
+            raise CacheCodecError("Unsupported cache blob format")
+
+        flags = blob[1]
+        body = memoryview(blob)[2:]
+        try:
+            compression_id = flags & _COMPRESSION_MASK
+            if compression_id == COMPRESSION_ZLIB:
+                body = zlib.decompress(body)
+            elif compression_id == COMPRESSION_ZSTD:
+                if self._zstd_decompressor is None:
+                    raise CacheCodecError("zstandard module required to decode blob")
+                body = self._zstd_decompressor.decompress(body)
+            elif compression_id != COMPRESSION_NONE:
+                raise CacheCodecError(f"Unknown compression flag: {compression_id:#x}")
+
+            serializer_id = flags & _SERIALIZER_MASK
+            if serializer_id == SERIALIZER_MSGPACK:
+                value = msgpack.unpackb(
+                    body, raw=False, strict_map_key=False, ext_hook=_msgpack_ext_hook
+                )
+            elif serializer_id == SERIALIZER_ORJSON:
+                value = orjson.loads(body)
+            else:
+                raise CacheCodecError(f"Unknown serializer flag: {serializer_id:#x}")
+        except CacheCodecError:
+            raise
+        except Exception as e:
+            raise CacheCodecError(f"Corrupt cache blob: {e}") from e
+
+        elapsed = time.perf_counter() - started
+        self.decodes += 1
+        self.decode_seconds += elapsed
+        self.decode_latency.observe(elapsed)
+        return value
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get codec statistics"""
+        return {
+            "serializer": self.serializer,
+            "compression": self.compression,
+            "encodes": self.encodes,
+            "decodes": self.decodes,
+            "compression_ratio": (
+                round(self.raw_bytes / self.encoded_bytes, 3) if self.encoded_bytes else 0.0
+            ),
+            "avg_encode_ms": (
+                round(self.encode_seconds * 1000 / self.encodes, 4) if self.encodes else 0.0
+            ),
+            "avg_decode_ms": (
+                round(self.decode_seconds * 1000 / self.decodes, 4) if self.decodes else 0.0
+            ),
+        }
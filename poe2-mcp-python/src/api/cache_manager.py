@@ -3,20 +3,270 @@ Multi-tier caching system
 Supports in-memory, Redis, and SQLite caching
 """
 
-import json
+import asyncio
+import functools
+import heapq
 import logging
-import pickle
-from typing import Any, Optional, Dict
+import re
+import struct
+import sys
+import time
+from collections import OrderedDict
+from typing import (
+    Any, Awaitable, Callable, Optional, Dict, FrozenSet, Iterable, List, NamedTuple, Set, Tuple
+)
 from datetime import datetime, timedelta
+from pathlib import Path
 import aiosqlite
 
 try:
     from ..config import settings, CACHE_DIR
 except ImportError:
     from src.config import settings, CACHE_DIR
+from .cache_codec import CacheCodec, CacheCodecError
+from .cache_metrics import CacheMetrics
+from .rate_limiter import request_priority
 
 logger = logging.getLogger(__name__)
 
+# Sentinel for "not in cache" so that falsy cached values are distinguishable
+_MISSING = object()
+
+# Key namespaces: every key is "<namespace>:<rest>" so a whole kind of data
+# can be invalidated without touching the others
+NAMESPACES = ("character", "ladder", "prices", "trade", "pob", "game_data")
+
+
+def namespace_of(key: str) -> Optional[str]:
+    """Namespace of a cache key ("character:acct:name" -> "character")"""
+    namespace, sep, _ = key.partition(":")
+    return namespace if sep else None
+
+
+def normalize_tags(tags: Optional[Iterable[str]]) -> FrozenSet[str]:
+    """Tags are case-insensitive ("league:Abyss" == "league:abyss")"""
+    return frozenset(tag.lower() for tag in tags) if tags else frozenset()
+
+
+class _L3Record(NamedTuple):
+    """A queued SQLite upsert"""
+    value: bytes
+    expires_at: str
+    refresh_at: Optional[str]
+    namespace: Optional[str]
+    tags: FrozenSet[str]
+
+
+def _estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Rough deep size of a value in bytes
+
+    Only used when no serialized form is available to measure. Walks
+    containers a few levels deep and approximates the rest.
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 6:
+        return size
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += _estimate_size(k, _depth + 1) + _estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += _estimate_size(item, _depth + 1)
+
+    return size
+
+
+class MemoryCache:
+    """
+    L1 in-memory LRU cache with per-entry TTL and a byte budget
+
+    - get/set are O(1): entries live in an OrderedDict kept in recency order
+    - expired entries are found through a min-heap of expiry times, so
+      purging never scans the whole cache
+    - capacity is measured in bytes, not items, so one large character
+      payload cannot hide behind a count limit
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        on_evict: Optional[Callable[[str], None]] = None
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        # Called with the key of every entry evicted to stay under max_bytes
+        self.on_evict = on_evict
+
+        # key -> (value, expires_at, size, refresh_at, tags); most recently used at the end
+        self._entries: "OrderedDict[str, Tuple[Any, float, int, Optional[datetime], FrozenSet[str]]]" = OrderedDict()
+
+        # tag -> keys carrying it
+        self._tag_index: Dict[str, Set[str]] = {}
+
+        # (expires_at, key) - may hold stale records for overwritten keys,
+        # which are skipped when they surface
+        self._expiry_heap: List[Tuple[float, str]] = []
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a live value and mark it most recently used"""
+        entry = self.get_entry(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def get_entry(self, key: str, default: Any = None) -> Any:
+        """Get (value, refresh_at) for a live entry and mark it most recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at, _, refresh_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value, refresh_at
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        size: Optional[int] = None,
+        refresh_at: Optional[datetime] = None,
+        tags: FrozenSet[str] = frozenset()
+    ):
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time to live in seconds
+            size: Size in bytes if already known (e.g. serialized length)
+            refresh_at: When the value turns stale (stale-while-revalidate)
+            tags: Normalized tags for invalidate_tag()
+        """
+        if size is None:
+            size = _estimate_size(value)
+
+        if key in self._entries:
+            self._remove(key)
+
+        # Never let one oversized value flush the whole tier
+        if size > self.max_bytes:
+            logger.debug(f"L1 skip: {key} ({size} bytes) exceeds budget")
+            return
+
+        expires_at = time.monotonic() + ttl
+        self._entries[key] = (value, expires_at, size, refresh_at, tags)
+        self.current_bytes += size
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+
+        if self.current_bytes > self.max_bytes:
+            self.purge_expired()
+            while self.current_bytes > self.max_bytes and self._entries:
+                lru_key = next(iter(self._entries))
+                self._remove(lru_key)
+                self.evictions += 1
+                if self.on_evict:
+                    self.on_evict(lru_key)
+
+        self._compact_heap()
+
+    def delete(self, key: str) -> bool:
+        """Remove a key, returns True if it was present"""
+        if key in self._entries:
+            self._remove(key)
+            return True
+        return False
+
+    def clear(self):
+        """Drop every entry (statistics are kept)"""
+        self._entries.clear()
+        self._expiry_heap.clear()
+        self._tag_index.clear()
+        self.current_bytes = 0
+
+    def keys_matching(
+        self,
+        prefix: str = "",
+        tag: Optional[str] = None
+    ) -> List[str]:
+        """Keys starting with prefix and, if given, carrying tag"""
+        if tag is not None:
+            candidates = self._tag_index.get(tag, ())
+        else:
+            candidates = self._entries.keys()
+        return [key for key in candidates if key.startswith(prefix)]
+
+    def purge_expired(self) -> int:
+        """Remove all expired entries, cost proportional to the number expired"""
+        now = time.monotonic()
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            entry = self._entries.get(key)
+            # Skip heap records left behind by overwritten entries
+            if entry is not None and entry[1] == expires_at:
+                self._remove(key)
+                self.expirations += 1
+                removed += 1
+        return removed
+
+    def _remove(self, key: str):
+        _, _, size, _, tags = self._entries.pop(key)
+        self.current_bytes -= size
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def _compact_heap(self):
+        """Rebuild the heap when stale records dominate it"""
+        if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [
+                (expires_at, key)
+                for key, (_, expires_at, _, _, _) in self._entries.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get L1 statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "items": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
 
 class CacheManager:
     """
@@ -24,22 +274,151 @@ class CacheManager:
     L1: In-memory (fastest, limited size)
     L2: Redis (optional, shared across instances)
     L3: SQLite (persistent, slower)
+
+    Keys are namespaced ("<namespace>:<rest>", see NAMESPACES) and entries
+    may carry tags such as "league:abyss" or "account:name", so callers can
+    invalidate() a slice of the cache instead of clearing everything.
     """
 
-    def __init__(self, enable_redis: bool = False) -> None:
+    # Redis set listing the keys carrying a tag
+    REDIS_TAG_PREFIX = "cache_tag:"
+
+    # Negative entries live next to their key ("<key>#notfound"), so they
+    # share its namespace, prefix and tags for invalidate()
+    NEGATIVE_SUFFIX = "#notfound"
+
+    # How long values promoted from L2/L3 stay in L1
+    L1_PROMOTION_TTL = 300
+
+    # SQLite memory-map size for cache.db reads
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+    # Background maintenance: rows deleted per statement (keeps each write
+    # lock short), eviction stops at this fraction of the size cap, and
+    # free pages returned to the OS per idle sweep
+    SWEEP_BATCH_SIZE = 500
+    SWEEP_LOW_WATERMARK = 0.9
+    VACUUM_PAGES_PER_SWEEP = 2048
+
+    # Keys per "WHERE key IN (...)" query, below SQLite's bound-variable limit
+    SQLITE_IN_CHUNK = 500
+
+    # Warm-up ranking: columns compared (all descending) to page through L3
+    WARMUP_ORDERS = {
+        "recent": ("last_access", "key"),
+        "frequent": ("access_count", "last_access", "key"),
+    }
+
+    def __init__(
+        self,
+        enable_redis: bool = False,
+        memory_max_bytes: Optional[int] = None,
+        sqlite_path: Optional[Path] = None,
+        write_batch_size: int = 200,
+        write_flush_interval: float = 1.0,
+        max_concurrent_refreshes: int = 2,
+        codec: Optional[CacheCodec] = None,
+        sqlite_max_bytes: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+        warmup_entries: Optional[int] = None,
+        warmup_seconds: Optional[float] = None,
+        warmup_order: Optional[str] = None
+    ) -> None:
         self.enable_redis = enable_redis and settings.REDIS_ENABLED
 
+        # Encodes values once for both L2 and L3
+        self.codec = codec or CacheCodec(
+            serializer=settings.CACHE_SERIALIZER,
+            compression=settings.CACHE_COMPRESSION or None,
+            compress_threshold=settings.CACHE_COMPRESS_THRESHOLD
+        )
+
+        # Per-tier, per-namespace hit/miss/set/eviction counters and latencies
+        self.metrics = CacheMetrics()
+
         # L1: In-memory cache
-        self.memory_cache: Dict[str, tuple[Any, datetime]] = {}
-        self.max_memory_items = 1000
+        self.memory_cache = MemoryCache(
+            max_bytes=memory_max_bytes or settings.CACHE_MEMORY_MAX_BYTES,
+            on_evict=self._record_l1_eviction
+        )
 
         # L2: Redis client (optional)
         self.redis_client = None
 
         # L3: SQLite cache
-        self.sqlite_path = CACHE_DIR / "cache.db"
+        self.sqlite_path = sqlite_path or CACHE_DIR / "cache.db"
         self.sqlite_conn: Optional[aiosqlite.Connection] = None
 
+        # L3 write-behind queue: sets and deletes are merged per key and
+        # committed together, either when the batch fills up or after
+        # write_flush_interval seconds.
+        # key -> _L3Record for an upsert, None for a delete
+        self.write_batch_size = write_batch_size
+        self.write_flush_interval = write_flush_interval
+        self._pending_writes: Dict[str, Optional[_L3Record]] = {}
+        self._flushing_writes: Dict[str, Optional[_L3Record]] = {}
+        self._write_lock = asyncio.Lock()
+        self._flush_wakeup = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.l3_flushes = 0
+        self.l3_rows_written = 0
+        self.l3_dropped_writes = 0
+
+        # L3 reads/L1 hits since the last flush: key -> (unix time, reads),
+        # written to last_access/access_count in bulk so size-cap eviction can
+        # drop the coldest rows and warm-up can pick the hottest
+        self._pending_touches: Dict[str, Tuple[float, int]] = {}
+
+        # Background maintenance (expiry sweep, size cap, incremental vacuum)
+        self.sqlite_max_bytes = (
+            sqlite_max_bytes if sqlite_max_bytes is not None
+            else settings.CACHE_SQLITE_MAX_BYTES
+        )
+        self.sweep_interval = (
+            sweep_interval if sweep_interval is not None
+            else settings.CACHE_SWEEP_INTERVAL
+        )
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self.sweeps = 0
+        self.swept_expired = 0
+        self.swept_evicted = 0
+        self.vacuumed_pages = 0
+        self.last_sweep_seconds = 0.0
+
+        # Startup warm-up: preload recently or frequently used L3 entries into L1
+        self.warmup_entries = (
+            warmup_entries if warmup_entries is not None
+            else settings.CACHE_WARMUP_ENTRIES
+        )
+        self.warmup_seconds = (
+            warmup_seconds if warmup_seconds is not None
+            else settings.CACHE_WARMUP_SECONDS
+        )
+        self.warmup_order = warmup_order or settings.CACHE_WARMUP_ORDER
+        if self.warmup_order not in self.WARMUP_ORDERS:
+            raise ValueError(
+                f"Unknown warm-up order {self.warmup_order!r}, use one of {sorted(self.WARMUP_ORDERS)}"
+            )
+        self._warmup_task: Optional[asyncio.Task] = None
+        self.warmup_loaded = 0
+        self.warmup_bytes = 0
+        self.warmup_elapsed = 0.0
+        self.warmup_complete = False
+
+        # Single-flight: one loader task per key, shared by concurrent misses
+        # and by background refreshes of stale entries
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Callers still waiting on each get_or_compute() load (not refreshes)
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self._refresh_semaphore = asyncio.Semaphore(max_concurrent_refreshes)
+        self.loader_calls = 0
+        self.coalesced_requests = 0
+        self.stale_hits = 0
+        self.refreshes_scheduled = 0
+        self.refresh_failures = 0
+        self.negative_hits = 0
+        self.negative_writes = 0
+
     async def initialize(self):
         """Initialize cache connections"""
         try:
@@ -49,8 +428,7 @@ class CacheManager:
                     import aioredis
                     self.redis_client = await aioredis.from_url(
                         settings.REDIS_URL,
-                        encoding="utf-8",
-                        decode_responses=True
+                        decode_responses=False
                     )
 
                     # Test the connection with a ping
@@ -84,12 +462,45 @@ class CacheManager:
 
             # Initialize SQLite cache
             self.sqlite_conn = await aiosqlite.connect(str(self.sqlite_path))
+            await self._configure_sqlite()
             await self._init_sqlite_schema()
             logger.info("SQLite cache initialized")
 
+            if self.sweep_interval > 0:
+                self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+            if self.warmup_entries > 0:
+                self._warmup_task = asyncio.create_task(self.warm_up())
+
         except Exception as e:
             logger.error(f"Cache initialization failed: {e}")
 
+    async def _configure_sqlite(self):
+        """
+        Tune cache.db for a write-heavy cache
+
+        WAL lets readers proceed during a commit, and synchronous=NORMAL only
+        fsyncs at checkpoints, which is safe in WAL mode (a crash can lose the
+        last commits but never corrupts the file - acceptable for a cache).
+        auto_vacuum=INCREMENTAL (effective for new files) lets the sweeper
+        hand pages freed by evictions back to the OS.
+        """
+        await self.sqlite_conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        async with self.sqlite_conn.execute("PRAGMA auto_vacuum") as cursor:
+            row = await cursor.fetchone()
+            if row and row[0] != 2:
+                logger.info(
+                    "cache.db predates incremental vacuum; freed pages are reused "
+                    "but not returned to the OS until the file is recreated"
+                )
+        async with self.sqlite_conn.execute("PRAGMA journal_mode=WAL") as cursor:
+            row = await cursor.fetchone()
+            if row and str(row[0]).lower() != "wal":
+                logger.warning(f"SQLite cache could not enable WAL (mode: {row[0]})")
+        await self.sqlite_conn.execute("PRAGMA synchronous=NORMAL")
+        await self.sqlite_conn.execute(f"PRAGMA mmap_size={self.SQLITE_MMAP_SIZE}")
+        await self.sqlite_conn.execute("PRAGMA temp_store=MEMORY")
+
     async def _init_sqlite_schema(self):
         """Initialize SQLite cache schema"""
         await self.sqlite_conn.execute("""
@@ -97,141 +508,655 @@ class CacheManager:
                 key TEXT PRIMARY KEY,
                 value BLOB,
                 expires_at TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                refresh_at TIMESTAMP,
+                namespace TEXT,
+                last_access REAL,
+                access_count INTEGER NOT NULL DEFAULT 0
             )
         """)
+        await self._add_missing_columns({
+            "refresh_at": "TIMESTAMP",
+            "namespace": "TEXT",
+            "last_access": "REAL",
+            "access_count": "INTEGER NOT NULL DEFAULT 0",
+        })
+        # Rows from before last_access was tracked count as the coldest
+        await self.sqlite_conn.execute(
+            "UPDATE cache SET last_access = 0 WHERE last_access IS NULL"
+        )
         await self.sqlite_conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_expires_at
             ON cache(expires_at)
         """)
+        await self.sqlite_conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_namespace
+            ON cache(namespace)
+        """)
+        await self.sqlite_conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_last_access
+            ON cache(last_access)
+        """)
+        await self.sqlite_conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_access_count
+            ON cache(access_count, last_access)
+        """)
+        await self.sqlite_conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_tags (
+                tag TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (tag, key)
+            ) WITHOUT ROWID
+        """)
+        await self.sqlite_conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cache_tags_key
+            ON cache_tags(key)
+        """)
+        # Tags follow their entry however it gets deleted (expiry, clear, invalidate)
+        await self.sqlite_conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS cache_tags_cleanup
+            AFTER DELETE ON cache
+            BEGIN
+                DELETE FROM cache_tags WHERE key = OLD.key;
+            END
+        """)
         await self.sqlite_conn.commit()
 
+    async def _add_missing_columns(self, columns: Dict[str, str]):
+        """Migrate cache.db files created by older versions"""
+        async with self.sqlite_conn.execute("PRAGMA table_info(cache)") as cursor:
+            existing = {row[1] for row in await cursor.fetchall()}
+
+        for name, column_type in columns.items():
+            if name not in existing:
+                await self.sqlite_conn.execute(
+                    f"ALTER TABLE cache ADD COLUMN {name} {column_type}"
+                )
+
     async def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache (checks all tiers)
 
+        Entries past their soft TTL are still returned until their hard TTL;
+        use get_or_compute() to have them refreshed in the background.
+
         Args:
             key: Cache key
 
         Returns:
             Cached value or None if not found/expired
         """
+        entry = await self._get_entry(key)
+        return None if entry is _MISSING else entry[0]
+
+    async def _get_entry(self, key: str) -> Any:
+        """
+        Look up key in every tier
+
+        Returns:
+            (value, refresh_at) or _MISSING
+        """
+        namespace = namespace_of(key)
+        metrics = self.metrics
+
         # Try L1: Memory cache
-        if key in self.memory_cache:
-            value, expires_at = self.memory_cache[key]
-            if datetime.now() < expires_at:
-                logger.debug(f"L1 cache hit: {key}")
-                return value
-            else:
-                # Expired, remove from memory
-                del self.memory_cache[key]
+        started = time.perf_counter()
+        entry = self.memory_cache.get_entry(key, _MISSING)
+        metrics.observe("l1", "get", time.perf_counter() - started)
+        if entry is not _MISSING:
+            logger.debug(f"L1 cache hit: {key}")
+            metrics.record(namespace, "l1", "hits")
+            if self.sqlite_conn:
+                self._touch(key)
+            return entry
+        metrics.record(namespace, "l1", "misses")
 
         # Try L2: Redis cache
         if self.redis_client:
+            started = time.perf_counter()
             try:
-                value = await self.redis_client.get(key)
-                if value:
+                data = await self.redis_client.get(key)
+                metrics.observe("l2", "get", time.perf_counter() - started)
+                if data:
                     logger.debug(f"L2 cache hit: {key}")
                     # Deserialize
-                    deserialized = json.loads(value)
+                    value, refresh_at = self._unpack_redis_value(data)
+                    tags = await self._promotion_tags([key])
                     # Store in L1 for next time
-                    self._set_memory_cache(key, deserialized, 300)  # 5 min in L1
-                    return deserialized
+                    self.memory_cache.set(
+                        key,
+                        value,
+                        self.L1_PROMOTION_TTL,
+                        size=len(data),
+                        refresh_at=refresh_at,
+                        tags=tags.get(key, frozenset())
+                    )
+                    metrics.record(namespace, "l2", "hits")
+                    return value, refresh_at
+            except CacheCodecError as e:
+                # Written by an older version; overwritten on the next set
+                logger.debug(f"Undecodable Redis value for {key}: {e}")
             except Exception as e:
                 logger.warning(f"Redis get error: {e}")
+            metrics.record(namespace, "l2", "misses")
+
+        # Writes not yet flushed to SQLite take precedence over its rows
+        # (counted as L3 since that is where they will be read from)
+        pending = self._get_pending_write(key)
+        if pending is not _MISSING:
+            entry = _MISSING
+            if pending is not None:
+                entry = self._load_l3_record(
+                    key, pending.value, pending.expires_at, pending.refresh_at, pending.tags
+                )
+            metrics.record(namespace, "l3", "misses" if entry is _MISSING else "hits")
+            return entry
 
         # Try L3: SQLite cache
         if self.sqlite_conn:
+            started = time.perf_counter()
             try:
                 async with self.sqlite_conn.execute(
-                    "SELECT value, expires_at FROM cache WHERE key = ?",
+                    "SELECT value, expires_at, refresh_at FROM cache WHERE key = ?",
                     (key,)
                 ) as cursor:
                     row = await cursor.fetchone()
-                    if row:
-                        value_blob, expires_at_str = row
-                        expires_at = datetime.fromisoformat(expires_at_str)
-
-                        if datetime.now() < expires_at:
-                            logger.debug(f"L3 cache hit: {key}")
-                            # Deserialize
-                            value = pickle.loads(value_blob)
-                            # Store in higher tiers for next time
-                            self._set_memory_cache(key, value, 300)
-                            return value
-                        else:
-                            # Expired, delete from SQLite
-                            await self.sqlite_conn.execute(
-                                "DELETE FROM cache WHERE key = ?",
-                                (key,)
-                            )
-                            await self.sqlite_conn.commit()
+                metrics.observe("l3", "get", time.perf_counter() - started)
+                if row:
+                    try:
+                        entry = self._load_l3_record(
+                            key, *row, tags=await self._get_l3_tags(key)
+                        )
+                    except CacheCodecError as e:
+                        # Written by an older version; drop it like an expired row
+                        logger.debug(f"Undecodable SQLite value for {key}: {e}")
+                        entry = _MISSING
+                    if entry is not _MISSING:
+                        logger.debug(f"L3 cache hit: {key}")
+                        metrics.record(namespace, "l3", "hits")
+                        self._touch(key)
+                        return entry
+                    if key not in self._pending_writes:
+                        # Expired, delete from SQLite with the next batch
+                        self._queue_write(key, None)
             except Exception as e:
                 logger.warning(f"SQLite get error: {e}")
+            metrics.record(namespace, "l3", "misses")
+
+        return _MISSING
+
+    def _load_l3_record(
+        self,
+        key: str,
+        value_blob: bytes,
+        expires_at_str: str,
+        refresh_at_str: Optional[str],
+        tags: FrozenSet[str] = frozenset()
+    ) -> Any:
+        """Deserialize a live L3 record and promote it to L1"""
+        now = datetime.now()
+        expires_at = datetime.fromisoformat(expires_at_str)
+        if now >= expires_at:
+            return _MISSING
+
+        refresh_at = datetime.fromisoformat(refresh_at_str) if refresh_at_str else None
+        value = self.codec.decode(value_blob)
+
+        # Store in L1 for next time, never past the L3 expiry
+        remaining = (expires_at - now).total_seconds()
+        self.memory_cache.set(
+            key,
+            value,
+            min(self.L1_PROMOTION_TTL, remaining),
+            size=len(value_blob),
+            refresh_at=refresh_at,
+            tags=tags
+        )
+        return value, refresh_at
+
+    async def _get_l3_tags(self, key: str) -> FrozenSet[str]:
+        async with self.sqlite_conn.execute(
+            "SELECT tag FROM cache_tags WHERE key = ?", (key,)
+        ) as cursor:
+            return frozenset(row[0] for row in await cursor.fetchall())
+
+    async def _get_l3_tags_many(self, keys: List[str]) -> Dict[str, FrozenSet[str]]:
+        if not keys:
+            return {}
+        tags: Dict[str, Set[str]] = {}
+        placeholders = ",".join("?" * len(keys))
+        async with self.sqlite_conn.execute(
+            f"SELECT key, tag FROM cache_tags WHERE key IN ({placeholders})", keys
+        ) as cursor:
+            for key, tag in await cursor.fetchall():
+                tags.setdefault(key, set()).add(tag)
+        return {key: frozenset(key_tags) for key, key_tags in tags.items()}
+
+    async def _promotion_tags(self, keys: List[str]) -> Dict[str, FrozenSet[str]]:
+        """
+        Tags of L2 hits being copied into L1
+
+        Redis only keeps tag -> keys sets, so an entry's tags come from its
+        queued L3 write or its cache_tags rows; without SQLite they are
+        unknown and invalidate() relies on the Redis tag sets instead.
+        """
+        tags: Dict[str, FrozenSet[str]] = {}
+        lookup = []
+        for key in keys:
+            pending = self._get_pending_write(key)
+            if pending is _MISSING:
+                lookup.append(key)
+            elif pending is not None:
+                tags[key] = pending.tags
+        if lookup and self.sqlite_conn:
+            try:
+                for start in range(0, len(lookup), self.SQLITE_IN_CHUNK):
+                    tags.update(
+                        await self._get_l3_tags_many(lookup[start:start + self.SQLITE_IN_CHUNK])
+                    )
+            except Exception as e:
+                logger.debug(f"SQLite tag lookup error: {e}")
+        return tags
+
+    # Redis values are the codec blob prefixed with the refresh_at timestamp
+    # (0.0 when the value never goes stale)
+    _REDIS_HEADER = struct.Struct(">d")
+
+    def _pack_redis_value(self, value_blob: bytes, refresh_at: Optional[datetime]) -> bytes:
+        timestamp = refresh_at.timestamp() if refresh_at else 0.0
+        return self._REDIS_HEADER.pack(timestamp) + value_blob
 
-        return None
+    def _unpack_redis_value(self, data: bytes) -> Tuple[Any, Optional[datetime]]:
+        header_size = self._REDIS_HEADER.size
+        if len(data) < header_size:
+            raise CacheCodecError("Truncated Redis value")
+        (timestamp,) = self._REDIS_HEADER.unpack_from(data)
+        value = self.codec.decode(data[header_size:])
+        return value, datetime.fromtimestamp(timestamp) if timestamp else None
 
-    async def set(self, key: str, value: Any, ttl: int = 3600):
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int = 3600,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
+    ):
         """
         Set value in cache (all tiers)
 
         Args:
-            key: Cache key
+            key: Cache key, "<namespace>:<rest>"
             value: Value to cache
-            ttl: Time to live in seconds
+            ttl: Time to live in seconds (hard TTL)
+            soft_ttl: Seconds until the value counts as stale; between soft_ttl
+                and ttl get_or_compute() serves it while refreshing in the
+                background. Defaults to ttl (never stale).
+            tags: Labels for invalidate(), e.g. ["league:Abyss", "account:name"]
+        """
+        await self.set_many({key: value}, ttl, soft_ttl=soft_ttl, tags=tags)
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: int = 3600,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
+    ):
+        """
+        Set several values with the same TTL and tags
+
+        Redis writes go out in one pipeline and the SQLite rows are queued
+        together, so they are committed in the same write-behind transaction.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time to live in seconds (hard TTL)
+            soft_ttl: Seconds until the values count as stale (see set())
+            tags: Labels for invalidate(), applied to every key
         """
-        expires_at = datetime.now() + timedelta(seconds=ttl)
+        if not items:
+            return
+
+        tags = normalize_tags(tags)
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=ttl)
+        refresh_at = now + timedelta(seconds=min(soft_ttl, ttl)) if soft_ttl else None
 
-        # Set in L1: Memory cache
-        self._set_memory_cache(key, value, ttl)
+        metrics = self.metrics
+        blobs: Dict[str, bytes] = {}
+        for key, value in items.items():
+            # Encode once for L2 and L3; the uncompressed size doubles as the L1 size
+            raw_size = None
+            if self.redis_client or self.sqlite_conn:
+                try:
+                    blobs[key], raw_size = self.codec.encode_with_size(value)
+                except CacheCodecError as e:
+                    logger.warning(f"Cache serialization error for {key}: {e}")
+
+            # Set in L1: Memory cache
+            started = time.perf_counter()
+            self.memory_cache.set(
+                key, value, ttl, size=raw_size, refresh_at=refresh_at, tags=tags
+            )
+            metrics.observe("l1", "set", time.perf_counter() - started)
+            metrics.record(namespace_of(key), "l1", "sets")
 
         # Set in L2: Redis cache
-        if self.redis_client:
+        if self.redis_client and blobs:
+            started = time.perf_counter()
             try:
-                serialized = json.dumps(value)
-                await self.redis_client.setex(key, ttl, serialized)
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, value_blob in blobs.items():
+                    pipe.setex(key, ttl, self._pack_redis_value(value_blob, refresh_at))
+                for tag in tags:
+                    tag_key = self.REDIS_TAG_PREFIX + tag
+                    pipe.sadd(tag_key, *blobs)
+                    # Tag sets may outlive their members; they only drive deletes
+                    pipe.expire(tag_key, max(ttl, 86400))
+                await pipe.execute()
+                metrics.observe("l2", "set", time.perf_counter() - started)
+                for key in blobs:
+                    metrics.record(namespace_of(key), "l2", "sets")
             except Exception as e:
                 logger.warning(f"Redis set error: {e}")
 
-        # Set in L3: SQLite cache
+        # Set in L3: SQLite cache (write-behind; latency is measured per flush)
         if self.sqlite_conn:
+            for key, value_blob in blobs.items():
+                metrics.record(namespace_of(key), "l3", "sets")
+                self._queue_write(key, _L3Record(
+                    value_blob,
+                    expires_at.isoformat(),
+                    refresh_at.isoformat() if refresh_at else None,
+                    namespace_of(key),
+                    tags
+                ))
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values at once (checks all tiers)
+
+        Keys that miss L1 are fetched from Redis with one MGET and from
+        SQLite with chunked IN queries instead of one round trip per key.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to value for the keys that were found
+        """
+        results: Dict[str, Any] = {}
+        missing: List[str] = []
+        metrics = self.metrics
+
+        # L1: Memory cache
+        for key in dict.fromkeys(keys):
+            started = time.perf_counter()
+            entry = self.memory_cache.get_entry(key, _MISSING)
+            metrics.observe("l1", "get", time.perf_counter() - started)
+            if entry is _MISSING:
+                metrics.record(namespace_of(key), "l1", "misses")
+                missing.append(key)
+                continue
+            metrics.record(namespace_of(key), "l1", "hits")
+            results[key] = entry[0]
+            if self.sqlite_conn:
+                self._touch(key)
+
+        # L2: Redis cache
+        if missing and self.redis_client:
+            started = time.perf_counter()
             try:
-                value_blob = pickle.dumps(value)
-                await self.sqlite_conn.execute(
-                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
-                    (key, value_blob, expires_at.isoformat())
+                values = await self.redis_client.mget(missing)
+                metrics.observe("l2", "get_many", time.perf_counter() - started)
+                still_missing = []
+                tags_by_key = await self._promotion_tags(
+                    [key for key, data in zip(missing, values) if data]
                 )
-                await self.sqlite_conn.commit()
+                for key, data in zip(missing, values):
+                    if not data:
+                        still_missing.append(key)
+                        continue
+                    try:
+                        value, refresh_at = self._unpack_redis_value(data)
+                    except CacheCodecError:
+                        still_missing.append(key)
+                        continue
+                    self.memory_cache.set(
+                        key, value, self.L1_PROMOTION_TTL,
+                        size=len(data), refresh_at=refresh_at,
+                        tags=tags_by_key.get(key, frozenset())
+                    )
+                    metrics.record(namespace_of(key), "l2", "hits")
+                    results[key] = value
+                for key in still_missing:
+                    metrics.record(namespace_of(key), "l2", "misses")
+                missing = still_missing
             except Exception as e:
-                logger.warning(f"SQLite set error: {e}")
-
-    def _set_memory_cache(self, key: str, value: Any, ttl: int):
-        """Set value in memory cache with size limit"""
-        # If cache is full, remove oldest items
-        if len(self.memory_cache) >= self.max_memory_items:
-            # Remove expired items first
-            now = datetime.now()
-            expired_keys = [
-                k for k, (_, exp) in self.memory_cache.items()
-                if exp < now
-            ]
-            for k in expired_keys:
-                del self.memory_cache[k]
+                logger.warning(f"Redis mget error: {e}")
+
+        # Writes not yet flushed to SQLite take precedence over its rows
+        unflushed = []
+        for key in missing:
+            pending = self._get_pending_write(key)
+            if pending is _MISSING:
+                unflushed.append(key)
+            else:
+                entry = _MISSING
+                if pending is not None:
+                    entry = self._load_l3_record(
+                        key, pending.value, pending.expires_at, pending.refresh_at, pending.tags
+                    )
+                if entry is not _MISSING:
+                    results[key] = entry[0]
+                metrics.record(
+                    namespace_of(key), "l3", "misses" if entry is _MISSING else "hits"
+                )
+        missing = unflushed
+
+        # L3: SQLite cache
+        if missing and self.sqlite_conn:
+            try:
+                for start in range(0, len(missing), self.SQLITE_IN_CHUNK):
+                    chunk = missing[start:start + self.SQLITE_IN_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    started = time.perf_counter()
+                    async with self.sqlite_conn.execute(
+                        "SELECT key, value, expires_at, refresh_at FROM cache "
+                        f"WHERE key IN ({placeholders})",
+                        chunk
+                    ) as cursor:
+                        rows = await cursor.fetchall()
+                    metrics.observe("l3", "get_many", time.perf_counter() - started)
+                    tags_by_key = await self._get_l3_tags_many([row[0] for row in rows])
 
-            # If still full, remove oldest 10%
-            if len(self.memory_cache) >= self.max_memory_items:
-                to_remove = int(self.max_memory_items * 0.1)
-                for k in list(self.memory_cache.keys())[:to_remove]:
-                    del self.memory_cache[k]
+                    for key, value_blob, expires_at, refresh_at in rows:
+                        try:
+                            entry = self._load_l3_record(
+                                key, value_blob, expires_at, refresh_at,
+                                tags=tags_by_key.get(key, frozenset())
+                            )
+                        except CacheCodecError:
+                            entry = _MISSING
+                        if entry is not _MISSING:
+                            results[key] = entry[0]
+                            self._touch(key)
+                        elif key not in self._pending_writes:
+                            self._queue_write(key, None)
+            except Exception as e:
+                logger.warning(f"SQLite get_many error: {e}")
+            for key in missing:
+                metrics.record(
+                    namespace_of(key), "l3", "hits" if key in results else "misses"
+                )
 
-        expires_at = datetime.now() + timedelta(seconds=ttl)
-        self.memory_cache[key] = (value, expires_at)
+        return results
+
+    async def get_or_compute(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int = 3600,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+        negative_ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Get a cached value, or compute and cache it with at most one loader per key
+
+        Concurrent callers that miss on the same key share a single loader
+        call instead of each hitting the upstream API. If the loader raises,
+        every waiting caller receives the same exception and nothing is cached.
+        A cancelled caller leaves the load running for the others; once the
+        last one is cancelled the load is cancelled too and nothing is cached.
+        Falsy results (None, empty lists) are returned but not cached.
+
+        With soft_ttl (stale-while-revalidate), a value older than soft_ttl
+        but younger than ttl is returned immediately and one background
+        refresh is scheduled. Refreshes run under a concurrency cap and go
+        through the same loader, so they still wait on its rate limiter.
+
+        With negative_ttl, a falsy result is remembered for negative_ttl
+        seconds and later calls return None without running the loader.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument coroutine function producing the value
+            ttl: Time to live in seconds for the computed value (hard TTL)
+            soft_ttl: Seconds until the value should be refreshed
+            tags: Labels for invalidate(), e.g. ["league:Abyss"]
+            negative_ttl: Seconds to remember a falsy result (None: don't)
+
+        Returns:
+            Cached or freshly computed value
+        """
+        entry = await self._get_entry(key)
+        if entry is not _MISSING:
+            value, refresh_at = entry
+            if refresh_at is not None and datetime.now() >= refresh_at:
+                self.stale_hits += 1
+                self._schedule_refresh(key, loader, ttl, soft_ttl, tags)
+            return value
+
+        if negative_ttl and await self.is_negative(key):
+            logger.debug(f"Negative cache hit: {key}")
+            return None
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.loader_calls += 1
+            task = self._start_loader(
+                key, self._run_loader(key, loader, ttl, soft_ttl, tags, negative_ttl)
+            )
+            self._waiters[task] = 0
+        else:
+            self.coalesced_requests += 1
+            logger.debug(f"Coalesced cache miss: {key}")
+
+        if task in self._waiters:
+            self._waiters[task] += 1
+        try:
+            # Shield so one caller being cancelled doesn't cancel the shared load
+            return await asyncio.shield(task)
+        finally:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+                if not self._waiters[task] and not task.done():
+                    # Every caller gave up: stop the upstream requests too
+                    task.cancel()
+
+    def _start_loader(self, key: str, coro: Awaitable[Any]) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._inflight[key] = task
+        task.add_done_callback(functools.partial(self._loader_done, key))
+        return task
+
+    async def _run_loader(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+        negative_ttl: Optional[int] = None
+    ) -> Any:
+        value = await loader()
+        if value:
+            await self.set(key, value, ttl, soft_ttl=soft_ttl, tags=tags)
+        elif negative_ttl:
+            await self.set_negative(key, negative_ttl, tags=tags)
+        return value
+
+    async def is_negative(self, key: str) -> bool:
+        """True if key was recently recorded as not found"""
+        if await self._get_entry(key + self.NEGATIVE_SUFFIX) is _MISSING:
+            return False
+        self.negative_hits += 1
+        return True
+
+    async def set_negative(
+        self,
+        key: str,
+        ttl: int,
+        tags: Optional[Iterable[str]] = None
+    ):
+        """
+        Record that key has no value upstream (e.g. character not found)
+
+        Args:
+            key: Cache key the lookup would have been stored under
+            ttl: Seconds to remember the miss; keep short
+            tags: Labels for invalidate()
+        """
+        self.negative_writes += 1
+        await self.set(key + self.NEGATIVE_SUFFIX, True, ttl, tags=tags)
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        soft_ttl: Optional[int],
+        tags: Optional[Iterable[str]] = None
+    ):
+        """Start a background refresh of a stale key unless one is running"""
+        if key in self._inflight:
+            return
+        self.refreshes_scheduled += 1
+        self._start_loader(key, self._refresh(key, loader, ttl, soft_ttl, tags))
+
+    async def _refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        soft_ttl: Optional[int],
+        tags: Optional[Iterable[str]] = None
+    ) -> Any:
+        async with self._refresh_semaphore:
+            try:
+                # Nobody is waiting on a refresh: its upstream requests go last
+                with request_priority("background"):
+                    return await self._run_loader(key, loader, ttl, soft_ttl, tags)
+            except Exception as e:
+                # The stale value keeps being served until its hard TTL
+                self.refresh_failures += 1
+                logger.warning(f"Background refresh failed for {key}: {e}")
+                return None
+
+    def _loader_done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        self._waiters.pop(task, None)
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
 
     async def delete(self, key: str):
         """Delete key from all cache tiers"""
         # Delete from L1
-        if key in self.memory_cache:
-            del self.memory_cache[key]
+        self.memory_cache.delete(key)
 
         # Delete from L2
         if self.redis_client:
@@ -240,16 +1165,127 @@ class CacheManager:
             except Exception as e:
                 logger.warning(f"Redis delete error: {e}")
 
-        # Delete from L3
+        # Delete from L3 (write-behind)
         if self.sqlite_conn:
+            self._queue_write(key, None)
+
+    def _get_pending_write(self, key: str) -> Any:
+        """Return the queued L3 record for key, None for a queued delete"""
+        if key in self._pending_writes:
+            return self._pending_writes[key]
+        return self._flushing_writes.get(key, _MISSING)
+
+    def _queue_write(self, key: str, record: Optional[_L3Record]):
+        """Queue an L3 upsert (record) or delete (None), merging per key"""
+        self._pending_writes[key] = record
+
+        if len(self._pending_writes) >= self.write_batch_size:
+            self._flush_wakeup.set()
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """Background writer: flush on a timer or when the batch fills up"""
+        while self._pending_writes:
             try:
-                await self.sqlite_conn.execute(
-                    "DELETE FROM cache WHERE key = ?",
-                    (key,)
+                await asyncio.wait_for(
+                    self._flush_wakeup.wait(), timeout=self.write_flush_interval
                 )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write all queued L3 sets and deletes in a single transaction"""
+        async with self._write_lock:
+            if not self.sqlite_conn:
+                return
+            if not self._pending_writes:
+                await self._flush_touches()
+                return
+
+            batch = self._pending_writes
+            self._pending_writes = {}
+            self._flushing_writes = batch
+
+            now = time.time()
+            upserts = [
+                (key, record.value, record.expires_at, record.refresh_at, record.namespace, now)
+                for key, record in batch.items() if record is not None
+            ]
+            deletes = [(key,) for key, record in batch.items() if record is None]
+            tag_rows = [
+                (tag, key)
+                for key, record in batch.items() if record is not None
+                for tag in record.tags
+            ]
+
+            started = time.perf_counter()
+            try:
+                if deletes:
+                    await self.sqlite_conn.executemany(
+                        "DELETE FROM cache WHERE key = ?", deletes
+                    )
+                if upserts:
+                    # An upsert doesn't fire the delete trigger, so drop old tags here
+                    await self.sqlite_conn.executemany(
+                        "DELETE FROM cache_tags WHERE key = ?",
+                        [(row[0],) for row in upserts]
+                    )
+                    # Updated in place so a rewritten entry keeps its access_count
+                    await self.sqlite_conn.executemany(
+                        "INSERT INTO cache "
+                        "(key, value, expires_at, refresh_at, namespace, last_access) "
+                        "VALUES (?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                        "expires_at = excluded.expires_at, refresh_at = excluded.refresh_at, "
+                        "namespace = excluded.namespace, last_access = excluded.last_access",
+                        upserts
+                    )
+                if tag_rows:
+                    await self.sqlite_conn.executemany(
+                        "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                        tag_rows
+                    )
                 await self.sqlite_conn.commit()
+                self.metrics.observe("l3", "flush", time.perf_counter() - started)
+                self.l3_flushes += 1
+                self.l3_rows_written += len(batch)
+                await self._flush_touches()
             except Exception as e:
-                logger.warning(f"SQLite delete error: {e}")
+                # It's a cache: drop the batch rather than retry forever
+                logger.warning(f"SQLite flush error, dropping {len(batch)} writes: {e}")
+                self.l3_dropped_writes += len(batch)
+                try:
+                    await self.sqlite_conn.rollback()
+                except Exception:
+                    pass
+            finally:
+                self._flushing_writes = {}
+
+    def _touch(self, key: str):
+        """Queue a read of key for the next last_access/access_count update"""
+        _, reads = self._pending_touches.get(key, (0.0, 0))
+        self._pending_touches[key] = (time.time(), reads + 1)
+
+    async def _flush_touches(self):
+        """Record last_access and read counts for keys read since the last flush (write lock held)"""
+        if not self._pending_touches:
+            return
+        touches = [(ts, reads, key) for key, (ts, reads) in self._pending_touches.items()]
+        self._pending_touches = {}
+        try:
+            await self.sqlite_conn.executemany(
+                "UPDATE cache SET last_access = ?, access_count = access_count + ? "
+                "WHERE key = ?",
+                touches
+            )
+            await self.sqlite_conn.commit()
+        except Exception as e:
+            # Only affects eviction order
+            logger.debug(f"SQLite last_access update error: {e}")
 
     async def clear(self):
         """Clear all caches"""
@@ -263,43 +1299,485 @@ class CacheManager:
             except Exception as e:
                 logger.warning(f"Redis clear error: {e}")
 
-        # Clear L3
+        # Clear L3: drop queued writes and stop serving the batch being
+        # flushed; the DELETE waits for that flush, so it can't write back
+        self._pending_writes.clear()
+        self._flushing_writes = {}
+        if self.sqlite_conn:
+            async with self._write_lock:
+                try:
+                    await self.sqlite_conn.execute("DELETE FROM cache")
+                    await self.sqlite_conn.commit()
+                except Exception as e:
+                    logger.warning(f"SQLite clear error: {e}")
+
+    async def invalidate(
+        self,
+        namespace: Optional[str] = None,
+        tag: Optional[str] = None,
+        prefix: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Remove every entry matching all given selectors from all tiers
+
+        Args:
+            namespace: Key namespace, e.g. "character" (see NAMESPACES)
+            tag: Entry tag, e.g. "league:Abyss"
+            prefix: Key prefix, e.g. "character:poeninja:someaccount:"
+
+        Returns:
+            Number of entries removed per tier ("l1", "l2", "l3")
+        """
+        if not (namespace or tag or prefix):
+            raise ValueError("invalidate() needs a namespace, tag or prefix")
+
+        key_prefix = f"{namespace}:" if namespace else ""
+        if prefix:
+            if key_prefix and not prefix.startswith(key_prefix):
+                # Prefix outside the namespace: nothing can match both
+                return {"l1": 0, "l2": 0, "l3": 0}
+            key_prefix = prefix
+        tag = tag.lower() if tag else None
+
+        removed = {"l1": 0, "l2": 0, "l3": 0}
+        # L2 hits promoted without SQLite may sit in L1 without their tags
+        matched_keys: Set[str] = set(self.memory_cache.keys_matching(key_prefix, tag))
+
+        # L3: apply queued writes first so none of them resurrect a match
         if self.sqlite_conn:
+            await self.flush()
+            where, params = self._l3_selector(namespace, key_prefix, tag)
+            async with self._write_lock:
+                try:
+                    async with self.sqlite_conn.execute(
+                        f"SELECT key FROM cache WHERE {where}", params
+                    ) as cursor:
+                        l3_keys = [row[0] for row in await cursor.fetchall()]
+                    if l3_keys:
+                        await self.sqlite_conn.execute(
+                            f"DELETE FROM cache WHERE {where}", params
+                        )
+                        await self.sqlite_conn.commit()
+                    removed["l3"] = len(l3_keys)
+                    matched_keys.update(l3_keys)
+                except Exception as e:
+                    logger.warning(f"SQLite invalidate error: {e}")
+
+        # L2
+        if self.redis_client:
             try:
-                await self.sqlite_conn.execute("DELETE FROM cache")
-                await self.sqlite_conn.commit()
+                redis_keys = await self._invalidate_redis(key_prefix, tag)
+                removed["l2"] = len(redis_keys)
+                matched_keys.update(redis_keys)
             except Exception as e:
-                logger.warning(f"SQLite clear error: {e}")
+                logger.warning(f"Redis invalidate error: {e}")
+
+        # L1
+        for key in matched_keys:
+            if self.memory_cache.delete(key):
+                removed["l1"] += 1
+
+        logger.info(
+            f"Cache invalidated (namespace={namespace}, tag={tag}, prefix={prefix}): {removed}"
+        )
+        return removed
+
+    @staticmethod
+    def _l3_selector(
+        namespace: Optional[str],
+        key_prefix: str,
+        tag: Optional[str]
+    ) -> Tuple[str, List[Any]]:
+        """WHERE clause for invalidate(), served by the namespace/tag/key indexes"""
+        clauses = []
+        params: List[Any] = []
+        if namespace:
+            clauses.append("namespace = ?")
+            params.append(namespace)
+        if key_prefix and key_prefix != f"{namespace}:":
+            # Range scan on the primary key instead of LIKE
+            clauses.append("key >= ? AND key < ?")
+            params.extend([key_prefix, key_prefix + "\U0010ffff"])
+        if tag:
+            clauses.append("key IN (SELECT key FROM cache_tags WHERE tag = ?)")
+            params.append(tag)
+        return " AND ".join(clauses), params
+
+    async def _invalidate_redis(self, key_prefix: str, tag: Optional[str]) -> List[str]:
+        """Delete matching Redis keys, returns the keys that existed"""
+        if tag:
+            tag_key = self.REDIS_TAG_PREFIX + tag
+            members = await self.redis_client.smembers(tag_key)
+            keys = [
+                key for key in (
+                    member.decode("utf-8") if isinstance(member, bytes) else member
+                    for member in members
+                )
+                if key.startswith(key_prefix)
+            ]
+            if not key_prefix:
+                await self.redis_client.delete(tag_key)
+        else:
+            pattern = re.sub(r"([*?\[\]\\])", r"\\\1", key_prefix) + "*"
+            keys = [
+                key.decode("utf-8") if isinstance(key, bytes) else key
+                async for key in self.redis_client.scan_iter(match=pattern)
+            ]
 
-    async def cleanup_expired(self):
-        """Remove expired entries from all caches"""
+        for start in range(0, len(keys), 500):
+            await self.redis_client.delete(*keys[start:start + 500])
+        return keys
+
+    async def cleanup_expired(self) -> int:
+        """
+        Remove expired entries from all caches
+
+        SQLite rows are deleted in batches of SWEEP_BATCH_SIZE, releasing the
+        write lock in between so cache writes are never stalled for long.
+
+        Returns:
+            Number of expired SQLite rows removed
+        """
         # L1 cleanup
-        now = datetime.now()
-        expired_keys = [
-            k for k, (_, exp) in self.memory_cache.items()
-            if exp < now
-        ]
-        for k in expired_keys:
-            del self.memory_cache[k]
+        self.memory_cache.purge_expired()
+        now = datetime.now().isoformat()
 
         # L3 cleanup (Redis handles expiry automatically)
-        if self.sqlite_conn:
+        return await self._delete_in_batches(
+            "SELECT key FROM cache WHERE expires_at < ? LIMIT ?", (now,)
+        )
+
+    async def _delete_in_batches(self, select_sql: str, params: Tuple[Any, ...]) -> int:
+        """Delete rows whose keys select_sql returns (its last parameter is the batch size)"""
+        if not self.sqlite_conn:
+            return 0
+
+        removed = 0
+        while True:
+            async with self._write_lock:
+                try:
+                    cursor = await self.sqlite_conn.execute(
+                        f"DELETE FROM cache WHERE key IN ({select_sql})",
+                        (*params, self.SWEEP_BATCH_SIZE)
+                    )
+                    deleted = cursor.rowcount
+                    await self.sqlite_conn.commit()
+                except Exception as e:
+                    logger.warning(f"SQLite cleanup error: {e}")
+                    return removed
+            removed += deleted
+            if deleted < self.SWEEP_BATCH_SIZE:
+                return removed
+            # Let queued writes and reads run between batches
+            await asyncio.sleep(0)
+
+    async def warm_up(
+        self,
+        max_entries: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        order: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Preload the hottest live L3 entries into L1
+
+        Started in the background by initialize() so the first tool calls
+        after a restart hit memory. Entries are ranked by last access
+        ("recent") or by read count, most recent first among equals
+        ("frequent"), and read a page at a time by keyset, so each page
+        is an index range scan. Stops at max_entries, when time_budget
+        runs out, or when L1 is 80% full (warm-up never evicts anything).
+        Keys that are already in L1 are left alone.
+
+        Args:
+            max_entries: Entries to load (default: warmup_entries)
+            time_budget: Seconds to spend (default: warmup_seconds)
+            order: "recent" or "frequent" (default: warmup_order)
+
+        Returns:
+            Entries and bytes loaded, elapsed seconds, and whether it finished
+        """
+        max_entries = self.warmup_entries if max_entries is None else max_entries
+        time_budget = self.warmup_seconds if time_budget is None else time_budget
+        columns = self.WARMUP_ORDERS[order or self.warmup_order]
+        # (c1, c2, ...) < (?, ?, ...) resumes after the last row of the previous page
+        row_value = f"({', '.join(columns)})"
+        order_by = ", ".join(f"{column} DESC" for column in columns)
+        started = time.perf_counter()
+        deadline = started + time_budget
+        l1_limit = self.memory_cache.max_bytes * 0.8
+        loaded = 0
+        loaded_bytes = 0
+        complete = True
+
+        if self.sqlite_conn and max_entries > 0:
+            now = datetime.now().isoformat()
+            after: Optional[Tuple[Any, ...]] = None
+            while loaded < max_entries:
+                if time.perf_counter() >= deadline or self.memory_cache.current_bytes >= l1_limit:
+                    complete = False
+                    break
+
+                where = "expires_at > ?"
+                params: Tuple[Any, ...] = (now,)
+                if after is not None:
+                    where += f" AND {row_value} < ({', '.join('?' for _ in columns)})"
+                    params += after
+                async with self.sqlite_conn.execute(
+                    f"SELECT key, value, expires_at, refresh_at, {', '.join(columns)} FROM cache "
+                    f"WHERE {where} ORDER BY {order_by} LIMIT ?",
+                    (*params, self.SQLITE_IN_CHUNK)
+                ) as cursor:
+                    rows = await cursor.fetchall()
+                if not rows:
+                    break
+                after = tuple(rows[-1][4:])
+
+                tags_by_key = await self._get_l3_tags_many([row[0] for row in rows])
+                for key, value_blob, expires_at, refresh_at, *_ in rows:
+                    if loaded >= max_entries:
+                        break
+                    # Newer values were set (or queued) since the row was read
+                    if key in self.memory_cache or self._get_pending_write(key) is not _MISSING:
+                        continue
+                    try:
+                        value = self.codec.decode(value_blob)
+                    except CacheCodecError:
+                        continue
+                    remaining = (
+                        datetime.fromisoformat(expires_at) - datetime.now()
+                    ).total_seconds()
+                    if remaining <= 0:
+                        continue
+                    self.memory_cache.set(
+                        key, value, remaining,
+                        size=len(value_blob),
+                        refresh_at=datetime.fromisoformat(refresh_at) if refresh_at else None,
+                        tags=tags_by_key.get(key, frozenset())
+                    )
+                    loaded += 1
+                    loaded_bytes += len(value_blob)
+
+                # Don't hold up tool calls queued behind the warm-up
+                await asyncio.sleep(0)
+
+        self.warmup_loaded += loaded
+        self.warmup_bytes += loaded_bytes
+        self.warmup_elapsed = time.perf_counter() - started
+        self.warmup_complete = complete
+        logger.info(
+            f"Cache warm-up loaded {loaded} entries ({loaded_bytes} bytes) "
+            f"in {self.warmup_elapsed:.2f}s{'' if complete else ' (budget reached)'}"
+        )
+        return {
+            "loaded": loaded,
+            "bytes": loaded_bytes,
+            "seconds": round(self.warmup_elapsed, 4),
+            "complete": complete,
+        }
+
+    async def get_disk_usage(self) -> Dict[str, int]:
+        """Bytes used by live pages and by free pages in cache.db"""
+        if not self.sqlite_conn:
+            return {"used_bytes": 0, "free_bytes": 0}
+
+        values = {}
+        for pragma in ("page_size", "page_count", "freelist_count"):
+            async with self.sqlite_conn.execute(f"PRAGMA {pragma}") as cursor:
+                row = await cursor.fetchone()
+                values[pragma] = row[0] if row else 0
+
+        page_size = values["page_size"]
+        return {
+            "used_bytes": (values["page_count"] - values["freelist_count"]) * page_size,
+            "free_bytes": values["freelist_count"] * page_size,
+        }
+
+    async def enforce_size_cap(self) -> int:
+        """
+        Evict least recently accessed SQLite rows until cache.db fits its cap
+
+        Eviction runs down to SWEEP_LOW_WATERMARK of sqlite_max_bytes so the
+        cap isn't hit again by the next few writes.
+
+        Returns:
+            Number of rows evicted
+        """
+        if not self.sqlite_conn or not self.sqlite_max_bytes:
+            return 0
+
+        usage = await self.get_disk_usage()
+        if usage["used_bytes"] <= self.sqlite_max_bytes:
+            return 0
+
+        target = self.sqlite_max_bytes * self.SWEEP_LOW_WATERMARK
+        evicted = 0
+        while usage["used_bytes"] > target:
+            excess = usage["used_bytes"] - target
+            async with self._write_lock:
+                try:
+                    # Coldest rows first; rows never accessed since last_access
+                    # was added (0) sort before all others
+                    async with self.sqlite_conn.execute(
+                        "SELECT key, length(value) FROM cache ORDER BY last_access LIMIT ?",
+                        (self.SWEEP_BATCH_SIZE,)
+                    ) as cursor:
+                        candidates = await cursor.fetchall()
+
+                    victims = []
+                    freed = 0
+                    for key, size in candidates:
+                        victims.append((key,))
+                        freed += size or 0
+                        if freed >= excess:
+                            break
+
+                    await self.sqlite_conn.executemany(
+                        "DELETE FROM cache WHERE key = ?", victims
+                    )
+                    await self.sqlite_conn.commit()
+                except Exception as e:
+                    logger.warning(f"SQLite eviction error: {e}")
+                    break
+            for (key,) in victims:
+                self.metrics.record(namespace_of(key), "l3", "evictions")
+            if not victims:
+                break
+            evicted += len(victims)
+            await asyncio.sleep(0)
+            usage = await self.get_disk_usage()
+
+        if evicted:
+            logger.info(f"Evicted {evicted} cache rows to stay under {self.sqlite_max_bytes} bytes")
+        return evicted
+
+    async def _vacuum_if_idle(self) -> int:
+        """Return free pages to the OS when nothing else is using the cache"""
+        if self._pending_writes or self._inflight or self._write_lock.locked():
+            return 0
+
+        usage = await self.get_disk_usage()
+        if not usage["free_bytes"]:
+            return 0
+
+        async with self._write_lock:
             try:
-                await self.sqlite_conn.execute(
-                    "DELETE FROM cache WHERE expires_at < ?",
-                    (now.isoformat(),)
+                async with self.sqlite_conn.execute("PRAGMA freelist_count") as cursor:
+                    before = (await cursor.fetchone())[0]
+                # A no-op unless the file uses auto_vacuum=INCREMENTAL
+                # Frees one page per step; executescript runs it to completion
+                # where execute() would stop after the first page
+                await self.sqlite_conn.executescript(
+                    f"PRAGMA incremental_vacuum({self.VACUUM_PAGES_PER_SWEEP});"
                 )
-                await self.sqlite_conn.commit()
+                async with self.sqlite_conn.execute("PRAGMA wal_checkpoint(TRUNCATE)") as cursor:
+                    await cursor.fetchall()
+                async with self.sqlite_conn.execute("PRAGMA freelist_count") as cursor:
+                    after = (await cursor.fetchone())[0]
+            except Exception as e:
+                logger.warning(f"SQLite vacuum error: {e}")
+                return 0
+
+        self.vacuumed_pages += before - after
+        return before - after
+
+    async def sweep(self) -> Dict[str, int]:
+        """
+        Run one maintenance pass: flush, expire, enforce the size cap, vacuum
+
+        Returns:
+            Rows expired and evicted and pages vacuumed in this pass
+        """
+        started = time.perf_counter()
+        await self.flush()
+        expired = await self.cleanup_expired()
+        evicted = await self.enforce_size_cap()
+        vacuumed = await self._vacuum_if_idle()
+
+        self.sweeps += 1
+        self.swept_expired += expired
+        self.swept_evicted += evicted
+        self.last_sweep_seconds = time.perf_counter() - started
+        return {"expired": expired, "evicted": evicted, "vacuumed_pages": vacuumed}
+
+    async def _maintenance_loop(self):
+        """Background task started by initialize()"""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                result = await self.sweep()
+                logger.debug(f"Cache sweep: {result}")
             except Exception as e:
-                logger.warning(f"SQLite cleanup error: {e}")
+                logger.warning(f"Cache sweep error: {e}")
+
+    def _record_l1_eviction(self, key: str):
+        self.metrics.record(namespace_of(key), "l1", "evictions")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of per-tier and per-namespace cache metrics
+
+        Returns:
+            {"tiers": {"l1"|"l2"|"l3": {hits, misses, sets, evictions,
+                hit_ratio, get_latency, set_latency, ...}},
+             "namespaces": {namespace: {tier: {hits, misses, sets, evictions, hit_ratio}}},
+             "serialization": {encode_latency, decode_latency, compression_ratio}}
+
+            Latencies are {count, avg_ms, p50_ms, p95_ms, p99_ms, max_ms}.
+        """
+        snapshot = self.metrics.snapshot()
+        snapshot["serialization"] = {
+            "serializer": self.codec.serializer,
+            "compression": self.codec.compression,
+            "compression_ratio": self.codec.get_statistics()["compression_ratio"],
+            "encode_latency": self.codec.encode_latency.snapshot(),
+            "decode_latency": self.codec.decode_latency.snapshot(),
+        }
+        return snapshot
 
     async def get_statistics(self) -> Dict[str, Any]:
         """Get cache statistics"""
+        l1_stats = self.memory_cache.get_statistics()
         stats = {
-            "l1_memory_items": len(self.memory_cache),
-            "l1_max_items": self.max_memory_items
+            "l1_memory_items": l1_stats["items"],
+            "l1_memory_bytes": l1_stats["bytes"],
+            "l1_max_bytes": l1_stats["max_bytes"],
+            "l1_hits": l1_stats["hits"],
+            "l1_misses": l1_stats["misses"],
+            "l1_hit_ratio": l1_stats["hit_ratio"],
+            "l1_evictions": l1_stats["evictions"],
+            "l1_expirations": l1_stats["expirations"],
         }
 
+        stats.update({
+            "l3_pending_writes": len(self._pending_writes),
+            "l3_flushes": self.l3_flushes,
+            "l3_rows_written": self.l3_rows_written,
+            "l3_dropped_writes": self.l3_dropped_writes,
+            "l3_max_bytes": self.sqlite_max_bytes,
+            "sweeps": self.sweeps,
+            "swept_expired": self.swept_expired,
+            "swept_evicted": self.swept_evicted,
+            "vacuumed_pages": self.vacuumed_pages,
+            "last_sweep_seconds": round(self.last_sweep_seconds, 4),
+            "warmup_loaded": self.warmup_loaded,
+            "warmup_bytes": self.warmup_bytes,
+            "warmup_seconds": round(self.warmup_elapsed, 4),
+            "warmup_complete": self.warmup_complete,
+            "loader_calls": self.loader_calls,
+            "coalesced_requests": self.coalesced_requests,
+            "inflight_loads": len(self._inflight),
+            "stale_hits": self.stale_hits,
+            "refreshes_scheduled": self.refreshes_scheduled,
+            "refresh_failures": self.refresh_failures,
+            "negative_hits": self.negative_hits,
+            "negative_writes": self.negative_writes,
+        })
+
+        codec_stats = self.codec.get_statistics()
+        stats.update({
+            f"codec_{name}": value for name, value in codec_stats.items()
+        })
+
         if self.sqlite_conn:
             try:
                 async with self.sqlite_conn.execute(
@@ -307,13 +1785,45 @@ class CacheManager:
                 ) as cursor:
                     row = await cursor.fetchone()
                     stats["l3_sqlite_items"] = row[0] if row else 0
+                usage = await self.get_disk_usage()
+                stats["l3_disk_bytes"] = usage["used_bytes"]
+                stats["l3_free_bytes"] = usage["free_bytes"]
             except Exception as e:
                 logger.warning(f"SQLite stats error: {e}")
 
         return stats
 
     async def close(self):
-        """Close cache connections"""
+        """Flush pending writes and close cache connections"""
+        for task in (self._warmup_task, self._maintenance_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._warmup_task = None
+        self._maintenance_task = None
+
+        # Background refreshes would write into closed connections
+        inflight = list(self._inflight.values())
+        for task in inflight:
+            task.cancel()
+        await asyncio.gather(*inflight, return_exceptions=True)
+        if self._flush_task and not self._flush_task.done():
+            # Wake the writer; its loop exits once the queue is drained
+            self._flush_wakeup.set()
+            try:
+                await self._flush_task
+            except Exception as e:
+                logger.warning(f"SQLite writer error on close: {e}")
+        self._flush_task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"SQLite flush on close error: {e}")
+
         if self.redis_client:
             try:
                 await self.redis_client.close()
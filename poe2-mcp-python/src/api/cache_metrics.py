@@ -0,0 +1,134 @@
+"""
+Cache instrumentation
+Per-namespace, per-tier counters and latency histograms for CacheManager
+"""
+
+import bisect
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+TIERS = ("l1", "l2", "l3")
+EVENTS = ("hits", "misses", "sets", "evictions")
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000
+)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+
+    Recording is O(log buckets) and memory is constant, so it can sit on
+    every cache get. Percentiles are reported as the upper bound of the
+    bucket they fall in.
+    """
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        """Record one duration"""
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, fraction: float) -> float:
+        """Approximate percentile in milliseconds (fraction in 0..1)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index < len(self.buckets_ms):
+                    return min(self.buckets_ms[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 4) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 4),
+        }
+
+
+class CacheMetrics:
+    """
+    Counters and latency histograms for the cache tiers
+
+    Counters are kept per (namespace, tier, event) so a slow tool can be
+    traced to e.g. "character lookups miss L1 and wait on SQLite". Latency
+    histograms are kept per (tier, operation).
+    """
+
+    def __init__(self) -> None:
+        self._counters: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def record(self, namespace: Optional[str], tier: str, event: str, count: int = 1):
+        """Count a hit, miss, set or eviction for a namespace in a tier"""
+        self._counters[(namespace or "other", tier, event)] += count
+
+    def observe(self, tier: str, operation: str, seconds: float):
+        """Record the latency of one tier operation (get, set, flush, ...)"""
+        histogram = self._latency.get((tier, operation))
+        if histogram is None:
+            histogram = self._latency[(tier, operation)] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def histogram(self, tier: str, operation: str) -> LatencyHistogram:
+        return self._latency.get((tier, operation)) or LatencyHistogram()
+
+    def reset(self):
+        self._counters.clear()
+        self._latency.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current metrics as plain data
+
+        Returns:
+            {"tiers": {tier: counters + hit_ratio + latency},
+             "namespaces": {namespace: {tier: counters}}}
+        """
+        tiers: Dict[str, Dict[str, Any]] = {
+            tier: {event: 0 for event in EVENTS} for tier in TIERS
+        }
+        namespaces: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+        for (namespace, tier, event), count in self._counters.items():
+            tiers.setdefault(tier, {e: 0 for e in EVENTS})[event] += count
+            namespace_tiers = namespaces.setdefault(namespace, {})
+            namespace_tiers.setdefault(tier, {e: 0 for e in EVENTS})[event] += count
+
+        for counters in tiers.values():
+            _add_hit_ratio(counters)
+        for namespace_tiers in namespaces.values():
+            for counters in namespace_tiers.values():
+                _add_hit_ratio(counters)
+
+        for (tier, operation), histogram in self._latency.items():
+            tiers.setdefault(tier, {e: 0 for e in EVENTS})[f"{operation}_latency"] = (
+                histogram.snapshot()
+            )
+
+        return {"tiers": tiers, "namespaces": namespaces}
+
+
+def _add_hit_ratio(counters: Dict[str, Any]):
+    lookups = counters["hits"] + counters["misses"]
+    counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
@@ -7,11 +7,17 @@ Fetches character data from multiple sources with intelligent fallback:
 4. Direct web scraping (last resort)
 """
 
+import asyncio
+import json
 import logging
 import re
-from typing import Optional, Dict, Any, List
+from collections import deque
+from typing import (
+    Optional, Dict, Any, List, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque,
+    Iterable, NamedTuple, Set, Tuple
+)
+from urllib.parse import urlparse
 import httpx
-from bs4 import BeautifulSoup
 
 try:
     from ..config import settings
@@ -19,11 +25,30 @@ try:
 except ImportError:
     from src.config import settings
     from src.api.poe_ninja_api import PoeNinjaAPI
-from .rate_limiter import RateLimiter
+from .rate_limiter import MultiRateLimiter, RateLimiter, request_priority
 from .cache_manager import CacheManager
+from .http_client import ConditionalFetcher, HTTPClientFactory
+from .circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from .ladder_snapshot import LadderSnapshotStore
+from .html_parsing import make_soup, run_parser
 
 logger = logging.getLogger(__name__)
 
+# A character source: (name, circuit breaker name, loader, accepts result)
+_Source = Tuple[
+    str, Optional[str], Callable[[], Awaitable[Any]], Callable[[Optional[Dict[str, Any]]], bool]
+]
+
+
+class CharacterResult(NamedTuple):
+    """One entry of a CharacterFetcher.get_characters() batch"""
+    account: str
+    character: str
+    league: str
+    data: Optional[Dict[str, Any]] = None
+    error: str = ""  # why data is None
+    cached: bool = False  # answered from the cache without a fetch
+
 
 class CharacterFetcher:
     """
@@ -41,15 +66,57 @@ class CharacterFetcher:
         "Abyss Hardcore SSF": "SSF Hardcore Abyss",
     }
 
+    # Rate limiter policy key for the official ladder API
+    LADDER_POLICY = "ladder"
+
+    # Circuit breaker sources (the poe.ninja API's is PoeNinjaAPI.CIRCUIT)
+    SSE_CIRCUIT = "poe_ninja_sse"
+    LADDER_CIRCUIT = "ladder"
+    SCRAPE_CIRCUIT = "scrape"  # per host: scrape:<host>
+
     def __init__(
         self,
         cache_manager: Optional[CacheManager] = None,
-        rate_limiter: Optional[RateLimiter] = None
+        rate_limiter: Optional[RateLimiter] = None,
+        official_rate_limiter: Optional[RateLimiter] = None,
+        rate_limiters: Optional[MultiRateLimiter] = None,
+        http_clients: Optional[HTTPClientFactory] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        ladder_snapshots: Optional[LadderSnapshotStore] = None
     ):
+        """
+        Args:
+            cache_manager: Shared cache
+            rate_limiter: Limiter for poe.ninja (defaults to the registry's)
+            official_rate_limiter: Limiter for pathofexile.com (ladder and
+                profile pages; defaults to the registry's)
+            rate_limiters: Per-host limiter registry, built from config.yaml if omitted
+            http_clients: Shared HTTP client factory; a private one if omitted
+            circuit_breakers: Per-source circuit breakers, shared with the
+                ninja API client; a private registry if omitted
+            ladder_snapshots: Local ladder copy that answers ladder queries;
+                without one every query pages through the ladder API
+        """
         self.cache_manager = cache_manager
-        self.rate_limiter = rate_limiter or RateLimiter(rate_limit=5)  # Be gentle with third-party APIs
+        self.ladder_snapshots = ladder_snapshots
+        # One snapshot refresh per league at a time
+        self._snapshot_locks: Dict[str, asyncio.Lock] = {}
+        # Refreshes started by ladder queries, so none waits on a full crawl
+        self._snapshot_refreshes: Dict[str, "asyncio.Task[None]"] = {}
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry()
+        self.rate_limiters = rate_limiters or MultiRateLimiter.from_config()
+        self.rate_limiter = rate_limiter or self.rate_limiters.for_url(settings.POE_NINJA_PROFILE_URL)
+        # The official ladder API publishes its limits in X-Rate-Limit-* headers
+        self.official_rate_limiter = (
+            official_rate_limiter or self.rate_limiters.for_url(settings.POE_OFFICIAL_API)
+        )
 
-        self.client = httpx.AsyncClient(
+        # Shared pooled client; a private factory when none is passed
+        self._owns_http_clients = http_clients is None
+        self.http_clients = http_clients or HTTPClientFactory()
+        # Browser-like profile for the ladder API and profile page scraping
+        self.client = self.http_clients.get_client(
+            "browser",
             timeout=settings.REQUEST_TIMEOUT,
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -57,12 +124,26 @@ class CharacterFetcher:
             follow_redirects=True
         )
 
+        # Ladder pages are revalidated with ETag / If-Modified-Since
+        self.conditional = ConditionalFetcher(self.cache_manager)
+
         # Initialize poe.ninja API client
-        self.ninja_api = PoeNinjaAPI(rate_limiter=self.rate_limiter, cache_manager=self.cache_manager)
+        self.ninja_api = PoeNinjaAPI(
+            rate_limiter=self.rate_limiter,
+            cache_manager=self.cache_manager,
+            http_clients=self.http_clients,
+            circuit_breakers=self.circuit_breakers
+        )
 
-        # Track last error message for debugging
+        # Error of the last get_character() call; sources only log theirs
         self.last_error_message: str = ""
 
+    def _limiter_for(self, url: str) -> RateLimiter:
+        """Rate limiter for the host a URL points at"""
+        if urlparse(url).hostname == urlparse(settings.POE_OFFICIAL_API).hostname:
+            return self.official_rate_limiter
+        return self.rate_limiter
+
     def _normalize_league_name(self, league: str) -> str:
         """
         Normalize league name for official PoE API
@@ -85,11 +166,35 @@ class CharacterFetcher:
         # Return as-is if no mapping found (works for Standard, Hardcore, etc.)
         return league
 
+    def _league_tag(self, league: str) -> str:
+        """Cache tag for a league, the same for its display and API names"""
+        return f"league:{self._normalize_league_name(league)}"
+
+    async def _get_or_compute(
+        self,
+        cache_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        negative_ttl: Optional[int] = None
+    ) -> Any:
+        """Run loader through the cache (single-flight), or directly without one"""
+        if self.cache_manager:
+            return await self.cache_manager.get_or_compute(
+                cache_key, loader,
+                ttl=ttl, soft_ttl=soft_ttl, tags=tags, negative_ttl=negative_ttl
+            )
+        return await loader()
+
     async def get_character(
         self,
         account_name: str,
         character_name: str,
-        league: str = "Standard"
+        league: str = "Standard",
+        use_negative_cache: bool = True,
+        hedge_delay: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Fetch character data using all available sources with intelligent fallback
@@ -100,140 +205,563 @@ class CharacterFetcher:
         3. Official ladder API
         4. Direct HTML scraping
 
+        Sources whose circuit breaker is open are skipped, and the rest are
+        tried healthiest first (recent success rate, then p50 latency; ties
+        keep the order above). A source that fails or finds nothing hands
+        over to the next one at once. In hedged mode (hedge_delay > 0) the next source is also
+        started when the running ones haven't answered within hedge_delay
+        seconds; the first valid result wins. The other sources are
+        cancelled, and their requests stop unless another lookup of the same
+        character is waiting on them; a cancelled source caches nothing.
+
+        Every source remembers "not found" for CACHE_NEGATIVE_TTL seconds, and
+        so does the chain as a whole, so repeated lookups of a missing or
+        private character cost one cache read instead of the full chain.
+        Only a definite miss counts (404, an empty or unparseable profile,
+        absence from the ladder); a source that is rate limited, erroring or
+        unreachable remembers nothing, and neither does the chain.
+
         Args:
             account_name: PoE account name
             character_name: Character name
             league: League name
+            use_negative_cache: Set False to ignore remembered misses and
+                query every source again
+            hedge_delay: Seconds before racing the next source
+                (default CHARACTER_HEDGE_DELAY, 0 = strictly one at a time)
+            deadline: Seconds the whole lookup may take
+                (default CHARACTER_FETCH_DEADLINE, 0 = no limit)
 
         Returns:
             Character data dictionary or None if not found
         """
+        char_data, error = await self._lookup_character(
+            account_name, character_name, league,
+            use_negative_cache=use_negative_cache,
+            hedge_delay=hedge_delay,
+            deadline=deadline
+        )
+        self.last_error_message = error
+        return char_data
+
+    async def _lookup_character(
+        self,
+        account_name: str,
+        character_name: str,
+        league: str,
+        use_negative_cache: bool = True,
+        hedge_delay: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        get_character() without setting last_error_message: the error,
+        including any source failures, comes back with the result so
+        concurrent lookups don't overwrite each other's
+
+        Returns:
+            (character data or None, error message or "")
+        """
         logger.info(f"Fetching character {character_name} for account {account_name} (league: {league})")
 
-        # Try poe.ninja API first (most reliable)
-        try:
-            logger.debug(f"  Trying poe.ninja API with league={league}")
-            char_data = await self.ninja_api.get_character(account_name, character_name, league)
-            if char_data and char_data.get("level", 0) > 0:
-                logger.info(f"✅ Successfully fetched from poe.ninja API")
-                self.last_error_message = ""  # Clear error on success
-                return char_data
-        except Exception as e:
-            self.last_error_message = f"poe.ninja API error: {str(e)}"
-            logger.warning(f"⚠️ {self.last_error_message}")
+        chain_key = self._chain_key(account_name, character_name, league)
+        chain_tags = [f"account:{account_name}", self._league_tag(league)]
+        if use_negative_cache and self.cache_manager and await self.cache_manager.is_negative(chain_key):
+            logger.info(f"Skipping lookup, recently not found: {character_name}")
+            return None, self._recently_missing_message(account_name, character_name, league)
+
+        def has_level(data: Optional[Dict[str, Any]]) -> bool:
+            return bool(data) and data.get("level", 0) > 0
+
+        # (name, circuit, loader, accepts result), in priority order
+        sources: List[_Source] = [
+            (
+                "poe.ninja API",
+                self.ninja_api.CIRCUIT,
+                lambda: self.ninja_api.get_character(
+                    account_name, character_name, league,
+                    use_negative_cache=use_negative_cache
+                ),
+                has_level
+            ),
+            (
+                "poe.ninja SSE API",
+                self.SSE_CIRCUIT,
+                lambda: self.get_character_from_poe_ninja(
+                    account_name, character_name, league,
+                    use_negative_cache=use_negative_cache
+                ),
+                has_level
+            ),
+            (
+                "Ladder API",
+                self.LADDER_CIRCUIT,
+                lambda: self.get_character_from_ladder(
+                    character_name, league,
+                    use_negative_cache=use_negative_cache
+                ),
+                bool
+            ),
+            (
+                "Direct scraping",
+                None,  # one breaker per scraped host, checked per URL
+                lambda: self._scrape_character_direct(
+                    account_name, character_name,
+                    use_negative_cache=use_negative_cache
+                ),
+                bool
+            ),
+        ]
 
-        # Fallback to poe.ninja SSE/model API
-        try:
-            char_data = await self.get_character_from_poe_ninja(account_name, character_name, league)
-            if char_data and char_data.get("level", 0) > 0:
-                logger.info("Successfully fetched from poe.ninja SSE API")
-                self.last_error_message = ""  # Clear error on success
-                return char_data
-        except Exception as e:
-            self.last_error_message = f"poe.ninja SSE API error: {str(e)}"
-            logger.warning(self.last_error_message)
+        if hedge_delay is None:
+            hedge_delay = settings.CHARACTER_HEDGE_DELAY
+        if deadline is None:
+            deadline = settings.CHARACTER_FETCH_DEADLINE
 
-        # Fallback to ladder API
-        try:
-            char_data = await self.get_character_from_ladder(character_name, league)
-            if char_data:
-                logger.info("Successfully fetched from ladder API")
-                self.last_error_message = ""  # Clear error on success
-                return char_data
-        except Exception as e:
-            self.last_error_message = f"Ladder API error: {str(e)}"
-            logger.warning(self.last_error_message)
+        sources.sort(
+            key=lambda source: self.circuit_breakers.get(source[1]).rank_key()
+            if source[1] else (0, -1.0, 0)
+        )
 
-        # Last resort: direct HTML scraping
         try:
-            char_data = await self._scrape_character_direct(account_name, character_name)
-            if char_data:
-                logger.info("Successfully fetched via direct scraping")
-                self.last_error_message = ""  # Clear error on success
-                return char_data
-        except Exception as e:
-            self.last_error_message = f"Direct scraping error: {str(e)}"
-            logger.warning(self.last_error_message)
+            char_data, skipped, source_errors = await self._race_sources(
+                sources, hedge_delay, deadline
+            )
+        except asyncio.TimeoutError:
+            # Out of time is not "not found", so nothing is remembered
+            error = (
+                f"Timed out after {deadline:g}s fetching character '{character_name}' "
+                f"(account: {account_name}, league: {league}). Try again shortly."
+            )
+            logger.error(error)
+            return None, error
+
+        if char_data:
+            return char_data, ""
+
+        failures = f" Source errors: {'; '.join(source_errors)}." if source_errors else ""
+
+        if skipped or source_errors:
+            # Not every source answered, so this is no proof the character
+            # doesn't exist; don't remember it as missing
+            unavailable = (
+                f"; unavailable sources skipped: {', '.join(skipped)}" if skipped else ""
+            )
+            error = (
+                f"Character '{character_name}' not found{unavailable} "
+                f"(account: {account_name}, league: {league}). "
+                f"Try again shortly.{failures}"
+            )
+            logger.error(error)
+            return None, error
 
         # All methods exhausted
-        self.last_error_message = (
+        error = (
             f"Character '{character_name}' not found after trying all sources "
             f"(account: {account_name}, league: {league}). "
+            f"Verify the character exists and is public.{failures}"
+        )
+        logger.error(error)
+        if use_negative_cache and self.cache_manager:
+            await self.cache_manager.set_negative(
+                chain_key, settings.CACHE_NEGATIVE_TTL, tags=chain_tags
+            )
+        return None, error
+
+    @staticmethod
+    def _chain_key(account_name: str, character_name: str, league: str) -> str:
+        """Key the whole source chain remembers a miss under"""
+        return f"character:chain:{account_name}:{character_name}:{league}"
+
+    @staticmethod
+    def _recently_missing_message(account_name: str, character_name: str, league: str) -> str:
+        return (
+            f"Character '{character_name}' was not found on any source in the last "
+            f"{settings.CACHE_NEGATIVE_TTL} seconds (account: {account_name}, league: {league}). "
             f"Verify the character exists and is public."
         )
-        logger.error(self.last_error_message)
-        return None
+
+    def get_characters(
+        self,
+        characters: Iterable[Tuple[str, str, str]],
+        concurrency: Optional[int] = None,
+        use_negative_cache: bool = True,
+        hedge_delay: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[CharacterResult]:
+        """
+        Fetch many characters, yielding each result as soon as it is ready
+
+        Cached characters and remembered misses are looked up in one batch
+        first and yielded straight away. The rest are fetched with
+        get_character()'s source chain, at most `concurrency` at a time;
+        requests are paced by the per-host rate limiters, not by sleeping
+        between characters. A failed lookup is yielded with its error
+        instead of aborting the batch. Closing the iterator early
+        (await results.aclose()) cancels the fetches still running.
+
+        Example:
+            async for result in fetcher.get_characters([(account, name, league)]):
+                if result.data is None:
+                    logger.warning(result.error)
+
+        Args:
+            characters: (account, character, league) triples; duplicates
+                are fetched once
+            concurrency: Lookups in flight at once (default CHARACTER_BATCH_CONCURRENCY)
+            use_negative_cache: As for get_character()
+            hedge_delay: As for get_character()
+            deadline: As for get_character(), per character
+
+        Returns:
+            Async iterator of one CharacterResult per distinct character,
+            in completion order
+        """
+        characters = list(characters)
+
+        async def one_batch() -> AsyncIterator[List[Tuple[str, str, str]]]:
+            yield characters
+
+        return self.stream_characters(
+            one_batch(),
+            concurrency=concurrency,
+            use_negative_cache=use_negative_cache,
+            hedge_delay=hedge_delay,
+            deadline=deadline
+        )
+
+    async def stream_characters(
+        self,
+        batches: AsyncIterable[Iterable[Tuple[str, str, str]]],
+        concurrency: Optional[int] = None,
+        use_negative_cache: bool = True,
+        hedge_delay: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[CharacterResult]:
+        """
+        get_characters() for input that arrives over time, e.g. ladder pages
+
+        Each batch is checked against the cache in one read; its misses go
+        to a pool of `concurrency` workers through a queue of the same size.
+        The next batch is only pulled while that queue has room, so a
+        producer that fetches pages lazily stays at most one batch ahead. Closing the iterator
+        early cancels the workers and stops pulling batches.
+
+        Args:
+            batches: Async iterable of (account, character, league) batches;
+                characters seen in an earlier batch are skipped
+            concurrency: Lookups in flight at once (default CHARACTER_BATCH_CONCURRENCY)
+            use_negative_cache: As for get_character()
+            hedge_delay: As for get_character()
+            deadline: As for get_character(), per character
+
+        Yields:
+            CharacterResult per distinct character, in completion order
+        """
+        worker_count = concurrency or settings.CHARACTER_BATCH_CONCURRENCY
+        # Bounded, so batches are pulled only as fast as they are fetched
+        work: "asyncio.Queue[Optional[Tuple[str, str, str]]]" = asyncio.Queue(maxsize=worker_count)
+        # Results, plus one None per worker that has finished
+        results: "asyncio.Queue[Optional[CharacterResult]]" = asyncio.Queue()
+        seen: Set[Tuple[str, str, str]] = set()
+
+        async def feed():
+            try:
+                async for batch in batches:
+                    pending = [request for request in dict.fromkeys(batch) if request not in seen]
+                    seen.update(pending)
+                    hits, misses = await self._check_cached_characters(pending, use_negative_cache)
+                    for result in hits:
+                        results.put_nowait(result)
+                    for request in misses:
+                        await work.put(request)
+            except Exception as e:
+                logger.warning(f"Character batch source failed: {e}")
+            # Tell every worker there is no more work (not when cancelled:
+            # the workers are cancelled too)
+            for _ in range(worker_count):
+                await work.put(None)
+
+        async def worker():
+            try:
+                while True:
+                    request = await work.get()
+                    if request is None:
+                        break
+                    try:
+                        char_data, error = await self._lookup_character(
+                            *request,
+                            use_negative_cache=use_negative_cache,
+                            hedge_delay=hedge_delay,
+                            deadline=deadline
+                        )
+                    except Exception as e:
+                        logger.warning(f"Error fetching character {request[1]}: {e}")
+                        char_data, error = None, f"Error fetching character '{request[1]}': {e}"
+                    results.put_nowait(CharacterResult(*request, data=char_data, error=error))
+            finally:
+                results.put_nowait(None)
+
+        tasks = [asyncio.ensure_future(feed())]
+        tasks += [asyncio.ensure_future(worker()) for _ in range(worker_count)]
+        try:
+            running = worker_count
+            while running:
+                result = await results.get()
+                if result is None:
+                    running -= 1
+                else:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _check_cached_characters(
+        self,
+        requests: List[Tuple[str, str, str]],
+        use_negative_cache: bool
+    ) -> Tuple[List[CharacterResult], List[Tuple[str, str, str]]]:
+        """
+        Answer what the cache can in one read
+
+        Returns:
+            (results for cached characters and remembered misses,
+            requests that need a fetch)
+        """
+        if not self.cache_manager or not requests:
+            return [], list(requests)
+
+        keys: Dict[Tuple[str, str, str], Tuple[str, str]] = {
+            request: (
+                self.ninja_api.character_cache_key(*request),
+                self._chain_key(*request) + self.cache_manager.NEGATIVE_SUFFIX
+            )
+            for request in requests
+        }
+        cached = await self.cache_manager.get_many(
+            key for pair in keys.values() for key in pair
+        )
+        hits: List[CharacterResult] = []
+        misses: List[Tuple[str, str, str]] = []
+        for request in requests:
+            char_key, missing_key = keys[request]
+            char_data = cached.get(char_key)
+            if char_data and char_data.get("level", 0) > 0:
+                hits.append(CharacterResult(*request, data=char_data, cached=True))
+            elif use_negative_cache and missing_key in cached:
+                hits.append(CharacterResult(
+                    *request, error=self._recently_missing_message(*request), cached=True
+                ))
+            else:
+                misses.append(request)
+        return hits, misses
+
+    async def _race_sources(
+        self,
+        sources: List[_Source],
+        hedge_delay: float,
+        deadline: float
+    ) -> Tuple[Optional[Dict[str, Any]], List[str], List[str]]:
+        """
+        Run sources in order, hedging and capping the total time
+
+        Keeps no state on the fetcher, so concurrent lookups can race
+        their sources independently. Sources still running when one wins
+        or the deadline passes are cancelled; their cached loads stop too
+        unless another lookup is waiting on them (see
+        CacheManager.get_or_compute).
+
+        Args:
+            sources: (name, circuit, loader, accepts result) in the order to try
+            hedge_delay: Seconds before the next source is started alongside
+                the running ones (0 = only after they fail)
+            deadline: Seconds before giving up (0 = no limit)
+
+        Returns:
+            (first accepted result or None, names of sources skipped
+            because their circuit is open or opened before their request,
+            "<source> error: ..." for each other source that raised)
+
+        Raises:
+            asyncio.TimeoutError: The deadline passed first
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline if deadline > 0 else None
+        queue = list(sources)
+        running: Dict["asyncio.Task[Any]", Tuple[str, Callable[[Any], bool]]] = {}
+        skipped: List[str] = []
+        errors: List[str] = []
+
+        def launch():
+            while queue:
+                name, circuit, loader, accepts = queue.pop(0)
+                if circuit and self.circuit_breakers.get(circuit).is_open:
+                    logger.debug(f"  Skipping {name}, circuit open")
+                    skipped.append(name)
+                    continue
+                logger.debug(f"  Trying {name}")
+                running[asyncio.ensure_future(loader())] = (name, accepts)
+                return
+
+        try:
+            while queue or running:
+                if not running:
+                    launch()
+                    if not running:
+                        break
+
+                timeout = hedge_delay if (queue and hedge_delay > 0) else None
+                if deadline_at is not None:
+                    remaining = deadline_at - loop.time()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    if deadline_at is not None and loop.time() >= deadline_at:
+                        raise asyncio.TimeoutError()
+                    # Slow source: hedge with the next one
+                    if queue:
+                        launch()
+                    continue
+
+                for task in done:
+                    name, accepts = running.pop(task)
+                    try:
+                        char_data = task.result()
+                    except CircuitOpenError:
+                        # Opened after launch(): unavailable, not a failure
+                        logger.debug(f"  Skipping {name}, circuit opened")
+                        skipped.append(name)
+                        continue
+                    except Exception as e:
+                        errors.append(f"{name} error: {str(e)}")
+                        logger.warning(errors[-1])
+                        continue
+                    if accepts(char_data):
+                        logger.info(f"Successfully fetched from {name}")
+                        return char_data, skipped, errors
+                # A source came up empty: hand over without waiting out the delay
+                if queue:
+                    launch()
+            return None, skipped, errors
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
 
     async def _scrape_character_direct(
         self,
         account_name: str,
-        character_name: str
+        character_name: str,
+        use_negative_cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Direct web scraping as last resort
         Tries multiple URL patterns and parsing strategies
         """
+        cache_key = f"character:scrape:{account_name}:{character_name}"
+
+        return await self._get_or_compute(
+            cache_key,
+            lambda: self._scrape_character_urls(account_name, character_name),
+            ttl=settings.CACHE_TTL,
+            tags=[f"account:{account_name}"],
+            negative_ttl=settings.CACHE_NEGATIVE_TTL if use_negative_cache else None
+        )
+
+    async def _scrape_character_urls(
+        self,
+        account_name: str,
+        character_name: str
+    ) -> Optional[Dict[str, Any]]:
         urls_to_try = [
             f"https://poe.ninja/poe2/builds/character/{account_name}/{character_name}",
             f"https://www.pathofexile.com/account/view-profile/{account_name}/characters/{character_name}",
             f"https://poe.ninja/builds/character/{account_name}/{character_name}",
         ]
 
+        # Last page that couldn't be read (as opposed to a 404 or a page
+        # without character data)
+        failure: Optional[Exception] = None
+
         for url in urls_to_try:
             try:
-                await self.rate_limiter.acquire()
+                await self._limiter_for(url).acquire()
                 logger.debug(f"Trying direct scrape from: {url}")
 
-                response = await self.client.get(url)
-                if response.status_code == 200:
-                    # Try to parse any character data we can find
-                    soup = BeautifulSoup(response.text, 'html.parser')
-
-                    char_data = {
-                        "name": character_name,
-                        "account": account_name,
-                        "class": "Unknown",
-                        "level": 0,
-                        "source": "web_scraping"
-                    }
-
-                    # Try to extract basic info
-                    # Look for common patterns
-                    level_patterns = [r'Level:\s*(\d+)', r'level":\s*(\d+)', r'<span.*?level.*?>(\d+)</span>']
-                    for pattern in level_patterns:
-                        match = re.search(pattern, response.text, re.IGNORECASE)
-                        if match:
-                            char_data["level"] = int(match.group(1))
-                            break
-
-                    class_patterns = [r'Class:\s*(\w+)', r'class":\s*"([^"]+)"', r'<span.*?class.*?>([^<]+)</span>']
-                    for pattern in class_patterns:
-                        match = re.search(pattern, response.text, re.IGNORECASE)
-                        if match:
-                            char_data["class"] = match.group(1)
-                            break
-
-                    if char_data["level"] > 0:
-                        logger.info(f"Extracted basic character data from {url}")
-                        return char_data
-
+                response = await self.circuit_breakers.get(
+                    f"{self.SCRAPE_CIRCUIT}:{urlparse(url).hostname}"
+                ).request(lambda: self.client.get(url))
+                if response.status_code == 404:
+                    continue
+                response.raise_for_status()
             except Exception as e:
                 logger.debug(f"Failed to scrape {url}: {e}")
+                failure = e
                 continue
 
+            char_data = await run_parser(
+                self._extract_basic_character, response.text, account_name, character_name
+            )
+            if char_data:
+                logger.info(f"Extracted basic character data from {url}")
+                return char_data
+
+        if failure:
+            # Not every page was read, so this is no proof the character is missing
+            raise failure
+
         # All scraping attempts failed
-        self.last_error_message = (
+        logger.warning(
             f"Could not scrape character data for {character_name} "
             f"(account: {account_name}) from any URL"
         )
-        logger.warning(self.last_error_message)
         return None
 
+    @staticmethod
+    def _extract_basic_character(
+        html: str,
+        account_name: str,
+        character_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Level and class pattern-matched from a profile page (runs off the event loop)"""
+        char_data = {
+            "name": character_name,
+            "account": account_name,
+            "class": "Unknown",
+            "level": 0,
+            "source": "web_scraping"
+        }
+
+        # Try to extract basic info
+        # Look for common patterns
+        level_patterns = [r'Level:\s*(\d+)', r'level":\s*(\d+)', r'<span.*?level.*?>(\d+)</span>']
+        for pattern in level_patterns:
+            match = re.search(pattern, html, re.IGNORECASE)
+            if match:
+                char_data["level"] = int(match.group(1))
+                break
+
+        class_patterns = [r'Class:\s*(\w+)', r'class":\s*"([^"]+)"', r'<span.*?class.*?>([^<]+)</span>']
+        for pattern in class_patterns:
+            match = re.search(pattern, html, re.IGNORECASE)
+            if match:
+                char_data["class"] = match.group(1)
+                break
+
+        return char_data if char_data["level"] > 0 else None
+
     async def get_character_from_poe_ninja(
         self,
         account_name: str,
         character_name: str,
-        league: str = "Standard"
+        league: str = "Standard",
+        use_negative_cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Fetch character data from poe.ninja profile page
@@ -242,70 +770,57 @@ class CharacterFetcher:
             account_name: PoE account name (e.g., "Tomawar40-2671")
             character_name: Character name
             league: League name (default: "Standard")
+            use_negative_cache: Remember "not found" for CACHE_NEGATIVE_TTL seconds
 
         Returns:
             Character data dictionary or None if not found
-        """
-        cache_key = f"poeninja_char:{account_name}:{character_name}"
 
-        # Check cache
-        if self.cache_manager:
-            cached_data = await self.cache_manager.get(cache_key)
-            if cached_data:
-                logger.info(f"Cache hit for character {character_name}")
-                return cached_data
+        Raises:
+            httpx.HTTPError: poe.ninja could not be reached or answered with
+                an error other than 404; nothing is cached
+        """
+        cache_key = f"character:poeninja:{account_name}:{character_name}"
 
-        # Apply rate limiting
-        await self.rate_limiter.acquire()
+        async def load() -> Optional[Dict[str, Any]]:
+            # Apply rate limiting
+            await self.rate_limiter.acquire()
 
-        try:
             # URL format: https://poe.ninja/poe2/profile/{account}/character/{character}
             url = f"{settings.POE_NINJA_PROFILE_URL}/poe2/profile/{account_name}/character/{character_name}"
             logger.info(f"Fetching character from poe.ninja: {url}")
 
-            response = await self.client.get(url)
+            response = await self.circuit_breakers.get(self.SSE_CIRCUIT).request(
+                lambda: self.client.get(url)
+            )
+            if response.status_code == 404:
+                logger.warning(
+                    f"Character {character_name} not found on poe.ninja "
+                    f"(HTTP 404 - account: {account_name})"
+                )
+                return None
+            # Any other error (429, 5xx, network) says nothing about the
+            # character, so it propagates instead of being cached as a miss
             response.raise_for_status()
 
             # Parse the HTML to extract character data
             character_data = await self._parse_poe_ninja_page(response.text, account_name, character_name)
 
             if character_data:
-                # Cache the result
-                if self.cache_manager:
-                    await self.cache_manager.set(
-                        cache_key,
-                        character_data,
-                        ttl=settings.CACHE_TTL
-                    )
-
                 logger.info(f"Successfully fetched character {character_name} from poe.ninja")
                 return character_data
-            else:
-                self.last_error_message = (
-                    f"Could not parse character data from poe.ninja for {character_name} "
-                    f"(account: {account_name})"
-                )
-                logger.warning(self.last_error_message)
-                return None
-
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                self.last_error_message = (
-                    f"Character {character_name} not found on poe.ninja "
-                    f"(HTTP 404 - account: {account_name})"
-                )
-                logger.warning(self.last_error_message)
-            else:
-                self.last_error_message = (
-                    f"HTTP {e.response.status_code} error fetching character from poe.ninja: {e}"
-                )
-                logger.error(self.last_error_message)
+            logger.warning(
+                f"Could not parse character data from poe.ninja for {character_name} "
+                f"(account: {account_name})"
+            )
             return None
 
-        except Exception as e:
-            self.last_error_message = f"Unexpected error fetching character from poe.ninja: {e}"
-            logger.error(self.last_error_message)
-            return None
+        return await self._get_or_compute(
+            cache_key, load,
+            ttl=settings.CACHE_TTL + settings.CACHE_STALE_TTL,
+            soft_ttl=settings.CACHE_TTL,
+            tags=[f"account:{account_name}", self._league_tag(league)],
+            negative_ttl=settings.CACHE_NEGATIVE_TTL if use_negative_cache else None
+        )
 
     async def _parse_poe_ninja_page(
         self,
@@ -320,42 +835,49 @@ class CharacterFetcher:
         look for embedded JSON data or API calls
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # poe.ninja uses client-side rendering with Astro/React
-            # Look for embedded JSON data in script tags or meta tags
-            scripts = soup.find_all('script')
-
-            # Try to find JSON data embedded in the page
-            for script in scripts:
-                if script.string and 'character' in script.string.lower():
-                    # Look for JSON data patterns
-                    import json
-                    import re
-
-                    # Try to extract JSON objects
-                    json_pattern = r'\{[^{}]*"character"[^{}]*:.*?\}'
-                    matches = re.findall(json_pattern, script.string, re.DOTALL)
-
-                    for match in matches:
-                        try:
-                            data = json.loads(match)
-                            if 'character' in data or 'characterName' in data:
-                                logger.info("Found embedded character data in script tag")
-                                return self._normalize_character_data(data, account_name, character_name)
-                        except:
-                            continue
-
-            # If we can't find embedded data, we need to make additional API calls
-            # poe.ninja likely has an internal API we can use
-            logger.warning("Could not find embedded character data, will try API approach")
-            return await self._fetch_from_poe_ninja_api(account_name, character_name)
-
+            embedded = await run_parser(
+                self._find_embedded_character, html, account_name, character_name
+            )
         except Exception as e:
-            self.last_error_message = f"Error parsing poe.ninja page for {character_name}: {e}"
-            logger.error(self.last_error_message)
+            logger.error(f"Error parsing poe.ninja page for {character_name}: {e}")
+            return None
+        if embedded:
+            return embedded
+
+        # If we can't find embedded data, we need to make additional API calls
+        # poe.ninja likely has an internal API we can use
+        logger.warning("Could not find embedded character data, will try API approach")
+        return await self._fetch_from_poe_ninja_api(account_name, character_name)
+
+    def _find_embedded_character(
+        self,
+        html: str,
+        account_name: str,
+        character_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Character JSON embedded in the page's scripts, if any (runs off the event loop)"""
+        # Nothing to find without a "character" key; skip the DOM parse
+        if '"character"' not in html:
             return None
 
+        # poe.ninja uses client-side rendering with Astro/React
+        # Look for embedded JSON data in script tags
+        for script in make_soup(html).find_all('script'):
+            if script.string and 'character' in script.string.lower():
+                # Try to extract JSON objects
+                json_pattern = r'\{[^{}]*"character"[^{}]*:.*?\}'
+                matches = re.findall(json_pattern, script.string, re.DOTALL)
+
+                for match in matches:
+                    try:
+                        data = json.loads(match)
+                        if 'character' in data or 'characterName' in data:
+                            logger.info("Found embedded character data in script tag")
+                            return self._normalize_character_data(data, account_name, character_name)
+                    except:
+                        continue
+        return None
+
     async def _fetch_from_poe_ninja_api(
         self,
         account_name: str,
@@ -364,70 +886,71 @@ class CharacterFetcher:
         """
         Fetch character data from poe.ninja's internal API
         Based on actual API endpoints found in HAR file analysis
-        """
-        try:
-            # The events API returns Server-Sent Events (SSE) with model ID
-            # Format: data: {"version":4211492750}
-            events_url = f"{settings.POE_NINJA_PROFILE_URL}/poe2/api/events/character/{account_name}/{character_name}"
 
-            logger.info(f"Fetching character model ID from: {events_url}")
-            await self.rate_limiter.acquire()
-
-            # Stream the SSE response and extract the model ID
-            async with self.client.stream('GET', events_url) as response:
-                if response.status_code != 200:
-                    logger.warning(f"Events API returned status: {response.status_code}")
-                    return None
+        Raises:
+            httpx.HTTPError: A request failed with anything but a 404
+        """
+        # The events API returns Server-Sent Events (SSE) with model ID
+        # Format: data: {"version":4211492750}
+        events_url = f"{settings.POE_NINJA_PROFILE_URL}/poe2/api/events/character/{account_name}/{character_name}"
 
-                # Read the first SSE message
-                model_id = None
-                async for line in response.aiter_lines():
-                    if line.startswith('data:'):
-                        import json
-                        # Parse the SSE data line
-                        data_str = line[5:].strip()  # Remove "data:" prefix
-                        try:
-                            data = json.loads(data_str)
-                            model_id = data.get('version')
-                            logger.info(f"Got model ID: {model_id}")
-                            break  # We only need the first message
-                        except:
-                            continue
-
-                if not model_id:
-                    self.last_error_message = (
-                        f"Could not extract model ID from poe.ninja events stream for {character_name}"
-                    )
-                    logger.warning(self.last_error_message)
-                    return None
+        logger.info(f"Fetching character model ID from: {events_url}")
+        await self.rate_limiter.acquire()
 
-            # Now fetch the character model using the ID
-            model_url = f"{settings.POE_NINJA_PROFILE_URL}/poe2/api/profile/characters/{account_name}/{character_name}/model/{model_id}"
+        # Stream the SSE response and extract the model ID
+        async with self.client.stream('GET', events_url) as response:
+            if response.status_code == 404:
+                logger.warning(f"Events API returned status: {response.status_code}")
+                return None
+            response.raise_for_status()
 
-            logger.info(f"Fetching character model from: {model_url}")
-            await self.rate_limiter.acquire()
+            # Read the first SSE message
+            model_id = None
+            async for line in response.aiter_lines():
+                if line.startswith('data:'):
+                    # Parse the SSE data line
+                    data_str = line[5:].strip()  # Remove "data:" prefix
+                    try:
+                        data = json.loads(data_str)
+                        model_id = data.get('version')
+                        logger.info(f"Got model ID: {model_id}")
+                        break  # We only need the first message
+                    except:
+                        continue
 
-            model_response = await self.client.get(model_url)
-            if model_response.status_code == 200:
-                model_data = model_response.json()
-                logger.info("Successfully fetched character model data")
-                return self._normalize_character_data(model_data, account_name, character_name)
-            else:
-                self.last_error_message = (
-                    f"Model API returned HTTP {model_response.status_code} for {character_name}"
+            if not model_id:
+                logger.warning(
+                    f"Could not extract model ID from poe.ninja events stream for {character_name}"
                 )
-                logger.error(self.last_error_message)
                 return None
 
-        except Exception as e:
-            self.last_error_message = f"Error fetching from poe.ninja internal API for {character_name}: {e}"
-            logger.error(self.last_error_message, exc_info=True)
+        # Now fetch the character model using the ID
+        model_url = f"{settings.POE_NINJA_PROFILE_URL}/poe2/api/profile/characters/{account_name}/{character_name}/model/{model_id}"
+
+        logger.info(f"Fetching character model from: {model_url}")
+        await self.rate_limiter.acquire()
+
+        model_response = await self.circuit_breakers.get(self.SSE_CIRCUIT).request(
+            lambda: self.client.get(model_url)
+        )
+        if model_response.status_code == 404:
+            logger.warning(f"Model API returned HTTP 404 for {character_name}")
+            return None
+        model_response.raise_for_status()
+
+        try:
+            model_data = model_response.json()
+        except ValueError as e:
+            logger.error(f"Invalid character model from poe.ninja for {character_name}: {e}")
             return None
+        logger.info("Successfully fetched character model data")
+        return self._normalize_character_data(model_data, account_name, character_name)
 
     async def get_character_from_ladder(
         self,
         character_name: str,
-        league: str = "Standard"
+        league: str = "Standard",
+        use_negative_cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Fetch character data from official PoE ladder API (public, no auth required)
@@ -435,84 +958,158 @@ class CharacterFetcher:
         Args:
             character_name: Character name to search for
             league: League name (display name or API name)
+            use_negative_cache: Remember "not found" for CACHE_NEGATIVE_TTL seconds
 
         Returns:
-            Character data or None
+            Character data, or None if it isn't in the top LADDER_MAX_DEPTH
+
+        Raises:
+            httpx.HTTPError: The ladder could not be read; nothing is cached
         """
         # Normalize league name for official API
         api_league = self._normalize_league_name(league)
 
-        cache_key = f"ladder_char:{api_league}:{character_name}"
-
-        if self.cache_manager:
-            cached_data = await self.cache_manager.get(cache_key)
-            if cached_data:
-                return cached_data
-
-        try:
-            # The ladder API is public and doesn't require OAuth
-            # Format: /api/ladders/{league}?limit=200&offset=0
-            # Note: POE_OFFICIAL_API already includes /api
-            base_url = f"{settings.POE_OFFICIAL_API}/ladders/{api_league}"
+        cache_key = self._ladder_char_key(api_league, character_name)
+
+        async def load() -> Optional[Dict[str, Any]]:
+            snapshot_entry = None
+            if await self._ladder_snapshot_ready(api_league):
+                try:
+                    snapshot_entry = await self.ladder_snapshots.find(api_league, character_name)
+                except Exception as e:
+                    logger.warning(f"Ladder snapshot lookup failed, paging the ladder: {e}")
+                else:
+                    if snapshot_entry:
+                        logger.info(f"Found character {character_name} in ladder snapshot")
+                        return {
+                            'name': snapshot_entry['character'],
+                            'level': snapshot_entry['level'],
+                            'class': snapshot_entry['class'],
+                            'league': league,
+                            'account': snapshot_entry['account'],
+                            'experience': snapshot_entry['experience'],
+                            'rank': snapshot_entry['rank'],
+                        }
+                    logger.warning(
+                        f"Character {character_name} not found in top "
+                        f"{settings.LADDER_MAX_DEPTH} of {api_league} ladder"
+                    )
+                    return None
 
             # We need to search through ladder pages to find the character
             # This is not ideal but works for public characters
-            for offset in range(0, 1000, 200):  # Search first 1000 characters
-                await self.rate_limiter.acquire()
+            pages = self.crawl_ladder(api_league)
+            try:
+                async for entries in pages:
+                    # Search for the character in the ladder
+                    for entry in entries:
+                        char = entry.get('character', {})
+                        if char.get('name') == character_name:
+                            logger.info(f"Found character {character_name} in ladder")
+                            return self._ladder_char_data(entry, league)
+
+                logger.warning(
+                    f"Character {character_name} not found in top "
+                    f"{settings.LADDER_MAX_DEPTH} of {api_league} ladder"
+                )
+                return None
 
-                url = f"{base_url}?limit=200&offset={offset}"
-                response = await self.client.get(url)
-                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+                # No ladder for this league
+                logger.warning(f"Ladder API has no {api_league} ladder (HTTP 404)")
+                return None
+            finally:
+                # Stops the pages still in flight once the character is found
+                await pages.aclose()
+
+        return await self._get_or_compute(
+            cache_key, load,
+            ttl=settings.CACHE_TTL + settings.CACHE_STALE_TTL,
+            soft_ttl=settings.CACHE_TTL,
+            tags=[self._league_tag(api_league)],
+            negative_ttl=settings.CACHE_NEGATIVE_TTL if use_negative_cache else None
+        )
 
-                data = response.json()
+    async def _fetch_ladder_page(self, api_league: str, offset: int) -> List[Dict[str, Any]]:
+        """
+        Fetch one page (200 entries) of the official ladder
 
-                # Search for the character in the ladder
-                for entry in data.get('entries', []):
-                    char = entry.get('character', {})
-                    if char.get('name') == character_name:
-                        logger.info(f"Found character {character_name} in ladder")
+        The page is cached with its ETag / Last-Modified and revalidated on
+        the next fetch, so an unchanged page costs a 304 and no parsing.
+        The caller acquires the rate limiter.
 
-                        char_data = {
-                            'name': char.get('name'),
-                            'level': char.get('level'),
-                            'class': char.get('class'),
-                            'league': league,
-                            'account': entry.get('account', {}).get('name'),
-                            'experience': char.get('experience'),
-                            'rank': entry.get('rank'),
-                        }
+        Args:
+            api_league: League name as the official API expects it
+            offset: Rank offset of the page
 
-                        if self.cache_manager:
-                            await self.cache_manager.set(cache_key, char_data, ttl=settings.CACHE_TTL)
+        Returns:
+            Ladder entries on the page
+        """
+        # The ladder API is public and doesn't require OAuth
+        # Format: /api/ladders/{league}?limit=200&offset=0
+        # Note: POE_OFFICIAL_API already includes /api
+        url = f"{settings.POE_OFFICIAL_API}/ladders/{api_league}?limit=200&offset={offset}"
+
+        async def send(headers: Dict[str, str]) -> httpx.Response:
+            response = await self.circuit_breakers.get(self.LADDER_CIRCUIT).request(
+                lambda: self.client.get(url, headers=headers)
+            )
+            self.official_rate_limiter.update_from_headers(
+                response.headers, self.LADDER_POLICY
+            )
+            return response
 
-                        return char_data
+        return await self.conditional.fetch(
+            f"ladder:page:{api_league}:{offset}",
+            send,
+            lambda response: response.json().get('entries', []),
+            tags=[self._league_tag(api_league)]
+        )
 
-            self.last_error_message = (
-                f"Character {character_name} not found in top 1000 of {api_league} ladder"
-            )
-            logger.warning(self.last_error_message)
-            return None
+    @staticmethod
+    def _ladder_char_key(api_league: str, character_name: str) -> str:
+        return f"ladder:char:{api_league}:{character_name}"
 
-        except Exception as e:
-            self.last_error_message = f"Error fetching from ladder API ({api_league}): {e}"
-            logger.error(self.last_error_message)
-            return None
+    @staticmethod
+    def _ladder_char_data(entry: Dict[str, Any], league: str) -> Dict[str, Any]:
+        """Character data as returned by get_character_from_ladder()"""
+        char = entry.get('character', {})
+        return {
+            'name': char.get('name'),
+            'level': char.get('level'),
+            'class': char.get('class'),
+            'league': league,
+            'account': entry.get('account', {}).get('name'),
+            'experience': char.get('experience'),
+            'rank': entry.get('rank'),
+        }
 
     async def get_top_ladder_characters(
         self,
         league: str = "Standard",
         limit: int = 100,
         min_level: int = 1,
-        class_filter: Optional[str] = None
+        class_filter: Optional[str] = None,
+        min_rank: Optional[int] = None,
+        max_rank: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Get top characters from the ladder
 
+        With a ladder snapshot store the query is answered from the local
+        snapshot (refreshed in the background every LADDER_SNAPSHOT_TTL
+        seconds), so different filters don't re-download the same ladder
+        pages. Until the first snapshot is written the ladder is paged.
+
         Args:
             league: League name (display name or API name)
             limit: Number of characters to return
             min_level: Minimum level filter
             class_filter: Filter by character class (e.g., "Stormweaver")
+            min_rank: Best ladder rank to include
+            max_rank: Worst ladder rank to include
 
         Returns:
             List of character info dicts with account, character, level, class
@@ -520,38 +1117,121 @@ class CharacterFetcher:
         # Normalize league name for official API
         api_league = self._normalize_league_name(league)
 
-        cache_key = f"top_ladder:{api_league}:{limit}:{min_level}:{class_filter}"
+        top_characters = await self._query_ladder_snapshot(
+            api_league, limit, min_level, class_filter, min_rank, max_rank
+        )
+        if top_characters is not None:
+            return top_characters
 
-        if self.cache_manager:
-            cached = await self.cache_manager.get(cache_key)
-            if cached:
-                return cached
+        cache_key = (
+            f"ladder:top:{api_league}:{limit}:{min_level}:{class_filter}:{min_rank}:{max_rank}"
+        )
 
-        try:
-            base_url = f"{settings.POE_OFFICIAL_API}/ladders/{api_league}"
-            top_characters = []
+        async def load() -> List[Dict[str, Any]]:
+            try:
+                top_characters = []
+                # The snapshot was checked above; page the ladder itself
+                async for page in self._page_top_ladder(
+                    api_league, league, limit, min_level, class_filter, min_rank, max_rank
+                ):
+                    top_characters.extend(page)
 
-            # Fetch ladder pages until we have enough characters
-            offset = 0
-            while len(top_characters) < limit and offset < 1000:
-                await self.rate_limiter.acquire()
+                logger.info(f"Found {len(top_characters)} characters from ladder")
+                return top_characters
 
-                url = f"{base_url}?limit=200&offset={offset}"
-                logger.info(f"Fetching ladder page: offset={offset}")
+            except Exception as e:
+                logger.error(f"Error fetching top ladder characters: {e}")
+                return []
+
+        # Cache for 30 minutes
+        return await self._get_or_compute(
+            cache_key, load,
+            ttl=1800 + settings.CACHE_STALE_TTL,
+            soft_ttl=1800,
+            tags=[self._league_tag(api_league)]
+        )
 
-                response = await self.client.get(url)
-                response.raise_for_status()
+    async def iter_top_ladder_pages(
+        self,
+        league: str = "Standard",
+        limit: int = 100,
+        min_level: int = 1,
+        class_filter: Optional[str] = None,
+        min_rank: Optional[int] = None,
+        max_rank: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream the top of the ladder one page at a time
+
+        Each page is fetched only when the previous one has been consumed,
+        so a caller that stops early saves the remaining requests. Every
+        entry on a fetched page is also cached for get_character_from_ladder().
+        With a ladder snapshot store the pages come from the snapshot.
+
+        Args:
+            league: League name (display name or API name)
+            limit: Number of characters to yield in total
+            min_level: Minimum level filter
+            class_filter: Filter by character class (e.g., "Stormweaver")
+            min_rank: Best ladder rank to include
+            max_rank: Worst ladder rank to include
+
+        Yields:
+            Character info dicts of one page that pass the filters, as
+            returned by get_top_ladder_characters()
+
+        Raises:
+            httpx.HTTPError: A ladder page could not be fetched
+        """
+        api_league = self._normalize_league_name(league)
+
+        snapshot = await self._query_ladder_snapshot(
+            api_league, limit, min_level, class_filter, min_rank, max_rank
+        )
+        if snapshot is not None:
+            for start in range(0, len(snapshot), 200):
+                yield snapshot[start:start + 200]
+            return
 
-                data = response.json()
-                entries = data.get('entries', [])
+        async for page in self._page_top_ladder(
+            api_league, league, limit, min_level, class_filter, min_rank, max_rank
+        ):
+            yield page
 
-                if not entries:
-                    break  # No more entries
+    async def _page_top_ladder(
+        self,
+        api_league: str,
+        league: str,
+        limit: int,
+        min_level: int,
+        class_filter: Optional[str],
+        min_rank: Optional[int],
+        max_rank: Optional[int]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """iter_top_ladder_pages() straight from the ladder API"""
+        found = 0
+        depth = settings.LADDER_MAX_DEPTH
+        if max_rank is not None:
+            depth = min(depth, max_rank)
+
+        # Pages are fetched a few at a time and consumed in rank order until
+        # we have enough characters; closing the crawl cancels the rest
+        pages = self.crawl_ladder(api_league, max_depth=depth, start_rank=min_rank or 1)
+        try:
+            async for entries in pages:
+                page = []
+                # Every entry on the page, for get_character_from_ladder()
+                ladder_chars: Dict[str, Dict[str, Any]] = {}
 
                 for entry in entries:
                     char = entry.get('character', {})
                     account = entry.get('account', {})
 
+                    if char.get('name'):
+                        ladder_chars[self._ladder_char_key(api_league, char['name'])] = (
+                            self._ladder_char_data(entry, league)
+                        )
+
                     char_level = char.get('level', 0)
                     char_class = char.get('class', '')
 
@@ -562,7 +1242,13 @@ class CharacterFetcher:
                     if class_filter and char_class != class_filter:
                         continue
 
-                    top_characters.append({
+                    rank = entry.get('rank', 0)
+                    if (min_rank is not None and rank < min_rank) or (
+                        max_rank is not None and rank > max_rank
+                    ):
+                        continue
+
+                    page.append({
                         'account': account.get('name', ''),
                         'character': char.get('name', ''),
                         'level': char_level,
@@ -572,22 +1258,216 @@ class CharacterFetcher:
                         'online': entry.get('online', False),
                     })
 
-                    if len(top_characters) >= limit:
+                    if found + len(page) >= limit:
                         break
 
-                offset += 200
+                if self.cache_manager and ladder_chars:
+                    await self.cache_manager.set_many(
+                        ladder_chars,
+                        ttl=settings.CACHE_TTL + settings.CACHE_STALE_TTL,
+                        soft_ttl=settings.CACHE_TTL,
+                        tags=[self._league_tag(api_league)]
+                    )
 
-            logger.info(f"Found {len(top_characters)} characters from ladder")
+                found += len(page)
+                if page:
+                    yield page
 
-            # Cache for 30 minutes
-            if self.cache_manager and top_characters:
-                await self.cache_manager.set(cache_key, top_characters, ttl=1800)
+                if found >= limit:
+                    break
+        finally:
+            await pages.aclose()
 
-            return top_characters
+    async def crawl_ladder(
+        self,
+        league: str,
+        max_depth: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        start_rank: int = 1
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Fetch ladder pages concurrently and stream them in rank order
+
+        After the first page, up to `concurrency` pages are in flight at
+        once, each taking its slot from the official API's rate limiter, so
+        the crawl runs as fast as the host's budget allows. Pages are
+        yielded in order as soon as they and all earlier pages have arrived.
+        The crawl ends at the first short page (end of the ladder), at
+        max_depth, or when the API refuses an offset past its limit; closing
+        the iterator cancels the pages still in flight.
+
+        Args:
+            league: League name as the official API expects it
+            max_depth: Deepest rank to fetch, rounded up to whole pages of
+                200 (default LADDER_MAX_DEPTH)
+            concurrency: Pages in flight at once (default LADDER_CRAWL_CONCURRENCY)
+            start_rank: First rank of interest; earlier pages are skipped
+
+        Yields:
+            Raw ladder API entries, one page at a time
+
+        Raises:
+            httpx.HTTPError: The first page could not be fetched, or a later
+                one failed with something other than a refused offset
+        """
+        max_depth = max_depth or settings.LADDER_MAX_DEPTH
+        window = concurrency or settings.LADDER_CRAWL_CONCURRENCY
+        first_offset = (max(start_rank, 1) - 1) // 200 * 200
+        offsets = iter(range(first_offset, max_depth, 200))
+        in_flight: Deque[Tuple[int, "asyncio.Task[List[Dict[str, Any]]]"]] = deque()
+
+        async def fetch(offset: int) -> List[Dict[str, Any]]:
+            await self.official_rate_limiter.acquire(self.LADDER_POLICY)
+            logger.info(f"Fetching ladder page: offset={offset}")
+            return await self._fetch_ladder_page(league, offset)
+
+        def top_up(size: int):
+            while len(in_flight) < size:
+                offset = next(offsets, None)
+                if offset is None:
+                    return
+                in_flight.append((offset, asyncio.ensure_future(fetch(offset))))
+
+        try:
+            # The first page alone: an unknown league or a short ladder
+            # shouldn't cost a window of requests
+            top_up(1)
+            while in_flight:
+                offset, task = in_flight.popleft()
+                try:
+                    entries = await task
+                except httpx.HTTPStatusError as e:
+                    status = e.response.status_code
+                    if offset == first_offset or status == 429 or status >= 500:
+                        raise
+                    # Past the deepest offset the API serves
+                    logger.info(f"Ladder ends at offset {offset} for {league} (HTTP {status})")
+                    return
+                if len(entries) < 200:
+                    # End of the ladder
+                    if entries:
+                        yield entries
+                    return
+                # Keep the window full while the caller handles this page
+                top_up(window)
+                yield entries
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*(task for _, task in in_flight), return_exceptions=True)
+
+    async def refresh_ladder_snapshot(
+        self,
+        league: str = "Standard",
+        force: bool = False
+    ) -> Optional[Dict[str, int]]:
+        """
+        Bring a league's ladder snapshot up to date
+
+        A full re-crawl of the top LADDER_MAX_DEPTH with crawl_ladder();
+        every page is requested again, but unchanged ones come back as a
+        304 without parsing. The write is diffed against the stored
+        snapshot: only entries whose rank, level or experience changed are
+        written, plus new and dropped-out characters.
+
+        Args:
+            league: League name (display name or API name)
+            force: Refresh even if the snapshot is younger than LADDER_SNAPSHOT_TTL
+
+        Returns:
+            Added/updated/removed/unchanged counts, or None if the snapshot
+            was still fresh or there is no snapshot store
+
+        Raises:
+            httpx.HTTPError: A ladder page could not be fetched; the previous
+                snapshot is kept
+        """
+        if not self.ladder_snapshots:
+            return None
+        api_league = self._normalize_league_name(league)
+
+        lock = self._snapshot_locks.setdefault(api_league, asyncio.Lock())
+        async with lock:
+            age = await self.ladder_snapshots.age(api_league)
+            if not force and age is not None and age < settings.LADDER_SNAPSHOT_TTL:
+                return None
 
+            entries = []
+            async for page in self.crawl_ladder(api_league):
+                entries.extend(self._snapshot_entry(entry) for entry in page)
+
+            return await self.ladder_snapshots.apply(api_league, entries)
+
+    async def _ladder_snapshot_ready(self, api_league: str) -> bool:
+        """
+        True if the league has a snapshot that can be queried
+
+        A missing or expired snapshot is refreshed in the background; until
+        that finishes callers get the stale snapshot, or page the ladder
+        themselves if there is none yet.
+        """
+        if not self.ladder_snapshots:
+            return False
+        try:
+            age = await self.ladder_snapshots.age(api_league)
+        except Exception as e:
+            logger.warning(f"Ladder snapshot unavailable, paging the ladder: {e}")
+            return False
+        if age is None or age >= settings.LADDER_SNAPSHOT_TTL:
+            task = self._snapshot_refreshes.get(api_league)
+            if task is None or task.done():
+                self._snapshot_refreshes[api_league] = asyncio.create_task(
+                    self._refresh_snapshot_in_background(api_league)
+                )
+        return age is not None
+
+    async def _refresh_snapshot_in_background(self, api_league: str):
+        try:
+            # Nobody waits on the crawl: its requests go last
+            with request_priority("background"):
+                await self.refresh_ladder_snapshot(api_league)
         except Exception as e:
-            logger.error(f"Error fetching top ladder characters: {e}")
-            return []
+            logger.warning(f"Ladder snapshot refresh failed for {api_league}: {e}")
+
+    async def _query_ladder_snapshot(
+        self,
+        api_league: str,
+        limit: int,
+        min_level: int,
+        class_filter: Optional[str],
+        min_rank: Optional[int],
+        max_rank: Optional[int]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Top ladder entries from the snapshot, None if it can't answer"""
+        if not await self._ladder_snapshot_ready(api_league):
+            return None
+        try:
+            entries = await self.ladder_snapshots.query(
+                api_league, limit=limit, min_level=min_level, class_filter=class_filter,
+                min_rank=min_rank, max_rank=max_rank
+            )
+        except Exception as e:
+            logger.warning(f"Ladder snapshot query failed, paging the ladder: {e}")
+            return None
+        for entry in entries:
+            del entry['experience']
+        return entries
+
+    @staticmethod
+    def _snapshot_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Ladder API entry as a LadderSnapshotStore entry"""
+        char = entry.get('character', {})
+        return {
+            'character': char.get('name'),
+            'account': entry.get('account', {}).get('name', ''),
+            'level': char.get('level', 0),
+            'class': char.get('class', ''),
+            'rank': entry.get('rank', 0),
+            'experience': char.get('experience'),
+            'dead': entry.get('dead', False),
+            'online': entry.get('online', False),
+        }
 
     def _normalize_character_data(
         self,
@@ -617,9 +1497,16 @@ class CharacterFetcher:
         }
 
     async def close(self):
-        """Close the HTTP client and ninja API client"""
-        await self.client.aclose()
+        """Stop background snapshot refreshes and close owned HTTP clients"""
+        refreshes = list(self._snapshot_refreshes.values())
+        self._snapshot_refreshes.clear()
+        for task in refreshes:
+            task.cancel()
+        if refreshes:
+            await asyncio.gather(*refreshes, return_exceptions=True)
         await self.ninja_api.close()
+        if self._owns_http_clients:
+            await self.http_clients.close()
 
     async def __aenter__(self):
         return self
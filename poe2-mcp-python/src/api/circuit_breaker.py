@@ -0,0 +1,263 @@
+"""
+Circuit Breakers
+Per-source failure tracking so dead or changed upstreams are skipped quickly
+"""
+
+import statistics
+import time
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import httpx
+
+try:
+    from ..config import settings
+except ImportError:
+    from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Sources whose p50 latency lands in the same bucket keep their priority order
+LATENCY_BUCKET_SECONDS = 2.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose breaker is open"""
+
+    def __init__(self, name: str, retry_in: float) -> None:
+        super().__init__(f"Circuit for {name} is open (next probe in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream data source
+
+    Closed: calls go through. After failure_threshold consecutive failures
+    (errors, HTTP 429/5xx, or calls slower than slow_call_seconds) the
+    breaker opens and calls fail fast with CircuitOpenError. Once
+    recovery_timeout has passed, one probe call is let through (half-open):
+    success closes the breaker, failure opens it for another interval.
+
+    The last `window` outcomes give the source's success rate and p50
+    latency, which callers use to rank fallback sources.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        slow_call_seconds: float = 10.0,
+        window: int = 50
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.slow_call_seconds = slow_call_seconds
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_started = 0.0
+        self.last_error = ""
+
+        # (succeeded, seconds) of recent calls
+        self._outcomes: Deque[Tuple[bool, float]] = deque(maxlen=window)
+        self.total_calls = 0
+        self.total_failures = 0
+        self.rejected_calls = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Open and not yet due for a probe (does not change state)"""
+        return (
+            self.state == OPEN
+            and time.monotonic() - self.opened_at < self.recovery_timeout
+        )
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; may start a half-open probe"""
+        now = time.monotonic()
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if now - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = HALF_OPEN
+            self._probe_started = now
+            logger.info(f"Circuit {self.name} half-open, probing")
+            return True
+        # Half-open: one probe at a time; a probe that never reported back
+        # (cancelled) is replaced after another interval
+        if now - self._probe_started >= self.recovery_timeout:
+            self._probe_started = now
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe may run"""
+        if self.state == CLOSED:
+            return 0.0
+        started = self.opened_at if self.state == OPEN else self._probe_started
+        return max(0.0, started + self.recovery_timeout - time.monotonic())
+
+    def record_success(self, seconds: float = 0.0):
+        """Record a completed call; a slow one counts as a failure"""
+        if seconds > self.slow_call_seconds:
+            self.record_failure(seconds, f"slow response ({seconds:.1f}s)")
+            return
+        self.total_calls += 1
+        self._outcomes.append((True, seconds))
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+            self.state = CLOSED
+
+    def record_failure(self, seconds: float = 0.0, reason: str = ""):
+        """Record a failed call"""
+        self.total_calls += 1
+        self.total_failures += 1
+        self._outcomes.append((False, seconds))
+        self.consecutive_failures += 1
+        self.last_error = reason
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            logger.warning(
+                f"Circuit {self.name} opened after {self.consecutive_failures} "
+                f"consecutive failures ({reason or 'error'})"
+            )
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    async def request(
+        self, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Send a request through the breaker
+
+        Args:
+            send: Performs the request, e.g. lambda: client.get(url)
+
+        Returns:
+            The response (HTTP 429/5xx are recorded as failures but returned)
+
+        Raises:
+            CircuitOpenError: The breaker is open; nothing was sent
+        """
+        if not self.allow():
+            self.rejected_calls += 1
+            raise CircuitOpenError(self.name, self.retry_in())
+        started = time.monotonic()
+        try:
+            response = await send()
+        except Exception as e:
+            self.record_failure(time.monotonic() - started, f"{type(e).__name__}: {e}")
+            raise
+        seconds = time.monotonic() - started
+        if response.status_code == 429 or response.status_code >= 500:
+            self.record_failure(seconds, f"HTTP {response.status_code}")
+        else:
+            self.record_success(seconds)
+        return response
+
+    @property
+    def success_rate(self) -> float:
+        """Share of recent calls that succeeded (1.0 before any call)"""
+        if not self._outcomes:
+            return 1.0
+        return sum(ok for ok, _ in self._outcomes) / len(self._outcomes)
+
+    @property
+    def p50_latency(self) -> float:
+        """Median seconds of recent successful calls"""
+        latencies = [seconds for ok, seconds in self._outcomes if ok]
+        return statistics.median(latencies) if latencies else 0.0
+
+    def rank_key(self) -> Tuple[int, float, int]:
+        """
+        Sort key for fallback order, healthiest first
+
+        Open breakers go last; then higher success rate (in 10% steps) and
+        lower p50 latency (in LATENCY_BUCKET_SECONDS steps). Sorting is
+        stable, so ties keep the caller's priority order.
+        """
+        return (
+            1 if self.is_open else 0,
+            -round(self.success_rate, 1),
+            int(self.p50_latency // LATENCY_BUCKET_SECONDS),
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "state": HALF_OPEN if self.state == OPEN and not self.is_open else self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "success_rate": round(self.success_rate, 3),
+            "p50_ms": round(self.p50_latency * 1000, 1),
+            "total_calls": self.total_calls,
+            "total_failures": self.total_failures,
+            "rejected_calls": self.rejected_calls,
+            "retry_in": round(self.retry_in(), 1),
+            "last_error": self.last_error,
+        }
+
+    def reset(self):
+        """Close the breaker and forget its history"""
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.last_error = ""
+        self._outcomes.clear()
+
+
+class CircuitBreakerRegistry:
+    """
+    One circuit breaker per upstream source, created on first use
+
+    Source names used by the API clients: poe_ninja_api, poe_ninja_sse,
+    ladder, trade and scrape:<host>. Share one registry between clients
+    (the server does) so every caller sees the same source health.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+        slow_call_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Args:
+            failure_threshold: Consecutive failures that open a breaker
+                (CIRCUIT_FAILURE_THRESHOLD)
+            recovery_timeout: Seconds before an open breaker is probed
+                (CIRCUIT_RECOVERY_TIMEOUT)
+            slow_call_seconds: Calls slower than this count as failures
+                (CIRCUIT_SLOW_CALL_SECONDS)
+        """
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or settings.CIRCUIT_RECOVERY_TIMEOUT
+        self.slow_call_seconds = slow_call_seconds or settings.CIRCUIT_SLOW_CALL_SECONDS
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Get or create the breaker for a source"""
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=self.failure_threshold,
+                recovery_timeout=self.recovery_timeout,
+                slow_call_seconds=self.slow_call_seconds
+            )
+        return breaker
+
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics for every breaker"""
+        return {name: breaker.get_statistics() for name, breaker in self.breakers.items()}
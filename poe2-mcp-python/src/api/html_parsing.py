@@ -0,0 +1,108 @@
+"""
+HTML Parsing
+Page parsing off the event loop, with a fast path for embedded JSON
+"""
+
+import asyncio
+import functools
+import importlib.util
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Pattern, TypeVar, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    from ..config import settings
+except ImportError:
+    from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def lxml_available() -> bool:
+    """The lxml backend needs the optional lxml package (pip install lxml)"""
+    return importlib.util.find_spec("lxml") is not None
+
+
+# BeautifulSoup tree builder: lxml's C parser when installed, else the stdlib one
+HTML_PARSER = "lxml" if lxml_available() else "html.parser"
+
+_json_decoder = json.JSONDecoder()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    """Parse a page with the fastest available backend"""
+    return BeautifulSoup(html, HTML_PARSER)
+
+
+def extract_embedded_json(html: str, marker: Union[str, Pattern[str]]) -> Optional[Any]:
+    """
+    Decode a JSON value assigned in a page's inline script, without a DOM
+
+    Scans the raw page for the assignment (e.g. ``window.__NUXT__=``) and
+    decodes the JSON value that follows it, stopping at the end of that
+    value, so a multi-megabyte page costs one substring search plus the
+    JSON decode instead of a full HTML parse.
+
+    Args:
+        html: Page source
+        marker: Regex matching the assignment up to the value
+
+    Returns:
+        The first value after a marker that decodes as JSON, None if none does
+    """
+    pattern = re.compile(marker) if isinstance(marker, str) else marker
+    for match in pattern.finditer(html):
+        start = match.end()
+        while start < len(html) and html[start].isspace():
+            start += 1
+        try:
+            value, _ = _json_decoder.raw_decode(html, start)
+        except ValueError:
+            # Not JSON (e.g. a NUXT IIFE); try the next occurrence
+            continue
+        return value
+    return None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.HTML_PARSE_WORKERS),
+            thread_name_prefix="html-parse"
+        )
+    return _executor
+
+
+async def run_parser(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a CPU-heavy parse on the shared parse pool
+
+    The pool has HTML_PARSE_WORKERS threads; further parses queue for a
+    free worker instead of blocking the event loop while they run.
+
+    Args:
+        func: Synchronous parse function
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns (its exceptions propagate)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_parse_pool():
+    """Stop the parse pool's threads; the next parse starts a new pool"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
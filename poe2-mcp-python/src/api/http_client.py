@@ -0,0 +1,251 @@
+"""
+HTTP Client Factory
+Shared, connection-pooled httpx clients for the API clients and scrapers
+"""
+
+import asyncio
+import importlib.util
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+import httpx
+
+try:
+    from ..config import settings
+except ImportError:
+    from src.config import settings
+from .cache_manager import CacheManager
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install h2)"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientFactory:
+    """
+    Hands out one pooled httpx.AsyncClient per client profile
+
+    A profile is a name plus the default headers/redirect behavior its
+    callers need (e.g. "poe_ninja", "trade"); every caller asking for the
+    same name with the same options gets the same client (asking with
+    different options is an error), and each client keeps one keep-alive
+    pool per host. Connections to poe.ninja and pathofexile.com are
+    therefore reused across API clients instead of each instance paying
+    its own TLS handshakes, and HTTP/2 multiplexes concurrent requests
+    over a single connection per host when h2 is installed.
+
+    Whoever creates the factory owns the clients and closes them all with
+    close(); the server does this in cleanup().
+    """
+
+    def __init__(
+        self,
+        http2: Optional[bool] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """
+        Args:
+            http2: Negotiate HTTP/2 (default HTTP2_ENABLED; ignored without h2)
+            max_connections: Open connections per client (HTTP_MAX_CONNECTIONS)
+            max_keepalive_connections: Idle connections kept per client
+                (HTTP_MAX_KEEPALIVE_CONNECTIONS)
+            keepalive_expiry: Seconds an idle connection is kept (HTTP_KEEPALIVE_EXPIRY)
+            timeout: Default request timeout in seconds (REQUEST_TIMEOUT)
+        """
+        http2 = settings.HTTP2_ENABLED if http2 is None else http2
+        if http2 and not http2_available():
+            logger.info("h2 not installed, HTTP clients use HTTP/1.1 (pip install h2)")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=(
+                max_keepalive_connections or settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=(
+                settings.HTTP_KEEPALIVE_EXPIRY if keepalive_expiry is None else keepalive_expiry
+            )
+        )
+        self.timeout = timeout or settings.REQUEST_TIMEOUT
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        # Profile name -> (headers, timeout, follow_redirects) it was created with
+        self._options: Dict[str, Tuple[Dict[str, str], float, bool]] = {}
+
+    def get_client(
+        self,
+        name: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+        follow_redirects: Optional[bool] = None
+    ) -> httpx.AsyncClient:
+        """
+        Get or create the pooled client for a profile
+
+        Args:
+            name: Profile name; callers sharing a name share the client
+            headers: Default headers (none by default)
+            timeout: Request timeout in seconds (defaults to the factory's)
+            follow_redirects: Follow redirects by default (off by default)
+
+        Options left as None accept whatever the existing client uses.
+
+        Returns:
+            Shared httpx.AsyncClient; don't close it, close the factory
+
+        Raises:
+            ValueError: The profile already exists with different options
+        """
+        requested = (
+            None if headers is None else {key.lower(): value for key, value in headers.items()},
+            timeout,
+            follow_redirects
+        )
+        existing = self._options.get(name)
+        if existing is not None:
+            conflicts = [
+                option
+                for option, asked, current in zip(
+                    ("headers", "timeout", "follow_redirects"), requested, existing
+                )
+                if asked is not None and asked != current
+            ]
+            if conflicts:
+                raise ValueError(
+                    f"HTTP client profile '{name}' already exists with different "
+                    f"{', '.join(conflicts)}; use another profile name"
+                )
+        options = existing or (
+            requested[0] or {},
+            timeout or self.timeout,
+            bool(follow_redirects)
+        )
+
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=options[1],
+                headers=options[0],
+                follow_redirects=options[2]
+            )
+            self._clients[name] = client
+            self._options[name] = options
+        return client
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Open clients and pool settings"""
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "clients": sorted(
+                name for name, client in self._clients.items() if not client.is_closed
+            ),
+        }
+
+    async def close(self):
+        """Close every client and its connections"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._options.clear()
+        results = await asyncio.gather(
+            *(client.aclose() for client in clients), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug(f"Error closing HTTP client: {result}")
+
+
+class ConditionalFetcher:
+    """
+    Revalidates cached upstream pages with conditional requests
+
+    The parsed body of a page is cached together with the ETag and
+    Last-Modified validators the server sent. The next fetch of the page
+    sends If-None-Match / If-Modified-Since; a 304 Not Modified returns
+    the cached parse and extends its TTL, so an unchanged ladder page or
+    price overview is neither downloaded nor parsed again. Pages without
+    validators are fetched in full every time.
+    """
+
+    def __init__(self, cache_manager: Optional[CacheManager], ttl: Optional[int] = None) -> None:
+        """
+        Args:
+            cache_manager: Where pages and validators are kept; without one
+                every fetch is unconditional
+            ttl: Seconds a page is kept for revalidation (HTTP_REVALIDATE_TTL)
+        """
+        self.cache_manager = cache_manager
+        self.ttl = ttl or settings.HTTP_REVALIDATE_TTL
+        self.not_modified = 0
+        self.modified = 0
+
+    async def fetch(
+        self,
+        cache_key: str,
+        send: Callable[[Dict[str, str]], Awaitable[httpx.Response]],
+        parse: Callable[[httpx.Response], Any],
+        tags: Optional[Iterable[str]] = None
+    ) -> Any:
+        """
+        Fetch a page, revalidating the cached copy if there is one
+
+        Args:
+            cache_key: Cache key for the page, "<namespace>:<rest>"
+            send: Sends the request with the given extra (conditional)
+                headers and returns the response
+            parse: Turns a successful response into the value to cache
+                (may be a coroutine function)
+            tags: Cache tags for the page entry
+
+        Returns:
+            Parsed page
+
+        Raises:
+            httpx.HTTPStatusError: The server answered with an error status
+        """
+        stored = await self.cache_manager.get(cache_key) if self.cache_manager else None
+        headers: Dict[str, str] = {}
+        if stored:
+            if stored.get("etag"):
+                headers["If-None-Match"] = stored["etag"]
+            if stored.get("last_modified"):
+                headers["If-Modified-Since"] = stored["last_modified"]
+
+        response = await send(headers)
+
+        if response.status_code == 304 and stored:
+            self.not_modified += 1
+            logger.debug(f"Not modified: {cache_key}")
+            await self.cache_manager.set(cache_key, stored, ttl=self.ttl, tags=tags)
+            return stored["data"]
+
+        response.raise_for_status()
+        data = parse(response)
+        if inspect.isawaitable(data):
+            data = await data
+        self.modified += 1
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if self.cache_manager and (etag or last_modified):
+            await self.cache_manager.set(
+                cache_key,
+                {"etag": etag, "last_modified": last_modified, "data": data},
+                ttl=self.ttl,
+                tags=tags
+            )
+        return data
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Revalidations answered 304 vs. pages downloaded in full"""
+        return {"not_modified": self.not_modified, "modified": self.modified}
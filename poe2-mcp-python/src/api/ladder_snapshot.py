@@ -0,0 +1,260 @@
+"""
+Ladder Snapshot Store
+Local, indexed copy of the top of each league's official ladder
+"""
+
+import asyncio
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+
+# Columns of a snapshot entry, as stored and as returned by query()
+ENTRY_COLUMNS = ("character", "account", "level", "class", "rank", "experience", "dead", "online")
+
+# Columns that make a refreshed entry count as changed
+_TRACKED_COLUMNS = ("account", "level", "class", "rank", "experience", "dead", "online")
+
+
+class LadderSnapshotStore:
+    """
+    Top of each league's ladder in a SQLite file
+
+    CharacterFetcher refreshes a league's snapshot from the ladder API and
+    hands the entries to apply(), which diffs them against the stored rows
+    and writes only what changed: new characters, characters whose rank,
+    level or experience moved (the old rank is kept in previous_rank), and
+    characters that dropped out. Filtered lookups (class, level, rank
+    range, character name) are then answered from indexes instead of
+    re-downloading ladder pages for every filter combination.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Args:
+            path: SQLite database file (LADDER_SNAPSHOT_DB_PATH)
+        """
+        self.path = Path(path)
+        self._conn: Optional[aiosqlite.Connection] = None
+        # One statement sequence at a time on our connection
+        self._lock = asyncio.Lock()
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = await aiosqlite.connect(str(self.path))
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.executescript("""
+                CREATE TABLE IF NOT EXISTS ladder_entries (
+                    league TEXT NOT NULL,
+                    character TEXT NOT NULL,
+                    account TEXT,
+                    level INTEGER NOT NULL DEFAULT 0,
+                    class TEXT,
+                    rank INTEGER NOT NULL,
+                    previous_rank INTEGER,
+                    experience INTEGER,
+                    dead INTEGER NOT NULL DEFAULT 0,
+                    online INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL,
+                    PRIMARY KEY (league, character)
+                );
+                CREATE INDEX IF NOT EXISTS idx_ladder_rank ON ladder_entries (league, rank);
+                CREATE INDEX IF NOT EXISTS idx_ladder_class ON ladder_entries (league, class, rank);
+                CREATE INDEX IF NOT EXISTS idx_ladder_level ON ladder_entries (league, level);
+                CREATE TABLE IF NOT EXISTS ladder_snapshots (
+                    league TEXT PRIMARY KEY,
+                    refreshed_at REAL NOT NULL,
+                    entries INTEGER NOT NULL DEFAULT 0
+                );
+            """)
+            await conn.commit()
+            self._conn = conn
+        return self._conn
+
+    async def age(self, league: str) -> Optional[float]:
+        """Seconds since the league was last refreshed, None if never"""
+        async with self._lock:
+            conn = await self._connection()
+            async with conn.execute(
+                "SELECT refreshed_at FROM ladder_snapshots WHERE league = ?", (league,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return None if row is None else max(0.0, time.time() - row[0])
+
+    async def apply(self, league: str, entries: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Replace a league's snapshot, writing only the differences
+
+        Args:
+            league: League name as the ladder API expects it
+            entries: Fresh ladder entries (ENTRY_COLUMNS keys) covering the
+                whole tracked range; stored characters not among them are removed
+
+        Returns:
+            Counts of added, updated, removed and unchanged entries
+        """
+        now = time.time()
+        fresh = {entry["character"]: entry for entry in entries if entry.get("character")}
+        delta = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        async with self._lock:
+            conn = await self._connection()
+            async with conn.execute(
+                f"SELECT character, {', '.join(_TRACKED_COLUMNS)} "
+                f"FROM ladder_entries WHERE league = ?",
+                (league,)
+            ) as cursor:
+                stored = {row[0]: row[1:] for row in await cursor.fetchall()}
+
+            upserts = []
+            for name, entry in fresh.items():
+                values = tuple(_column_value(entry, column) for column in _TRACKED_COLUMNS)
+                old = stored.get(name)
+                if old is None:
+                    delta["added"] += 1
+                elif old != values:
+                    delta["updated"] += 1
+                else:
+                    delta["unchanged"] += 1
+                    continue
+                previous_rank = old[_TRACKED_COLUMNS.index("rank")] if old else None
+                upserts.append((league, name, *values, previous_rank, now))
+            removed = [(league, name) for name in stored if name not in fresh]
+            delta["removed"] = len(removed)
+
+            try:
+                if upserts:
+                    await conn.executemany(
+                        f"""
+                        INSERT INTO ladder_entries
+                            (league, character, {', '.join(_TRACKED_COLUMNS)}, previous_rank, updated_at)
+                        VALUES (?, ?, {', '.join('?' for _ in _TRACKED_COLUMNS)}, ?, ?)
+                        ON CONFLICT(league, character) DO UPDATE SET
+                            {', '.join(f'{c} = excluded.{c}' for c in _TRACKED_COLUMNS)},
+                            previous_rank = excluded.previous_rank,
+                            updated_at = excluded.updated_at
+                        """,
+                        upserts
+                    )
+                if removed:
+                    await conn.executemany(
+                        "DELETE FROM ladder_entries WHERE league = ? AND character = ?", removed
+                    )
+                await conn.execute(
+                    """
+                    INSERT INTO ladder_snapshots (league, refreshed_at, entries) VALUES (?, ?, ?)
+                    ON CONFLICT(league) DO UPDATE SET
+                        refreshed_at = excluded.refreshed_at, entries = excluded.entries
+                    """,
+                    (league, now, len(fresh))
+                )
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+
+        logger.info(
+            f"Ladder snapshot {league}: {delta['added']} added, {delta['updated']} updated, "
+            f"{delta['removed']} removed, {delta['unchanged']} unchanged"
+        )
+        return delta
+
+    async def query(
+        self,
+        league: str,
+        limit: int = 100,
+        min_level: int = 1,
+        class_filter: Optional[str] = None,
+        min_rank: Optional[int] = None,
+        max_rank: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Filtered top of a league's snapshot, best rank first
+
+        Args:
+            league: League name as the ladder API expects it
+            limit: Maximum entries to return
+            min_level: Minimum character level
+            class_filter: Exact character class (e.g., "Stormweaver")
+            min_rank: Best rank to include
+            max_rank: Worst rank to include
+
+        Returns:
+            Entry dicts with the ENTRY_COLUMNS keys
+        """
+        conditions = ["league = ?", "level >= ?"]
+        params: List[Any] = [league, min_level]
+        if class_filter:
+            conditions.append("class = ?")
+            params.append(class_filter)
+        if min_rank is not None:
+            conditions.append("rank >= ?")
+            params.append(min_rank)
+        if max_rank is not None:
+            conditions.append("rank <= ?")
+            params.append(max_rank)
+        params.append(limit)
+
+        async with self._lock:
+            conn = await self._connection()
+            async with conn.execute(
+                f"SELECT {', '.join(ENTRY_COLUMNS)} FROM ladder_entries "
+                f"WHERE {' AND '.join(conditions)} ORDER BY rank LIMIT ?",
+                params
+            ) as cursor:
+                rows = await cursor.fetchall()
+        return [_entry(row) for row in rows]
+
+    async def find(self, league: str, character: str) -> Optional[Dict[str, Any]]:
+        """A character's snapshot entry, None if it isn't in the snapshot"""
+        async with self._lock:
+            conn = await self._connection()
+            async with conn.execute(
+                f"SELECT {', '.join(ENTRY_COLUMNS)} FROM ladder_entries "
+                f"WHERE league = ? AND character = ?",
+                (league, character)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return _entry(row) if row else None
+
+    async def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Entry count and age of every league's snapshot"""
+        async with self._lock:
+            conn = await self._connection()
+            async with conn.execute(
+                "SELECT league, entries, refreshed_at FROM ladder_snapshots"
+            ) as cursor:
+                rows = await cursor.fetchall()
+        now = time.time()
+        return {
+            league: {"entries": entries, "age_seconds": round(max(0.0, now - refreshed_at))}
+            for league, entries, refreshed_at in rows
+        }
+
+    async def close(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+def _column_value(entry: Dict[str, Any], column: str) -> Any:
+    """Entry value as SQLite stores it, so stored and fresh rows compare equal"""
+    value = entry.get(column)
+    if column in ("dead", "online"):
+        return int(bool(value))
+    if column == "level":
+        return value or 0
+    return value
+
+
+def _entry(row: Any) -> Dict[str, Any]:
+    entry = dict(zip(ENTRY_COLUMNS, row))
+    entry["dead"] = bool(entry["dead"])
+    entry["online"] = bool(entry["online"])
+    return entry
@@ -4,7 +4,7 @@ Handles character data retrieval with OAuth 2.0 support
 """
 
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Awaitable, Callable
 from datetime import datetime
 import httpx
 
@@ -14,6 +14,7 @@ except ImportError:
     from src.config import settings
 from .rate_limiter import RateLimiter
 from .cache_manager import CacheManager
+from .http_client import HTTPClientFactory
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +25,15 @@ class PoEAPIClient:
     Implements OAuth 2.0, rate limiting, and caching
     """
 
+    # Rate limiter policy keys for the character and static data endpoints
+    RATE_LIMIT_POLICY = "character"
+    GAME_DATA_POLICY = "game-data"
+
     def __init__(
         self,
         cache_manager: Optional[CacheManager] = None,
-        rate_limiter: Optional[RateLimiter] = None
+        rate_limiter: Optional[RateLimiter] = None,
+        http_clients: Optional[HTTPClientFactory] = None
     ):
         self.base_url = settings.POE_OFFICIAL_API
         self.cache_manager = cache_manager
@@ -35,7 +41,11 @@ class PoEAPIClient:
             rate_limit=settings.POE_API_RATE_LIMIT
         )
 
-        self.client = httpx.AsyncClient(
+        # Shared pooled client; a private factory when none is passed
+        self._owns_http_clients = http_clients is None
+        self.http_clients = http_clients or HTTPClientFactory()
+        self.client = self.http_clients.get_client(
+            "poe_official",
             timeout=settings.REQUEST_TIMEOUT,
             headers={
                 "User-Agent": "PoE2-Build-Optimizer/1.0"
@@ -59,6 +69,21 @@ class PoEAPIClient:
         # TODO: Implement full OAuth 2.0 flow
         # For now, we'll use public API endpoints that don't require auth
 
+    async def _get_or_compute(
+        self,
+        cache_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None
+    ) -> Any:
+        """Run loader through the cache (single-flight), or directly without one"""
+        if self.cache_manager:
+            return await self.cache_manager.get_or_compute(
+                cache_key, loader, ttl=ttl, soft_ttl=soft_ttl, tags=tags
+            )
+        return await loader()
+
     async def get_character(
         self,
         account_name: str,
@@ -74,53 +99,47 @@ class PoEAPIClient:
         Returns:
             Character data dictionary or None if not found
         """
-        cache_key = f"character:{account_name}:{character_name}"
-
-        # Check cache first
-        if self.cache_manager:
-            cached_data = await self.cache_manager.get(cache_key)
-            if cached_data:
-                logger.info(f"Cache hit for character {character_name}")
-                return cached_data
-
-        # Apply rate limiting
-        await self.rate_limiter.acquire()
-
-        try:
-            await self._ensure_authenticated()
-
-            # Construct API URL
-            url = f"{self.base_url}/character/{account_name}/{character_name}"
-
-            # Make request
-            response = await self.client.get(url)
-            response.raise_for_status()
-
-            character_data = response.json()
-
-            # Cache the result
-            if self.cache_manager:
-                await self.cache_manager.set(
-                    cache_key,
-                    character_data,
-                    ttl=settings.CACHE_TTL
-                )
-
-            logger.info(f"Successfully fetched character {character_name}")
-            return character_data
-
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                logger.warning(f"Character {character_name} not found for account {account_name}")
-            elif e.response.status_code == 403:
-                logger.warning(f"Character {character_name} profile is private")
-            else:
-                logger.error(f"API error fetching character: {e}")
-            return None
-
-        except Exception as e:
-            logger.error(f"Error fetching character {character_name}: {e}")
-            return None
+        cache_key = f"character:official:{account_name}:{character_name}"
+
+        async def load() -> Optional[Dict[str, Any]]:
+            # Apply rate limiting
+            await self.rate_limiter.acquire(self.RATE_LIMIT_POLICY)
+
+            try:
+                await self._ensure_authenticated()
+
+                # Construct API URL
+                url = f"{self.base_url}/character/{account_name}/{character_name}"
+
+                # Make request
+                response = await self.client.get(url)
+                self.rate_limiter.update_from_headers(response.headers, self.RATE_LIMIT_POLICY)
+                response.raise_for_status()
+
+                character_data = response.json()
+
+                logger.info(f"Successfully fetched character {character_name}")
+                return character_data
+
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    logger.warning(f"Character {character_name} not found for account {account_name}")
+                elif e.response.status_code == 403:
+                    logger.warning(f"Character {character_name} profile is private")
+                else:
+                    logger.error(f"API error fetching character: {e}")
+                return None
+
+            except Exception as e:
+                logger.error(f"Error fetching character {character_name}: {e}")
+                return None
+
+        return await self._get_or_compute(
+            cache_key, load,
+            ttl=settings.CACHE_TTL + settings.CACHE_STALE_TTL,
+            soft_ttl=settings.CACHE_TTL,
+            tags=[f"account:{account_name}"]
+        )
 
     async def get_account_characters(
         self,
@@ -135,39 +154,29 @@ class PoEAPIClient:
         Returns:
             List of character dictionaries
         """
-        cache_key = f"account_characters:{account_name}"
-
-        # Check cache
-        if self.cache_manager:
-            cached_data = await self.cache_manager.get(cache_key)
-            if cached_data:
-                return cached_data
+        cache_key = f"character:account:{account_name}"
 
-        # Apply rate limiting
-        await self.rate_limiter.acquire()
+        async def load() -> List[Dict[str, Any]]:
+            # Apply rate limiting
+            await self.rate_limiter.acquire(self.RATE_LIMIT_POLICY)
 
-        try:
-            await self._ensure_authenticated()
+            try:
+                await self._ensure_authenticated()
 
-            url = f"{self.base_url}/account/{account_name}/characters"
-            response = await self.client.get(url)
-            response.raise_for_status()
+                url = f"{self.base_url}/account/{account_name}/characters"
+                response = await self.client.get(url)
+                self.rate_limiter.update_from_headers(response.headers, self.RATE_LIMIT_POLICY)
+                response.raise_for_status()
 
-            characters = response.json()
+                return response.json()
 
-            # Cache the result
-            if self.cache_manager:
-                await self.cache_manager.set(
-                    cache_key,
-                    characters,
-                    ttl=settings.CACHE_TTL
-                )
+            except Exception as e:
+                logger.error(f"Error fetching account characters: {e}")
+                return []
 
-            return characters
-
-        except Exception as e:
-            logger.error(f"Error fetching account characters: {e}")
-            return []
+        return await self._get_or_compute(
+            cache_key, load, ttl=settings.CACHE_TTL, tags=[f"account:{account_name}"]
+        )
 
     async def get_passive_tree(self) -> Dict[str, Any]:
         """
@@ -176,35 +185,25 @@ class PoEAPIClient:
         Returns:
             Passive tree data
         """
-        cache_key = "passive_tree_data"
-
-        # Check cache (passive tree data is static, cache for long time)
-        if self.cache_manager:
-            cached_data = await self.cache_manager.get(cache_key)
-            if cached_data:
-                return cached_data
+        cache_key = "game_data:passive_tree"
 
-        try:
-            # Passive tree endpoint
-            url = f"{self.base_url}/passive-tree"
-            response = await self.client.get(url)
-            response.raise_for_status()
+        async def load() -> Dict[str, Any]:
+            try:
+                # Passive tree endpoint
+                url = f"{self.base_url}/passive-tree"
+                await self.rate_limiter.acquire(self.GAME_DATA_POLICY)
+                response = await self.client.get(url)
+                self.rate_limiter.update_from_headers(response.headers, self.GAME_DATA_POLICY)
+                response.raise_for_status()
 
-            tree_data = response.json()
+                return response.json()
 
-            # Cache for 24 hours (passive tree rarely changes)
-            if self.cache_manager:
-                await self.cache_manager.set(
-                    cache_key,
-                    tree_data,
-                    ttl=86400
-                )
+            except Exception as e:
+                logger.error(f"Error fetching passive tree: {e}")
+                return {}
 
-            return tree_data
-
-        except Exception as e:
-            logger.error(f"Error fetching passive tree: {e}")
-            return {}
+        # Cache for 24 hours (passive tree rarely changes)
+        return await self._get_or_compute(cache_key, load, ttl=86400)
 
     async def get_items_data(self) -> Dict[str, Any]:
         """
@@ -213,37 +212,29 @@ class PoEAPIClient:
         Returns:
             Item data dictionary
         """
-        cache_key = "items_data"
-
-        if self.cache_manager:
-            cached_data = await self.cache_manager.get(cache_key)
-            if cached_data:
-                return cached_data
-
-        try:
-            url = f"{self.base_url}/items"
-            response = await self.client.get(url)
-            response.raise_for_status()
+        cache_key = "game_data:items"
 
-            items_data = response.json()
+        async def load() -> Dict[str, Any]:
+            try:
+                url = f"{self.base_url}/items"
+                await self.rate_limiter.acquire(self.GAME_DATA_POLICY)
+                response = await self.client.get(url)
+                self.rate_limiter.update_from_headers(response.headers, self.GAME_DATA_POLICY)
+                response.raise_for_status()
 
-            # Cache for 24 hours
-            if self.cache_manager:
-                await self.cache_manager.set(
-                    cache_key,
-                    items_data,
-                    ttl=86400
-                )
+                return response.json()
 
-            return items_data
+            except Exception as e:
+                logger.error(f"Error fetching items data: {e}")
+                return {}
 
-        except Exception as e:
-            logger.error(f"Error fetching items data: {e}")
-            return {}
+        # Cache for 24 hours
+        return await self._get_or_compute(cache_key, load, ttl=86400)
 
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """Close the HTTP client if this instance created its own factory"""
+        if self._owns_http_clients:
+            await self.http_clients.close()
 
     async def __aenter__(self):
         return self
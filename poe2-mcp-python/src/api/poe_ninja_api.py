@@ -4,21 +4,32 @@ Fetches character data, build rankings, and economy data from poe.ninja
 """
 
 import httpx
-import json
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from bs4 import BeautifulSoup
 from datetime import datetime
 
 try:
+    from ..config import settings
     from ..api.rate_limiter import RateLimiter
     from ..api.cache_manager import CacheManager
+    from ..api.http_client import ConditionalFetcher, HTTPClientFactory
+    from ..api.circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+    from ..api.html_parsing import extract_embedded_json, make_soup, run_parser
 except ImportError:
+    from src.config import settings
     from src.api.rate_limiter import RateLimiter
     from src.api.cache_manager import CacheManager
+    from src.api.http_client import ConditionalFetcher, HTTPClientFactory
+    from src.api.circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+    from src.api.html_parsing import extract_embedded_json, make_soup, run_parser
 
 logger = logging.getLogger(__name__)
 
+# Script assignments poe.ninja pages embed their data in
+NUXT_MARKER = r"__NUXT__\s*="
+DATA_MARKER = r"window\.__data\s*="
+
 
 class PoeNinjaAPI:
     """
@@ -47,16 +58,26 @@ class PoeNinjaAPI:
         "Act 4 Boss Kill Race 3 SSF": "act4bosskillrace3ssf",
     }
 
+    # Circuit breaker source for the hidden character API
+    CIRCUIT = "poe_ninja_api"
+
     def __init__(
         self,
         rate_limiter: Optional[RateLimiter] = None,
-        cache_manager: Optional[CacheManager] = None
+        cache_manager: Optional[CacheManager] = None,
+        http_clients: Optional[HTTPClientFactory] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None
     ):
         self.base_url = "https://poe.ninja"
         self.api_base = f"{self.base_url}/api/data"
         self.rate_limiter = rate_limiter or RateLimiter(rate_limit=20)
         self.cache_manager = cache_manager
-        self.client = httpx.AsyncClient(
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry()
+        # Shared pooled client; a private factory when none is passed
+        self._owns_http_clients = http_clients is None
+        self.http_clients = http_clients or HTTPClientFactory()
+        self.client = self.http_clients.get_client(
+            "poe_ninja",
             timeout=30.0,
             follow_redirects=True,
             headers={
@@ -64,6 +85,8 @@ class PoeNinjaAPI:
                 "Accept": "application/json, text/html",
             }
         )
+        # Build pages and price overviews are revalidated with ETag / If-Modified-Since
+        self.conditional = ConditionalFetcher(self.cache_manager)
 
     def _get_league_slug(self, league: str) -> str:
         """
@@ -87,7 +110,35 @@ class PoeNinjaAPI:
         # Default: convert to lowercase and replace spaces with hyphens
         return league.lower().replace(" ", "-")
 
-    async def get_character(self, account: str, character: str, league: str = "Abyss") -> Optional[Dict[str, Any]]:
+    async def _get_or_compute(
+        self,
+        cache_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        soft_ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        negative_ttl: Optional[int] = None
+    ) -> Any:
+        """Run loader through the cache (single-flight), or directly without one"""
+        if self.cache_manager:
+            return await self.cache_manager.get_or_compute(
+                cache_key, loader,
+                ttl=ttl, soft_ttl=soft_ttl, tags=tags, negative_ttl=negative_ttl
+            )
+        return await loader()
+
+    @staticmethod
+    def character_cache_key(account: str, character: str, league: str) -> str:
+        """Cache key get_character() stores a character under"""
+        return f"character:ninja:{account}:{character}:{league}"
+
+    async def get_character(
+        self,
+        account: str,
+        character: str,
+        league: str = "Abyss",
+        use_negative_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         Fetch character from poe.ninja using their hidden API
 
@@ -95,37 +146,41 @@ class PoeNinjaAPI:
             account: Path of Exile account name
             character: Character name
             league: League name (default: "Abyss")
+            use_negative_cache: Remember "not found" for CACHE_NEGATIVE_TTL
+                seconds and skip the request while it's remembered
 
         Returns:
             Character data dictionary or None if not found
-        """
-        cache_key = f"ninja_character_{account}_{character}_{league}"
 
-        # Check cache first
-        if self.cache_manager:
-            cached = await self.cache_manager.get(cache_key)
-            if cached:
-                logger.info(f"✅ Cache hit for character {character} ({league})")
-                return cached
+        Raises:
+            httpx.HTTPError: Neither the API nor the profile page could be
+                read; nothing is cached
+        """
+        cache_key = self.character_cache_key(account, character, league)
 
-        try:
+        async def load() -> Optional[Dict[str, Any]]:
             # Rate limit
             await self.rate_limiter.acquire()
 
             logger.info(f"🔍 Fetching character: {character} (Account: {account}, League: {league})")
 
-            # Use the discovered hidden API endpoint
+            # Use the discovered hidden API endpoint; a failed request raises
+            # so it isn't remembered as "not found"
             char_data = await self._fetch_character_from_api(account, character, league)
 
-            if char_data and self.cache_manager:
-                await self.cache_manager.set(cache_key, char_data, ttl=3600)
-                logger.info(f"✅ Successfully fetched and cached character {character}")
+            if char_data:
+                logger.info(f"✅ Successfully fetched character {character}")
 
             return char_data
 
-        except Exception as e:
-            logger.error(f"❌ Error fetching character from poe.ninja: {e}", exc_info=True)
-            return None
+        # Concurrent requests for the same character share one upstream fetch
+        return await self._get_or_compute(
+            cache_key, load,
+            ttl=3600 + settings.CACHE_STALE_TTL,
+            soft_ttl=3600,
+            tags=[f"account:{account}", f"league:{league}"],
+            negative_ttl=settings.CACHE_NEGATIVE_TTL if use_negative_cache else None
+        )
 
     async def _get_index_state(self) -> Optional[Dict[str, Any]]:
         """
@@ -138,7 +193,9 @@ class PoeNinjaAPI:
             url = f"{self.base_url}/poe2/api/data/index-state"
             logger.debug(f"Fetching index state from: {url}")
 
-            response = await self.client.get(url)
+            response = await self.circuit_breakers.get(self.CIRCUIT).request(
+                lambda: self.client.get(url)
+            )
 
             if response.status_code == 200:
                 data = response.json()
@@ -166,65 +223,76 @@ class PoeNinjaAPI:
 
         Returns:
             Character data dictionary or None if not found
+
+        Raises:
+            httpx.HTTPError: The API failed and so did the HTML fallback
         """
         try:
             # Step 1: Get index state to find the snapshot version for this league
             index_state = await self._get_index_state()
+            snapshot = None
             if not index_state:
                 logger.warning("⚠️ Could not get index state, falling back to HTML scraping")
-                return await self._scrape_character_page(account, character, league)
-
-            # Step 2: Find the snapshot version for our league
-            league_slug = self._get_league_slug(league)
-            snapshot = None
+            else:
+                # Step 2: Find the snapshot version for our league
+                league_slug = self._get_league_slug(league)
 
-            for snap in index_state.get("snapshotVersions", []):
-                if snap.get("url") == league_slug:
-                    snapshot = snap
-                    break
+                for snap in index_state.get("snapshotVersions", []):
+                    if snap.get("url") == league_slug:
+                        snapshot = snap
+                        break
 
-            if not snapshot:
-                logger.warning(f"⚠️ No snapshot found for league '{league}' (slug: '{league_slug}')")
-                logger.warning(f"   Available leagues: {[s.get('url') for s in index_state.get('snapshotVersions', [])]}")
-                return await self._scrape_character_page(account, character, league)
+                if not snapshot:
+                    logger.warning(f"⚠️ No snapshot found for league '{league}' (slug: '{league_slug}')")
+                    logger.warning(f"   Available leagues: {[s.get('url') for s in index_state.get('snapshotVersions', [])]}")
 
-            version = snapshot.get("version")
-            overview = snapshot.get("snapshotName")
+            if snapshot:
+                version = snapshot.get("version")
+                overview = snapshot.get("snapshotName")
 
-            logger.info(f"📡 Using snapshot version: {version}, overview: {overview}")
+                logger.info(f"📡 Using snapshot version: {version}, overview: {overview}")
 
-            # Step 3: Call the character API
-            url = f"{self.base_url}/poe2/api/builds/{version}/character"
-            params = {
-                "account": account,
-                "name": character,
-                "overview": overview
-            }
+                # Step 3: Call the character API
+                url = f"{self.base_url}/poe2/api/builds/{version}/character"
+                params = {
+                    "account": account,
+                    "name": character,
+                    "overview": overview
+                }
 
-            logger.debug(f"Calling API: {url}")
-            logger.debug(f"Parameters: {params}")
+                logger.debug(f"Calling API: {url}")
+                logger.debug(f"Parameters: {params}")
 
-            response = await self.client.get(url, params=params)
+                response = await self.circuit_breakers.get(self.CIRCUIT).request(
+                    lambda: self.client.get(url, params=params)
+                )
 
-            if response.status_code == 200:
-                data = response.json()
-                logger.info(f"✅ Successfully fetched character from API")
-                logger.debug(f"   Character: {data.get('name')}, Level: {data.get('level', 'Unknown')}, Class: {data.get('class', 'Unknown')}")
-                return self._normalize_api_character_data(data)
+                if response.status_code == 200:
+                    data = response.json()
+                    logger.info(f"✅ Successfully fetched character from API")
+                    logger.debug(f"   Character: {data.get('name')}, Level: {data.get('level', 'Unknown')}, Class: {data.get('class', 'Unknown')}")
+                    return self._normalize_api_character_data(data)
 
-            elif response.status_code == 404:
-                logger.warning(f"⚠️ Character not found (404)")
-                return None
+                elif response.status_code == 404:
+                    logger.warning(f"⚠️ Character not found (404)")
+                    return None
 
-            else:
-                logger.warning(f"⚠️ API returned {response.status_code}")
-                logger.debug(f"   Response: {response.text[:200]}")
-                return await self._scrape_character_page(account, character, league)
+                else:
+                    logger.warning(f"⚠️ API returned {response.status_code}")
+                    logger.debug(f"   Response: {response.text[:200]}")
 
+        except CircuitOpenError as e:
+            logger.info(f"{e}, falling back to HTML scraping")
         except Exception as e:
+            # Transport errors are already recorded; this catches a changed
+            # response shape
+            if not isinstance(e, httpx.HTTPError):
+                self.circuit_breakers.get(self.CIRCUIT).record_failure(reason=str(e))
             logger.error(f"❌ API fetch failed: {e}", exc_info=True)
             logger.info("   Falling back to HTML scraping")
-            return await self._scrape_character_page(account, character, league)
+
+        # Outside the try: a failed fallback must reach the caller
+        return await self._scrape_character_page(account, character, league)
 
     def _normalize_api_character_data(self, api_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -428,49 +496,55 @@ class PoeNinjaAPI:
             league: League name (default: "Abyss")
 
         Returns:
-            Parsed character data
+            Parsed character data, or None if every URL answered 404
+
+        Raises:
+            httpx.HTTPError: A URL failed with anything but a 404 and none
+                returned the page
         """
-        try:
-            # Convert league to URL slug (e.g., "Abyss" -> "abyss")
-            league_slug = self._get_league_slug(league)
-
-            # CRITICAL FIX: Based on HAR file analysis, the correct URL format includes league
-            # Format: https://poe.ninja/poe2/builds/{league}/character/{account}/{character}
-            urls = [
-                f"{self.base_url}/poe2/builds/{league_slug}/character/{account}/{character}",
-                f"{self.base_url}/builds/{league_slug}/character/{account}/{character}",  # Fallback without poe2
-            ]
+        # Convert league to URL slug (e.g., "Abyss" -> "abyss")
+        league_slug = self._get_league_slug(league)
 
-            logger.info(f"📡 Attempting to fetch from poe.ninja with league '{league}' (slug: '{league_slug}')")
+        # CRITICAL FIX: Based on HAR file analysis, the correct URL format includes league
+        # Format: https://poe.ninja/poe2/builds/{league}/character/{account}/{character}
+        urls = [
+            f"{self.base_url}/poe2/builds/{league_slug}/character/{account}/{character}",
+            f"{self.base_url}/builds/{league_slug}/character/{account}/{character}",  # Fallback without poe2
+        ]
 
-            for i, url in enumerate(urls, 1):
-                try:
-                    logger.debug(f"  [{i}/{len(urls)}] Trying URL: {url}")
-                    response = await self.client.get(url)
+        logger.info(f"📡 Attempting to fetch from poe.ninja with league '{league}' (slug: '{league_slug}')")
 
-                    logger.debug(f"  [{i}/{len(urls)}] Response: {response.status_code}")
+        # Last URL that couldn't be read; only 404s prove the page is missing
+        failure: Optional[httpx.HTTPError] = None
 
-                    if response.status_code == 200:
-                        logger.info(f"✅ Successfully fetched from: {url}")
-                        return await self._parse_character_html(response.text, account, character)
-                    else:
-                        logger.debug(f"  [{i}/{len(urls)}] Non-200 status: {response.status_code}")
+        for i, url in enumerate(urls, 1):
+            try:
+                logger.debug(f"  [{i}/{len(urls)}] Trying URL: {url}")
+                response = await self.client.get(url)
 
-                except Exception as e:
-                    logger.debug(f"  [{i}/{len(urls)}] Exception: {e}")
+                logger.debug(f"  [{i}/{len(urls)}] Response: {response.status_code}")
+
+                if response.status_code == 404:
                     continue
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.debug(f"  [{i}/{len(urls)}] Exception: {e}")
+                failure = e
+                continue
 
-            logger.warning(f"❌ Could not fetch character {character} from any poe.ninja URL")
-            logger.warning(f"   Tried {len(urls)} URLs with league slug '{league_slug}'")
-            return None
+            logger.info(f"✅ Successfully fetched from: {url}")
+            return await self._parse_character_html(response.text, account, character)
 
-        except Exception as e:
-            logger.error(f"❌ Character scraping error: {e}", exc_info=True)
-            return None
+        if failure:
+            raise failure
+
+        logger.warning(f"❌ Could not fetch character {character} from any poe.ninja URL")
+        logger.warning(f"   Tried {len(urls)} URLs with league slug '{league_slug}'")
+        return None
 
     async def _parse_character_html(self, html: str, account: str, character: str) -> Optional[Dict[str, Any]]:
         """
-        Parse character data from HTML page
+        Parse character data from HTML page on the parse pool
 
         Args:
             html: HTML content
@@ -481,57 +555,29 @@ class PoeNinjaAPI:
             Parsed character data
         """
         try:
-            logger.debug(f"📄 Parsing HTML (length: {len(html)} chars)")
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Look for embedded JSON data in script tags
-            scripts = soup.find_all('script')
-            logger.debug(f"🔎 Found {len(scripts)} script tags in HTML")
-
-            for i, script in enumerate(scripts, 1):
-                if script.string and ('window.__NUXT__' in script.string or 'window.__data' in script.string):
-                    try:
-                        # Extract JSON data
-                        script_content = script.string
-
-                        # Try NUXT data first
-                        if 'window.__NUXT__' in script_content:
-                            logger.debug(f"  [Script {i}] Found window.__NUXT__ data")
-                            json_start = script_content.find('window.__NUXT__=') + len('window.__NUXT__=')
-                            json_end = script_content.find('</script>', json_start)
-                            json_str = script_content[json_start:json_end].strip()
-                            if json_str.endswith(';'):
-                                json_str = json_str[:-1]
-
-                            logger.debug(f"  [Script {i}] Parsing JSON (length: {len(json_str)} chars)")
-                            data = json.loads(json_str)
-                            logger.info(f"✅ Successfully parsed window.__NUXT__ JSON")
-                            return self._extract_character_from_nuxt(data, account, character)
-
-                        # Try __data format
-                        elif 'window.__data' in script_content:
-                            logger.debug(f"  [Script {i}] Found window.__data")
-                            json_start = script_content.find('window.__data=') + len('window.__data=')
-                            json_end = script_content.find(';', json_start)
-                            json_str = script_content[json_start:json_end].strip()
-
-                            logger.debug(f"  [Script {i}] Parsing JSON (length: {len(json_str)} chars)")
-                            data = json.loads(json_str)
-                            logger.info(f"✅ Successfully parsed window.__data JSON")
-                            return self._extract_character_from_data(data, account, character)
-
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"  [Script {i}] Failed to parse JSON: {e}")
-                        continue
-
-            # Fallback: parse HTML structure directly
-            logger.warning(f"⚠️ No embedded JSON found, falling back to HTML parsing")
-            return self._parse_character_from_html(soup, account, character)
-
+            return await run_parser(self._parse_character_page, html, account, character)
         except Exception as e:
             logger.error(f"❌ HTML parsing error: {e}", exc_info=True)
             return None
 
+    def _parse_character_page(self, html: str, account: str, character: str) -> Dict[str, Any]:
+        """Embedded JSON when the page has it, else the HTML structure (runs off the event loop)"""
+        logger.debug(f"📄 Parsing HTML (length: {len(html)} chars)")
+
+        data = extract_embedded_json(html, NUXT_MARKER)
+        if isinstance(data, dict):
+            logger.info(f"✅ Successfully parsed window.__NUXT__ JSON")
+            return self._extract_character_from_nuxt(data, account, character)
+
+        data = extract_embedded_json(html, DATA_MARKER)
+        if isinstance(data, dict):
+            logger.info(f"✅ Successfully parsed window.__data JSON")
+            return self._extract_character_from_data(data, account, character)
+
+        # Fallback: parse HTML structure directly
+        logger.warning(f"⚠️ No embedded JSON found, falling back to HTML parsing")
+        return self._parse_character_from_html(make_soup(html), account, character)
+
     def _extract_character_from_nuxt(self, data: Dict, account: str, character: str) -> Dict[str, Any]:
         """Extract character data from NUXT format"""
         try:
@@ -637,38 +683,37 @@ class PoeNinjaAPI:
         # Get the URL slug for this league
         league_slug = self._get_league_slug(league)
 
-        cache_key = f"ninja_top_builds_{league_slug}_{class_name}_{skill}_{limit}"
-
-        if self.cache_manager:
-            cached = await self.cache_manager.get(cache_key)
-            if cached:
-                return cached
-
-        try:
-            await self.rate_limiter.acquire()
-
-            # Use league slug in the URL path
-            url = f"{self.base_url}/poe2/builds/{league_slug}"
+        cache_key = f"ladder:ninja_builds:{league_slug}:{class_name}:{skill}:{limit}"
 
-            logger.info(f"Fetching top builds from: {url}")
+        async def load() -> List[Dict[str, Any]]:
+            try:
+                await self.rate_limiter.acquire()
 
-            response = await self.client.get(url)
+                # Use league slug in the URL path
+                url = f"{self.base_url}/poe2/builds/{league_slug}"
 
-            if response.status_code == 200:
-                builds = await self._parse_builds_page(response.text, class_name, skill, limit)
-
-                if builds and self.cache_manager:
-                    await self.cache_manager.set(cache_key, builds, ttl=1800)
+                logger.info(f"Fetching top builds from: {url}")
 
+                builds = await self.conditional.fetch(
+                    f"ladder:ninja_builds_page:{league_slug}:{class_name}:{skill}:{limit}",
+                    lambda headers: self.client.get(url, headers=headers),
+                    lambda response: self._parse_builds_page(response.text, class_name, skill, limit),
+                    tags=[f"league:{league}"]
+                )
                 logger.info(f"Found {len(builds)} builds from poe.ninja")
                 return builds
-            else:
-                logger.warning(f"poe.ninja builds page returned {response.status_code} for league '{league_slug}'")
+
+            except httpx.HTTPStatusError as e:
+                logger.warning(f"poe.ninja builds page returned {e.response.status_code} for league '{league_slug}'")
                 return []
 
-        except Exception as e:
-            logger.error(f"Error fetching top builds: {e}")
-            return []
+            except Exception as e:
+                logger.error(f"Error fetching top builds: {e}")
+                return []
+
+        return await self._get_or_compute(
+            cache_key, load, ttl=1800, tags=[f"league:{league}"]
+        )
 
     async def _parse_builds_page(
         self,
@@ -677,72 +722,50 @@ class PoeNinjaAPI:
         skill_filter: Optional[str],
         limit: int
     ) -> List[Dict[str, Any]]:
-        """Parse builds from HTML page (NUXT data extraction)"""
+        """Parse builds from HTML page on the parse pool"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            builds = []
-
-            # poe.ninja uses NUXT, so data is embedded in JavaScript
-            # Look for __NUXT__ data
-            for script in soup.find_all('script'):
-                script_content = script.string
-                if not script_content:
+            return await run_parser(self._parse_builds_html, html, class_filter, skill_filter, limit)
+        except Exception as e:
+            logger.error(f"Build parsing error: {e}")
+            return []
+
+    def _parse_builds_html(
+        self,
+        html: str,
+        class_filter: Optional[str],
+        skill_filter: Optional[str],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """NUXT data extraction with an HTML fallback (runs off the event loop)"""
+        # poe.ninja uses NUXT, so data is embedded in JavaScript
+        nuxt_data = extract_embedded_json(html, NUXT_MARKER)
+        if isinstance(nuxt_data, dict):
+            builds = self._extract_builds_from_nuxt(nuxt_data, class_filter, skill_filter, limit)
+            if builds:
+                return builds
+
+        # Fallback: look for build listings in HTML
+        logger.warning("Could not find NUXT data, trying HTML fallback")
+        soup = make_soup(html)
+        builds = []
+        build_elements = soup.find_all(class_=['build-row', 'build-item', 'character-row'])
+
+        for elem in build_elements[:limit * 2]:  # Get extra in case of filtering
+            build = self._extract_build_info(elem)
+
+            if build:
+                # Apply filters
+                if class_filter and build.get("class") != class_filter:
+                    continue
+                if skill_filter and skill_filter.lower() not in build.get("main_skill", "").lower():
                     continue
 
-                # Try to find NUXT data
-                if 'window.__NUXT__' in script_content or '__NUXT__=' in script_content:
-                    try:
-                        # Extract JSON from the script
-                        start_marker = '__NUXT__='
-                        if start_marker in script_content:
-                            json_start = script_content.find(start_marker) + len(start_marker)
-                            # Find the end - it's usually a semicolon or end of script
-                            json_end = script_content.find('</script>', json_start)
-                            if json_end == -1:
-                                json_end = len(script_content)
-
-                            json_str = script_content[json_start:json_end].strip()
-                            if json_str.endswith(';'):
-                                json_str = json_str[:-1]
-
-                            # Parse the NUXT data
-                            nuxt_data = json.loads(json_str)
-                            builds = self._extract_builds_from_nuxt(nuxt_data, class_filter, skill_filter, limit)
-
-                            if builds:
-                                return builds
-
-                    except json.JSONDecodeError as e:
-                        logger.debug(f"Failed to parse NUXT data: {e}")
-                        continue
-
-            # Fallback: Try to find build data in alternative locations
-            # Some pages might have data in different formats
-            logger.warning("Could not find NUXT data, trying HTML fallback")
-
-            # Look for build listings in HTML
-            build_elements = soup.find_all(class_=['build-row', 'build-item', 'character-row'])
-
-            for elem in build_elements[:limit * 2]:  # Get extra in case of filtering
-                build = self._extract_build_info(elem)
-
-                if build:
-                    # Apply filters
-                    if class_filter and build.get("class") != class_filter:
-                        continue
-                    if skill_filter and skill_filter.lower() not in build.get("main_skill", "").lower():
-                        continue
-
-                    builds.append(build)
-
-                    if len(builds) >= limit:
-                        break
+                builds.append(build)
 
-            return builds
+                if len(builds) >= limit:
+                    break
 
-        except Exception as e:
-            logger.error(f"Build parsing error: {e}")
-            return []
+        return builds
 
     def _extract_builds_from_nuxt(
         self,
@@ -886,38 +909,39 @@ class PoeNinjaAPI:
         Returns:
             List of items with prices
         """
-        cache_key = f"ninja_prices_{league}_{item_type}"
-
-        if self.cache_manager:
-            cached = await self.cache_manager.get(cache_key)
-            if cached:
-                return cached
-
-        try:
-            await self.rate_limiter.acquire()
+        cache_key = f"prices:ninja:{league}:{item_type}"
 
-            url = f"{self.api_base}/itemoverview"
-            params = {
-                "league": league,
-                "type": item_type
-            }
-
-            response = await self.client.get(url, params=params)
+        async def load() -> List[Dict[str, Any]]:
+            try:
+                await self.rate_limiter.acquire()
 
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get("lines", [])
+                url = f"{self.api_base}/itemoverview"
+                params = {
+                    "league": league,
+                    "type": item_type
+                }
 
-                if items and self.cache_manager:
-                    await self.cache_manager.set(cache_key, items, ttl=3600)
+                return await self.conditional.fetch(
+                    f"prices:ninja_page:{league}:{item_type}",
+                    lambda headers: self.client.get(url, params=params, headers=headers),
+                    lambda response: response.json().get("lines", []),
+                    tags=[f"league:{league}"]
+                )
 
-                return items
+            except httpx.HTTPStatusError as e:
+                logger.debug(f"poe.ninja item overview returned {e.response.status_code}")
+                return []
 
-            return []
+            except Exception as e:
+                logger.error(f"Error fetching item prices: {e}")
+                return []
 
-        except Exception as e:
-            logger.error(f"Error fetching item prices: {e}")
-            return []
+        return await self._get_or_compute(
+            cache_key, load,
+            ttl=3600 + settings.CACHE_STALE_TTL,
+            soft_ttl=3600,
+            tags=[f"league:{league}"]
+        )
 
     async def get_pob_import(self, account: str, character: str) -> Optional[str]:
         """
@@ -938,72 +962,67 @@ class PoeNinjaAPI:
             >>> print(pob_code)
             'eJyLjgUAARUAuQ==' # Base64 PoB code
         """
-        cache_key = f"ninja_pob_{account}_{character}"
+        cache_key = f"pob:ninja:{account}:{character}"
 
-        # Check cache first
-        if self.cache_manager:
-            cached = await self.cache_manager.get(cache_key)
-            if cached:
-                logger.info(f"✅ Cache hit for PoB code: {character}")
-                return cached
+        async def load() -> Optional[str]:
+            try:
+                # Rate limit
+                await self.rate_limiter.acquire()
 
-        try:
-            # Rate limit
-            await self.rate_limiter.acquire()
+                logger.info(f"📦 Fetching PoB code for character: {character} (Account: {account})")
 
-            logger.info(f"📦 Fetching PoB code for character: {character} (Account: {account})")
-
-            # Call the discovered PoB import API
-            url = f"{self.base_url}/poe2/api/builds/pob/import"
-            params = {
-                "accountName": account,
-                "characterName": character
-            }
+                # Call the discovered PoB import API
+                url = f"{self.base_url}/poe2/api/builds/pob/import"
+                params = {
+                    "accountName": account,
+                    "characterName": character
+                }
 
-            logger.debug(f"Calling PoB API: {url}")
-            logger.debug(f"Parameters: {params}")
+                logger.debug(f"Calling PoB API: {url}")
+                logger.debug(f"Parameters: {params}")
 
-            # Add referer header to appear as if coming from character page
-            headers = {
-                "Referer": f"{self.base_url}/poe2/builds/character/{account}/{character}",
-                "Accept": "application/json",
-            }
+                # Add referer header to appear as if coming from character page
+                headers = {
+                    "Referer": f"{self.base_url}/poe2/builds/character/{account}/{character}",
+                    "Accept": "application/json",
+                }
 
-            response = await self.client.get(url, params=params, headers=headers)
+                response = await self.client.get(url, params=params, headers=headers)
 
-            if response.status_code == 200:
-                data = response.json()
+                if response.status_code == 200:
+                    data = response.json()
 
-                # The API should return a PoB code
-                # Based on typical poe.ninja API structure, it might be in data['pob'] or data['code']
-                pob_code = data.get("pob") or data.get("code") or data.get("build")
+                    # The API should return a PoB code
+                    # Based on typical poe.ninja API structure, it might be in data['pob'] or data['code']
+                    pob_code = data.get("pob") or data.get("code") or data.get("build")
 
-                if pob_code:
-                    logger.info(f"✅ Successfully fetched PoB code for {character}")
+                    if pob_code:
+                        logger.info(f"✅ Successfully fetched PoB code for {character}")
+                        return pob_code
+                    else:
+                        logger.warning(f"⚠️ PoB API returned success but no code found")
+                        logger.debug(f"   Response data keys: {list(data.keys())}")
+                        # Return the full data in case it's in a different format
+                        return data
 
-                    if self.cache_manager:
-                        await self.cache_manager.set(cache_key, pob_code, ttl=3600)
+                elif response.status_code == 404:
+                    logger.warning(f"⚠️ Character not found for PoB import (404)")
+                    return None
 
-                    return pob_code
                 else:
-                    logger.warning(f"⚠️ PoB API returned success but no code found")
-                    logger.debug(f"   Response data keys: {list(data.keys())}")
-                    # Return the full data in case it's in a different format
-                    return data
-
-            elif response.status_code == 404:
-                logger.warning(f"⚠️ Character not found for PoB import (404)")
-                return None
+                    logger.warning(f"⚠️ PoB API returned {response.status_code}")
+                    logger.debug(f"   Response: {response.text[:200]}")
+                    return None
 
-            else:
-                logger.warning(f"⚠️ PoB API returned {response.status_code}")
-                logger.debug(f"   Response: {response.text[:200]}")
+            except Exception as e:
+                logger.error(f"❌ PoB import API failed: {e}", exc_info=True)
                 return None
 
-        except Exception as e:
-            logger.error(f"❌ PoB import API failed: {e}", exc_info=True)
-            return None
+        return await self._get_or_compute(
+            cache_key, load, ttl=3600, tags=[f"account:{account}"]
+        )
 
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """Close the HTTP client if this instance created its own factory"""
+        if self._owns_http_clients:
+            await self.http_clients.close()
@@ -0,0 +1,281 @@
+"""
+Shared Rate Limit Backends
+Coordinate RateLimiter budgets and backoff across server processes
+"""
+
+import asyncio
+import time
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(ABC):
+    """
+    Shared store for rate limiter state
+
+    RateLimiter keeps its own in-process token bucket; a backend adds one
+    bucket per limiter name that every process pointed at the same store
+    draws from, plus the backoff and Retry-After block, so a restarted or
+    second server process doesn't start with a full budget. All times
+    are measured on the backend's clock, never on the caller's.
+    """
+
+    @abstractmethod
+    async def take(self, name: str, interval: float, tolerance: float) -> float:
+        """
+        Atomically take a slot from the shared bucket
+
+        Args:
+            name: Limiter name (one bucket per upstream)
+            interval: Seconds between requests at the current rate
+            tolerance: Seconds a request may run ahead of schedule (burst)
+
+        Returns:
+            0 if the slot was taken, else seconds to wait before retrying
+        """
+
+    @abstractmethod
+    async def block(self, name: str, seconds: float):
+        """Block every process from sending for the next `seconds`"""
+
+    @abstractmethod
+    async def save_backoff(self, name: str, consecutive_failures: int):
+        """Persist the consecutive failure count behind the adaptive backoff"""
+
+    @abstractmethod
+    async def load_state(self, name: str) -> Tuple[int, float]:
+        """
+        Returns:
+            (consecutive_failures, seconds the limiter is still blocked for)
+        """
+
+    async def close(self):
+        """Release the backend's connection"""
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Rate limit state in a SQLite file shared by processes on one host
+
+    Each take() is a read-modify-write inside BEGIN IMMEDIATE, which holds
+    the database write lock, so concurrent processes see each other's
+    reservations. Times are wall-clock (time.time()).
+    """
+
+    BUSY_TIMEOUT_MS = 5000
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._conn: Optional[aiosqlite.Connection] = None
+        # One statement sequence at a time on our connection
+        self._lock = asyncio.Lock()
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode: transactions are opened explicitly below
+            conn = await aiosqlite.connect(str(self.path), isolation_level=None)
+            await conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    name TEXT PRIMARY KEY,
+                    tat REAL NOT NULL DEFAULT 0,
+                    blocked_until REAL NOT NULL DEFAULT 0,
+                    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL
+                )
+            """)
+            self._conn = conn
+        return self._conn
+
+    async def take(self, name: str, interval: float, tolerance: float) -> float:
+        async with self._lock:
+            conn = await self._connection()
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                async with conn.execute(
+                    "SELECT tat, blocked_until FROM rate_limits WHERE name = ?", (name,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+                tat, blocked_until = row if row else (0.0, 0.0)
+
+                allowed_at = max(tat - tolerance, blocked_until)
+                if now < allowed_at:
+                    await conn.execute("COMMIT")
+                    return allowed_at - now
+
+                await conn.execute(
+                    """
+                    INSERT INTO rate_limits (name, tat, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        tat = excluded.tat, updated_at = excluded.updated_at
+                    """,
+                    (name, max(tat, now) + interval, now)
+                )
+                await conn.execute("COMMIT")
+                return 0.0
+            except Exception:
+                await conn.execute("ROLLBACK")
+                raise
+
+    async def block(self, name: str, seconds: float):
+        async with self._lock:
+            conn = await self._connection()
+            now = time.time()
+            await conn.execute(
+                """
+                INSERT INTO rate_limits (name, blocked_until, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    blocked_until = max(blocked_until, excluded.blocked_until),
+                    updated_at = excluded.updated_at
+                """,
+                (name, now + seconds, now)
+            )
+
+    async def save_backoff(self, name: str, consecutive_failures: int):
+        async with self._lock:
+            conn = await self._connection()
+            await conn.execute(
+                """
+                INSERT INTO rate_limits (name, consecutive_failures, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    consecutive_failures = excluded.consecutive_failures,
+                    updated_at = excluded.updated_at
+                """,
+                (name, consecutive_failures, time.time())
+            )
+
+    async def load_state(self, name: str) -> Tuple[int, float]:
+        async with self._lock:
+            conn = await self._connection()
+            async with conn.execute(
+                "SELECT consecutive_failures, blocked_until FROM rate_limits WHERE name = ?",
+                (name,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        if not row:
+            return 0, 0.0
+        return int(row[0]), max(0.0, row[1] - time.time())
+
+    async def close(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+# Lua scripts run atomically on the Redis server and use its clock, so
+# processes on different hosts agree on time. Floats are returned as
+# strings because Redis truncates Lua numbers to integers.
+_REDIS_TAKE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('HGET', KEYS[1], 'tat') or 0)
+local blocked_until = tonumber(redis.call('HGET', KEYS[1], 'blocked_until') or 0)
+local allowed_at = math.max(tat - tonumber(ARGV[2]), blocked_until)
+if now < allowed_at then
+    return tostring(allowed_at - now)
+end
+redis.call('HSET', KEYS[1], 'tat', tostring(math.max(tat, now) + tonumber(ARGV[1])))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return '0'
+"""
+
+_REDIS_BLOCK = """
+local t = redis.call('TIME')
+local until_at = tonumber(t[1]) + tonumber(t[2]) / 1000000 + tonumber(ARGV[1])
+local blocked_until = tonumber(redis.call('HGET', KEYS[1], 'blocked_until') or 0)
+redis.call('HSET', KEYS[1], 'blocked_until', tostring(math.max(blocked_until, until_at)))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+_REDIS_LOAD = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local failures = redis.call('HGET', KEYS[1], 'consecutive_failures') or '0'
+local blocked_until = tonumber(redis.call('HGET', KEYS[1], 'blocked_until') or 0)
+return {failures, tostring(math.max(0, blocked_until - now))}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Rate limit state in Redis, shared by processes on any host
+
+    Reuses the CacheManager's Redis client. Each limiter is one hash
+    (tat, blocked_until, consecutive_failures) updated by Lua scripts.
+    """
+
+    def __init__(self, redis_client: Any, prefix: str = "rate_limit:", ttl: int = 86400) -> None:
+        """
+        Args:
+            redis_client: Connected aioredis client
+            prefix: Key prefix for the limiter hashes
+            ttl: Seconds an idle limiter's state is kept
+        """
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    async def take(self, name: str, interval: float, tolerance: float) -> float:
+        wait = await self.redis.eval(
+            _REDIS_TAKE, 1, self._key(name), interval, tolerance, self.ttl
+        )
+        return float(wait)
+
+    async def block(self, name: str, seconds: float):
+        await self.redis.eval(_REDIS_BLOCK, 1, self._key(name), seconds, self.ttl)
+
+    async def save_backoff(self, name: str, consecutive_failures: int):
+        key = self._key(name)
+        await self.redis.hset(key, "consecutive_failures", consecutive_failures)
+        await self.redis.expire(key, self.ttl)
+
+    async def load_state(self, name: str) -> Tuple[int, float]:
+        failures, blocked_for = await self.redis.eval(_REDIS_LOAD, 1, self._key(name))
+        return int(failures), float(blocked_for)
+
+
+def create_rate_limit_backend(
+    kind: Optional[str],
+    sqlite_path: Optional[Union[str, Path]] = None,
+    redis_client: Any = None
+) -> Optional[RateLimitBackend]:
+    """
+    Build the backend selected by RATE_LIMIT_BACKEND
+
+    Args:
+        kind: "memory" (no backend), "sqlite" or "redis"
+        sqlite_path: Database file for the sqlite backend
+        redis_client: Connected client for the redis backend
+
+    Returns:
+        Backend instance, or None for in-process limiting only
+    """
+    kind = (kind or "memory").lower()
+    if kind == "memory":
+        return None
+    if kind == "sqlite":
+        if sqlite_path is None:
+            raise ValueError("The sqlite rate limit backend needs a database path")
+        return SQLiteRateLimitBackend(sqlite_path)
+    if kind == "redis":
+        if redis_client is None:
+            logger.warning(
+                "RATE_LIMIT_BACKEND=redis but Redis is not available; "
+                "rate limits are tracked in-process only"
+            )
+            return None
+        return RedisRateLimitBackend(redis_client)
+    raise ValueError(f"Unknown rate limit backend: {kind}")
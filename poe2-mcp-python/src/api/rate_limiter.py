@@ -1,86 +1,321 @@
 """
 Rate Limiter for API requests
-Implements token bucket algorithm with adaptive rate limiting
+Implements token bucket rate limiting (GCRA) with adaptive backoff and priority lanes
 """
 
 import asyncio
+import bisect
 import time
 import logging
-from typing import Dict
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from .rate_limit_backend import RateLimitBackend
 
 logger = logging.getLogger(__name__)
 
 
+# Priority lanes, most urgent first
+PRIORITIES = ("interactive", "normal", "background")
+
+# Lane for acquire() calls that don't pass one; see request_priority()
+_current_priority: ContextVar[str] = ContextVar("rate_limit_priority", default="normal")
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Run the enclosed requests in a priority lane
+
+    Applies to every rate-limited request made from this task (and tasks
+    it creates) that doesn't pass a priority explicitly, e.g.:
+
+        with request_priority("background"):
+            await fetcher.get_top_ladder_characters(...)
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown rate limit priority: {priority}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class _Waiter(NamedTuple):
+    future: "asyncio.Future[None]"
+    enqueued_at: float
+
+
 class RateLimiter:
     """
-    Token bucket rate limiter with adaptive backoff
+    Token bucket rate limiter with adaptive backoff and priority lanes
+
+    Implemented as GCRA (generic cell rate algorithm): the limiter keeps the
+    theoretical arrival time of the next request. A request that finds a
+    free slot and nobody waiting is sent at once; otherwise it waits in its
+    priority lane and a dispatcher hands out slots as they come due, so the
+    aggregate rate never exceeds rate_limit (after an initial burst) and
+    nobody waits behind a lock held across a sleep.
+
+    Lanes (PRIORITIES) are served most urgent first and FIFO within a lane.
+    A waiter in a lower lane that has waited starvation_timeout seconds is
+    served ahead of the higher lanes, which bounds background starvation.
+
+    With a backend (see rate_limit_backend), every request granted here
+    also takes a slot from a bucket shared with other processes, and the
+    backoff and Retry-After blocks are persisted there. Without one, no
+    I/O happens on the acquire path.
     """
 
     def __init__(
         self,
         rate_limit: int = 10,  # requests per minute
         burst: int = 3,  # max burst size
-        adaptive: bool = True  # enable adaptive rate limiting
+        adaptive: bool = True,  # enable adaptive rate limiting
+        starvation_timeout: float = 30.0,  # max wait before a lower lane goes first
+        backend: Optional[RateLimitBackend] = None,  # shared cross-process state
+        name: str = "default"  # bucket name in the backend
     ):
         self.rate_limit = rate_limit
         self.burst = burst
         self.adaptive = adaptive
+        self.starvation_timeout = starvation_timeout
+        self.backend = backend
+        self.name = name
 
-        # Token bucket
-        self.tokens = burst
+        # Token bucket as GCRA: time (monotonic) the next request would be
+        # sent if the bucket were empty; up to burst-1 intervals early is allowed
         self.max_tokens = burst
-        self.last_update = time.time()
+        self._tat = 0.0
 
         # Adaptive rate limiting
         self.consecutive_failures = 0
         self.current_backoff = 1.0
 
+        # Set from Retry-After: no request is sent before this (monotonic) time
+        self.blocked_until = 0.0
+
         # Statistics
         self.total_requests = 0
         self.total_waits = 0
         self.total_wait_time = 0.0
+        self._lane_served = [0] * len(PRIORITIES)
+        self._lane_wait_time = [0.0] * len(PRIORITIES)
+        self._lane_max_wait = [0.0] * len(PRIORITIES)
+
+        # Slot key (see _slot_key) -> one waiter deque per lane, and the
+        # dispatcher task draining them
+        self._queues: Dict[Any, List[Deque[_Waiter]]] = {}
+        self._dispatchers: Dict[Any, asyncio.Task] = {}
+
+        # Backend state is loaded on first use; writes run in the background
+        self._backend_loaded = False
+        self._backend_writes: Set[asyncio.Task] = set()
 
         self._lock = asyncio.Lock()
 
-    async def acquire(self):
+    async def acquire(self, policy: Optional[str] = None, priority: Optional[str] = None):
         """
         Acquire a token (wait if necessary)
+
+        Args:
+            policy: Server rate-limit policy the request falls under; the
+                plain token bucket ignores it (see HeaderRateLimiter)
+            priority: "interactive", "normal" or "background"; defaults to
+                the lane set with request_priority()
         """
+        priority = priority or _current_priority.get()
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown rate limit priority: {priority}")
+        lane = PRIORITIES.index(priority)
+        if self.backend is not None and not self._backend_loaded:
+            await self._load_backend_state()
+        key = self._slot_key(policy)
+
+        await self._acquire_local(key, lane)
+        if self.backend is not None and key is None:
+            await self._acquire_shared()
+
+    async def _acquire_local(self, key: Any, lane: int):
+        """Wait for this process's slot in the given lane"""
         async with self._lock:
-            # Refill tokens based on time passed
-            now = time.time()
-            time_passed = now - self.last_update
-            tokens_to_add = time_passed * (self.rate_limit / 60.0)
-
-            self.tokens = min(self.max_tokens, self.tokens + tokens_to_add)
-            self.last_update = now
-
-            # If no tokens available, wait
-            if self.tokens < 1.0:
-                wait_time = (1.0 - self.tokens) * (60.0 / self.rate_limit)
-
-                # Apply adaptive backoff if enabled
-                if self.adaptive and self.consecutive_failures > 0:
-                    wait_time *= self.current_backoff
-
-                logger.debug(f"Rate limit: waiting {wait_time:.2f}s")
-
-                self.total_waits += 1
-                self.total_wait_time += wait_time
+            now = time.monotonic()
+            self.total_requests += 1
+            lanes = self._queues.get(key)
+            if not lanes:
+                send_at = self._next_slot(key, now)
+                if send_at <= now:
+                    self._reserve(key, send_at)
+                    self._record_grant(lane, 0.0)
+                    return
+                lanes = self._queues[key] = [deque() for _ in PRIORITIES]
+
+            waiter = _Waiter(asyncio.get_running_loop().create_future(), now)
+            lanes[lane].append(waiter)
+            if key not in self._dispatchers:
+                self._dispatchers[key] = asyncio.create_task(self._dispatch(key))
+
+        # Cancelling the caller cancels the future; the dispatcher skips it
+        await waiter.future
+
+    async def _dispatch(self, key: Any):
+        """Grant slots to the waiters of one slot key as they come due"""
+        while True:
+            async with self._lock:
+                lanes = self._queues[key]
+                for queue in lanes:
+                    while queue and queue[0].future.done():
+                        queue.popleft()
+                if not any(lanes):
+                    del self._queues[key]
+                    del self._dispatchers[key]
+                    return
+
+                now = time.monotonic()
+                send_at = self._next_slot(key, now)
+                if send_at <= now:
+                    lane = self._pick_lane(lanes, now)
+                    waiter = lanes[lane].popleft()
+                    self._reserve(key, send_at)
+                    self._record_grant(lane, now - waiter.enqueued_at)
+                    waiter.future.set_result(None)
+                    continue
+
+            wait_time = send_at - now
+            logger.debug(f"Rate limit: next slot in {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
+
+    async def _acquire_shared(self):
+        """Wait for a slot in the bucket shared with other processes"""
+        while True:
+            interval = self._interval()
+            try:
+                wait_time = await self.backend.take(
+                    self.name, interval, (self.max_tokens - 1) * interval
+                )
+            except Exception as e:
+                logger.warning(f"Shared rate limit backend failed, using local limit only: {e}")
+                return
+            if wait_time <= 0:
+                return
+            self.total_waits += 1
+            self.total_wait_time += wait_time
+            logger.debug(f"Rate limit: shared slot for {self.name} in {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
+
+    async def _load_backend_state(self):
+        """Pick up the backoff and block left by other or earlier processes"""
+        self._backend_loaded = True
+        try:
+            failures, blocked_for = await self.backend.load_state(self.name)
+        except Exception as e:
+            logger.warning(f"Could not load shared rate limit state for {self.name}: {e}")
+            return
+        if failures > self.consecutive_failures:
+            self.consecutive_failures = failures
+            self.current_backoff = min(32.0, 2.0 ** failures)
+        if blocked_for > 0:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + blocked_for)
+
+    def _write_backend(self, operation: str, *args: Any):
+        """Run a backend write in the background (no-op without a backend or loop)"""
+        if self.backend is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        async def write():
+            try:
+                await getattr(self.backend, operation)(self.name, *args)
+            except Exception as e:
+                logger.warning(f"Shared rate limit {operation} failed for {self.name}: {e}")
+
+        task = loop.create_task(write())
+        self._backend_writes.add(task)
+        task.add_done_callback(self._backend_writes.discard)
+
+    async def close(self):
+        """Wait for pending backend writes"""
+        if self._backend_writes:
+            await asyncio.gather(*self._backend_writes, return_exceptions=True)
+
+    def _pick_lane(self, lanes: List[Deque[_Waiter]], now: float) -> int:
+        """Most urgent non-empty lane, unless a lower lane's head is starving"""
+        top = next(index for index, queue in enumerate(lanes) if queue)
+        starving = [
+            index for index in range(top + 1, len(lanes))
+            if lanes[index] and now - lanes[index][0].enqueued_at >= self.starvation_timeout
+        ]
+        if starving:
+            return min(starving, key=lambda index: lanes[index][0].enqueued_at)
+        return top
+
+    def _record_grant(self, lane: int, waited: float):
+        self._lane_served[lane] += 1
+        if waited > 0:
+            self.total_waits += 1
+            self.total_wait_time += waited
+            self._lane_wait_time[lane] += waited
+            self._lane_max_wait[lane] = max(self._lane_max_wait[lane], waited)
+
+    def _slot_key(self, policy: Optional[str]) -> Any:
+        """Requests with the same key share one budget and one wait queue"""
+        return None
+
+    def _next_slot(self, key: Any, now: float) -> float:
+        """Earliest time the next request for key may be sent"""
+        tolerance = (self.max_tokens - 1) * self._interval()
+        # Honor a server-imposed restriction first
+        return max(now, self._tat - tolerance, self.blocked_until)
+
+    def _reserve(self, key: Any, send_at: float):
+        """Account for a request sent at send_at"""
+        self._tat = max(self._tat, send_at) + self._interval()
+
+    def _interval(self) -> float:
+        """Seconds between requests at the current rate (including backoff)"""
+        interval = 60.0 / self.rate_limit
+        if self.adaptive and self.consecutive_failures > 0:
+            interval *= self.current_backoff
+        return interval
+
+    @property
+    def tokens(self) -> float:
+        """Requests that could be sent right now without waiting"""
+        interval = self._interval()
+        backlog = max(0.0, self._tat - time.monotonic()) / interval
+        return max(0.0, self.max_tokens - backlog)
+
+    def update_from_headers(self, headers: Mapping[str, str], policy: Optional[str] = None):
+        """
+        Apply rate-limit hints from a response
 
-                await asyncio.sleep(wait_time)
+        The plain token bucket only honors Retry-After.
 
-                # Refill after wait
-                self.tokens = 1.0
+        Args:
+            headers: Response headers
+            policy: Policy key the request was acquired under
+        """
+        retry_after = _parse_retry_after(_lower_headers(headers))
+        if retry_after:
+            self._block(retry_after)
 
-            # Consume a token
-            self.tokens -= 1.0
-            self.total_requests += 1
+    def _block(self, seconds: float):
+        """Send nothing for the next `seconds`, in every process sharing the backend"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self._write_backend("block", seconds)
 
     def record_success(self):
         """Record a successful request (resets backoff)"""
         if self.consecutive_failures > 0:
             logger.debug("Request successful, resetting backoff")
+            self._write_backend("save_backoff", 0)
 
         self.consecutive_failures = 0
         self.current_backoff = 1.0
@@ -92,13 +327,14 @@ class RateLimiter:
             32.0,  # Max 32x backoff
             2.0 ** self.consecutive_failures
         )
+        self._write_backend("save_backoff", self.consecutive_failures)
 
         logger.warning(
             f"Request failed, backoff increased to {self.current_backoff}x "
             f"({self.consecutive_failures} consecutive failures)"
         )
 
-    def get_statistics(self) -> Dict[str, float]:
+    def get_statistics(self) -> Dict[str, Any]:
         """Get rate limiter statistics"""
         return {
             "total_requests": self.total_requests,
@@ -110,35 +346,363 @@ class RateLimiter:
             ),
             "current_backoff": self.current_backoff,
             "consecutive_failures": self.consecutive_failures,
-            "tokens_available": self.tokens
+            "tokens_available": self.tokens,
+            "lanes": {
+                name: {
+                    "queued": sum(
+                        not waiter.future.done()
+                        for lanes in self._queues.values() for waiter in lanes[index]
+                    ),
+                    "served": self._lane_served[index],
+                    "average_wait_time": (
+                        self._lane_wait_time[index] / self._lane_served[index]
+                        if self._lane_served[index] else 0.0
+                    ),
+                    "max_wait_time": self._lane_max_wait[index],
+                }
+                for index, name in enumerate(PRIORITIES)
+            },
         }
 
     def reset(self):
         """Reset the rate limiter"""
-        self.tokens = self.max_tokens
-        self.last_update = time.time()
+        self._tat = 0.0
         self.consecutive_failures = 0
         self.current_backoff = 1.0
+        self.blocked_until = 0.0
+
+
+def _lower_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    return {str(name).lower(): value for name, value in headers.items()}
+
+
+def _parse_retry_after(headers: Dict[str, str]) -> float:
+    try:
+        return max(0.0, float(headers.get("retry-after", 0)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _parse_rule_triples(value: str) -> List[Tuple[int, int, int]]:
+    """Parse "8:10:60,15:60:120" into [(8, 10, 60), (15, 60, 120)]"""
+    triples = []
+    for part in value.split(","):
+        fields = part.strip().split(":")
+        if len(fields) != 3:
+            continue
+        try:
+            triples.append(tuple(int(field) for field in fields))
+        except ValueError:
+            continue
+    return triples
+
+
+class _RateWindow:
+    """Sliding window of one rule: at most max_hits requests per period seconds"""
+
+    def __init__(self, max_hits: int, period: int) -> None:
+        self.max_hits = max_hits
+        self.period = period
+        # Sorted send times (monotonic), including reservations in the future
+        self.hits: List[float] = []
+
+    def prune(self, now: float):
+        del self.hits[:bisect.bisect_right(self.hits, now - self.period)]
+
+    def next_free(self, now: float, padding: float) -> float:
+        """Earliest time a request fits in this window"""
+        if len(self.hits) < self.max_hits:
+            return now
+        return self.hits[-self.max_hits] + self.period + padding
+
+
+class HeaderRateLimiter(RateLimiter):
+    """
+    Rate limiter driven by the server's X-Rate-Limit-* headers
+
+    The official pathofexile.com endpoints (ladders, trade2) publish their
+    policy on every response:
+
+        X-Rate-Limit-Policy: trade-search-request-limit
+        X-Rate-Limit-Rules: Ip,Account
+        X-Rate-Limit-Ip: 8:10:60,15:60:120        (hits:period:penalty)
+        X-Rate-Limit-Ip-State: 1:10:0,1:60:0      (hits:period:restricted)
+
+    Each rule window is tracked as a sliding window per policy, so requests
+    are sent as fast as the server allows instead of at a fixed
+    conservative rate. Until a policy has been seen, requests fall back to
+    the token bucket of RateLimiter.
+
+    Callers pass the same policy key to acquire() and update_from_headers()
+    (e.g. "trade-search", "ladder").
+    """
+
+    def __init__(
+        self,
+        rate_limit: int = 10,
+        burst: int = 3,
+        adaptive: bool = True,
+        starvation_timeout: float = 30.0,
+        window_padding: float = 0.25,
+        backend: Optional[RateLimitBackend] = None,
+        name: str = "default"
+    ):
+        """
+        Args:
+            rate_limit: Fallback requests per minute for unknown policies
+            burst: Fallback burst size
+            adaptive: Enable adaptive backoff
+            starvation_timeout: Max wait before a lower priority lane goes first
+            window_padding: Seconds added to each window to absorb clock
+                and network skew between us and the server
+            backend: Shared state for the fallback bucket and Retry-After
+                blocks; known policies need none, as the server's state
+                headers already count other processes' requests
+            name: Bucket name in the backend
+        """
+        super().__init__(
+            rate_limit=rate_limit,
+            burst=burst,
+            adaptive=adaptive,
+            starvation_timeout=starvation_timeout,
+            backend=backend,
+            name=name
+        )
+        self.window_padding = window_padding
+
+        # policy key -> {(rule, period): window}
+        self._policies: Dict[str, Dict[Tuple[str, int], _RateWindow]] = {}
+        # policy key -> monotonic time the server restriction ends
+        self._policy_blocked_until: Dict[str, float] = {}
+        # policy key -> policy name reported by the server
+        self._policy_names: Dict[str, str] = {}
+
+    def knows_policy(self, policy: str) -> bool:
+        return bool(self._policies.get(policy))
+
+    def _slot_key(self, policy: Optional[str]) -> Any:
+        # Known policies are paced by their own rule windows
+        if policy and self.knows_policy(policy):
+            return policy
+        return None
+
+    def _next_slot(self, key: Any, now: float) -> float:
+        """Earliest time a request under policy key fits every rule window"""
+        if key is None:
+            return super()._next_slot(key, now)
+        send_at = max(now, self._policy_blocked_until.get(key, 0.0))
+        for window in self._policies.get(key, {}).values():
+            window.prune(now)
+            send_at = max(send_at, window.next_free(now, self.window_padding))
+        return send_at
+
+    def _reserve(self, key: Any, send_at: float):
+        if key is None:
+            super()._reserve(key, send_at)
+            return
+        for window in self._policies.get(key, {}).values():
+            bisect.insort(window.hits, send_at)
+
+    def update_from_headers(self, headers: Mapping[str, str], policy: Optional[str] = None):
+        """
+        Learn the rule windows and current state of a policy from a response
+
+        Args:
+            headers: Response headers
+            policy: Policy key the request was acquired under; defaults to
+                the X-Rate-Limit-Policy name
+        """
+        headers = _lower_headers(headers)
+        server_policy = headers.get("x-rate-limit-policy")
+        policy = policy or server_policy
+        rules = headers.get("x-rate-limit-rules")
+        now = time.monotonic()
+
+        if policy and rules:
+            if server_policy:
+                self._policy_names[policy] = server_policy
+            windows = self._policies.setdefault(policy, {})
+            seen = set()
+            restricted_for = 0
+            for rule in (r.strip().lower() for r in rules.split(",") if r.strip()):
+                limits = _parse_rule_triples(headers.get(f"x-rate-limit-{rule}", ""))
+                state = {
+                    period: (hits, restricted)
+                    for hits, period, restricted in _parse_rule_triples(
+                        headers.get(f"x-rate-limit-{rule}-state", "")
+                    )
+                }
+                for max_hits, period, _ in limits:
+                    window = windows.get((rule, period))
+                    if window is None:
+                        window = windows[(rule, period)] = _RateWindow(max_hits, period)
+                    window.max_hits = max_hits
+                    seen.add((rule, period))
+
+                    server_hits, restricted = state.get(period, (0, 0))
+                    restricted_for = max(restricted_for, restricted)
+                    # Requests we didn't see (other processes, other tools
+                    # on this IP) count as sent just now
+                    window.prune(now)
+                    for _ in range(server_hits - len(window.hits)):
+                        bisect.insort(window.hits, now)
+
+            for key in set(windows) - seen:
+                del windows[key]
+
+            if restricted_for:
+                logger.warning(f"Rate limit policy {policy} restricted for {restricted_for}s")
+                self._block_policy(policy, now + restricted_for)
+
+        retry_after = _parse_retry_after(headers)
+        if retry_after:
+            if policy and self.knows_policy(policy):
+                self._block_policy(policy, now + retry_after)
+            else:
+                self._block(retry_after)
+
+    def _block_policy(self, policy: str, until: float):
+        self._policy_blocked_until[policy] = max(
+            self._policy_blocked_until.get(policy, 0.0), until
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get rate limiter statistics, including the learned policies"""
+        stats: Dict[str, Any] = super().get_statistics()
+        now = time.monotonic()
+        policies = {}
+        for policy, windows in self._policies.items():
+            for window in windows.values():
+                window.prune(now)
+            policies[policy] = {
+                "name": self._policy_names.get(policy, policy),
+                "rules": {
+                    f"{rule}:{period}s": f"{len(window.hits)}/{window.max_hits}"
+                    for (rule, period), window in windows.items()
+                },
+                "restricted_for": max(
+                    0.0, round(self._policy_blocked_until.get(policy, 0.0) - now, 1)
+                ),
+            }
+        stats["policies"] = policies
+        return stats
+
+    def reset(self):
+        """Reset the rate limiter and forget learned policies"""
+        super().reset()
+        self._policies.clear()
+        self._policy_blocked_until.clear()
+        self._policy_names.clear()
 
 
 class MultiRateLimiter:
     """
-    Manages multiple rate limiters for different API endpoints
+    Registry of rate limiters, one per upstream API
+
+    Limits come from the `api:` section of config.yaml. Each entry's
+    base_url host is mapped to its limiter, so every client hitting the
+    same host shares one budget while independent upstreams (poe.ninja,
+    pathofexile.com, poe2db.tw) run in parallel at their own rates.
+    Hosts not in the config get their own limiter at default_rate_limit.
+
+    Config entry keys: base_url, rate_limit (per minute), burst and
+    rate_limit_headers (use HeaderRateLimiter for servers that publish
+    X-Rate-Limit-* headers).
+
+    Pass a backend (see rate_limit_backend) to share every limiter's
+    budget and backoff with other server processes.
     """
 
-    def __init__(self) -> None:
+    # Used for upstreams missing from config.yaml (mirrors its defaults)
+    DEFAULT_ENDPOINTS: Dict[str, Dict[str, Any]] = {
+        "poe_official": {
+            "base_url": "https://www.pathofexile.com/api",
+            "rate_limit": 10,
+            "rate_limit_headers": True,
+        },
+        "poe2db": {"base_url": "https://poe2db.tw", "rate_limit": 30},
+        "poe_ninja": {"base_url": "https://poe.ninja/api/data", "rate_limit": 20},
+    }
+
+    def __init__(
+        self,
+        endpoints: Optional[Dict[str, Dict[str, Any]]] = None,
+        default_rate_limit: int = 10,
+        backend: Optional[RateLimitBackend] = None
+    ) -> None:
+        """
+        Args:
+            endpoints: Endpoint name -> config entry (see class docstring)
+            default_rate_limit: Requests per minute for unknown endpoints/hosts
+            backend: Shared cross-process state; None limits in-process only
+        """
         self.limiters: Dict[str, RateLimiter] = {}
+        self.endpoints: Dict[str, Dict[str, Any]] = dict(endpoints or {})
+        self.default_rate_limit = default_rate_limit
+        self.backend = backend
+
+        # host -> endpoint name
+        self._hosts: Dict[str, str] = {}
+        for name, endpoint in self.endpoints.items():
+            host = urlparse(endpoint.get("base_url", "")).hostname
+            if host:
+                self._hosts.setdefault(host, name)
+
+    @classmethod
+    def from_config(
+        cls,
+        api_config: Optional[Dict[str, Any]] = None,
+        backend: Optional[RateLimitBackend] = None
+    ) -> "MultiRateLimiter":
+        """
+        Build the registry from config.yaml's `api:` section
 
-    def get_limiter(self, endpoint: str, rate_limit: int = 10) -> RateLimiter:
-        """Get or create a rate limiter for an endpoint"""
+        Args:
+            api_config: Parsed `api:` section; defaults to the loaded config.yaml
+            backend: Shared cross-process state for every limiter
+        """
+        if api_config is None:
+            try:
+                from ..config import yaml_config
+            except ImportError:
+                from src.config import yaml_config
+            api_config = (yaml_config or {}).get("api") or {}
+
+        endpoints = {name: dict(entry) for name, entry in cls.DEFAULT_ENDPOINTS.items()}
+        for name, entry in api_config.items():
+            if isinstance(entry, dict):
+                endpoints.setdefault(name, {}).update(entry)
+        return cls(endpoints, backend=backend)
+
+    def get_limiter(self, endpoint: str, rate_limit: Optional[int] = None) -> RateLimiter:
+        """Get or create the rate limiter for an endpoint name or host"""
         if endpoint not in self.limiters:
-            self.limiters[endpoint] = RateLimiter(rate_limit=rate_limit)
+            config = self.endpoints.get(endpoint, {})
+            limiter_class = (
+                HeaderRateLimiter if config.get("rate_limit_headers") else RateLimiter
+            )
+            self.limiters[endpoint] = limiter_class(
+                rate_limit=rate_limit or config.get("rate_limit") or self.default_rate_limit,
+                burst=config.get("burst", 3),
+                backend=self.backend,
+                name=endpoint
+            )
         return self.limiters[endpoint]
 
-    async def acquire(self, endpoint: str, rate_limit: int = 10):
+    def for_url(self, url: str) -> RateLimiter:
+        """Get the rate limiter for the host a URL points at"""
+        host = urlparse(url).hostname or url
+        return self.get_limiter(self._hosts.get(host, host))
+
+    async def acquire(
+        self,
+        endpoint: str,
+        rate_limit: Optional[int] = None,
+        priority: Optional[str] = None
+    ):
         """Acquire a token for the specified endpoint"""
         limiter = self.get_limiter(endpoint, rate_limit)
-        await limiter.acquire()
+        await limiter.acquire(priority=priority)
 
     def record_success(self, endpoint: str):
         """Record success for an endpoint"""
@@ -150,7 +714,14 @@ class MultiRateLimiter:
         if endpoint in self.limiters:
             self.limiters[endpoint].record_failure()
 
-    def get_statistics(self) -> Dict[str, Dict[str, float]]:
+    async def close(self):
+        """Flush pending shared-state writes and close the backend"""
+        for limiter in self.limiters.values():
+            await limiter.close()
+        if self.backend is not None:
+            await self.backend.close()
+
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics for all rate limiters"""
         return {
             endpoint: limiter.get_statistics()
@@ -6,18 +6,23 @@ Enhanced with gear evaluation for intelligent upgrade recommendations.
 """
 
 import httpx
-import asyncio
+import hashlib
+import json
 import logging
 from typing import Dict, List, Optional, Any
 
 try:
     from ..config import settings
-    from .rate_limiter import RateLimiter
+    from .rate_limiter import HeaderRateLimiter, RateLimiter
     from .cache_manager import CacheManager
+    from .http_client import HTTPClientFactory
+    from .circuit_breaker import CircuitBreakerRegistry
 except ImportError:
     from src.config import settings
-    from src.api.rate_limiter import RateLimiter
+    from src.api.rate_limiter import HeaderRateLimiter, RateLimiter
     from src.api.cache_manager import CacheManager
+    from src.api.http_client import HTTPClientFactory
+    from src.api.circuit_breaker import CircuitBreakerRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -28,15 +33,30 @@ class TradeAPI:
     Searches for items on the trade market
     """
 
+    # Seconds to keep search results cached
+    SEARCH_CACHE_TTL = 60
+
+    # Rate limiter policy keys; search and fetch are limited separately
+    SEARCH_POLICY = "trade-search"
+    FETCH_POLICY = "trade-fetch"
+
+    # Circuit breaker source for trade2 search and fetch
+    CIRCUIT = "trade"
+
     def __init__(
         self,
         cache_manager: Optional[CacheManager] = None,
         rate_limiter: Optional[RateLimiter] = None,
-        poesessid: Optional[str] = None
+        poesessid: Optional[str] = None,
+        http_clients: Optional[HTTPClientFactory] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None
     ):
         self.base_url = "https://www.pathofexile.com"
         self.cache_manager = cache_manager
-        self.rate_limiter = rate_limiter or RateLimiter(rate_limit=2)  # Very conservative for trade API
+        # Paced by the X-Rate-Limit-* headers once the first response is in;
+        # very conservative until then
+        self.rate_limiter = rate_limiter or HeaderRateLimiter(rate_limit=2)
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry()
 
         # Use provided poesessid, or fall back to config
         self.poesessid = poesessid or settings.POESESSID
@@ -48,7 +68,12 @@ class TradeAPI:
                 "Or see .env.example for manual cookie extraction instructions."
             )
 
-        self.client = httpx.AsyncClient(
+        # Shared pooled client; a private factory when none is passed
+        self._owns_http_clients = http_clients is None
+        self.http_clients = http_clients or HTTPClientFactory()
+        # Own profile: the XHR headers and session cookie are trade-only
+        self.client = self.http_clients.get_client(
+            "trade",
             timeout=30.0,
             follow_redirects=True,
             headers={
@@ -85,51 +110,72 @@ class TradeAPI:
         Returns:
             List of item listings with pricing and details
         """
-        try:
-            await self.rate_limiter.acquire()
+        # Build search query
+        query = self._build_search_query(filters)
+        query_hash = hashlib.sha1(
+            json.dumps(query, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        cache_key = f"trade:search:{league}:{limit}:{query_hash}"
+
+        async def load() -> List[Dict[str, Any]]:
+            breaker = self.circuit_breakers.get(self.CIRCUIT)
+            if breaker.is_open:
+                # Don't queue for a rate limit slot just to fail fast
+                logger.warning(f"Trade API unavailable, skipping search (retry in {breaker.retry_in():.0f}s)")
+                return []
 
-            # Build search query
-            query = self._build_search_query(filters)
+            try:
+                await self.rate_limiter.acquire(self.SEARCH_POLICY)
 
-            # Perform search - Note: /api/trade2/search/poe2/{league}
-            search_url = f"{self.base_url}/api/trade2/search/poe2/{league}"
+                # Perform search - Note: /api/trade2/search/poe2/{league}
+                search_url = f"{self.base_url}/api/trade2/search/poe2/{league}"
 
-            # Add referer header for this specific request
-            headers = {"Referer": f"{self.base_url}/trade2/search/poe2/{league}"}
+                # Add referer header for this specific request
+                headers = {"Referer": f"{self.base_url}/trade2/search/poe2/{league}"}
 
-            logger.info(f"Searching trade market in {league}")
-            logger.debug(f"Query: {query}")
+                logger.info(f"Searching trade market in {league}")
+                logger.debug(f"Query: {query}")
 
-            response = await self.client.post(search_url, json=query, headers=headers)
-            response.raise_for_status()
+                response = await breaker.request(
+                    lambda: self.client.post(search_url, json=query, headers=headers)
+                )
+                self.rate_limiter.update_from_headers(response.headers, self.SEARCH_POLICY)
+                response.raise_for_status()
 
-            search_result = response.json()
-            result_ids = search_result.get("result", [])[:limit]
-            query_id = search_result.get("id")  # Get query ID for fetching
+                search_result = response.json()
+                result_ids = search_result.get("result", [])[:limit]
+                query_id = search_result.get("id")  # Get query ID for fetching
 
-            if not result_ids:
-                logger.info("No items found matching criteria")
-                return []
+                if not result_ids:
+                    logger.info("No items found matching criteria")
+                    return []
 
-            logger.info(f"Found {len(result_ids)} items, fetching details...")
+                logger.info(f"Found {len(result_ids)} items, fetching details...")
 
-            # Fetch item details
-            await asyncio.sleep(0.5)  # Rate limiting between requests
-            items = await self._fetch_item_details(result_ids, query_id)
+                # Fetch item details
+                items = await self._fetch_item_details(result_ids, query_id)
 
-            return items
+                return items
 
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Trade API HTTP error: {e.response.status_code} - {e.response.text}")
-            return []
-        except Exception as e:
-            logger.error(f"Trade API error: {e}")
-            return []
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Trade API HTTP error: {e.response.status_code} - {e.response.text}")
+                return []
+            except Exception as e:
+                logger.error(f"Trade API error: {e}")
+                return []
+
+        # Identical concurrent searches share one request; listings go stale
+        # quickly, so results are only kept briefly
+        if self.cache_manager:
+            return await self.cache_manager.get_or_compute(
+                cache_key, load, ttl=self.SEARCH_CACHE_TTL, tags=[f"league:{league}"]
+            )
+        return await load()
 
     async def _fetch_item_details(self, item_ids: List[str], query_id: str = None) -> List[Dict[str, Any]]:
         """Fetch full details for items by their IDs"""
         try:
-            await self.rate_limiter.acquire()
+            await self.rate_limiter.acquire(self.FETCH_POLICY)
 
             # Join IDs with commas
             id_string = ",".join(item_ids[:10])  # Max 10 at a time
@@ -141,7 +187,10 @@ class TradeAPI:
             if query_id:
                 fetch_url += f"?query={query_id}"
 
-            response = await self.client.get(fetch_url)
+            response = await self.circuit_breakers.get(self.CIRCUIT).request(
+                lambda: self.client.get(fetch_url)
+            )
+            self.rate_limiter.update_from_headers(response.headers, self.FETCH_POLICY)
             response.raise_for_status()
 
             data = response.json()
@@ -267,8 +316,9 @@ class TradeAPI:
         return stat_filters
 
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """Close the HTTP client if this instance created its own factory"""
+        if self._owns_http_clients:
+            await self.http_clients.close()
 
     async def search_for_upgrades(
         self,
@@ -55,11 +55,45 @@ class Settings(BaseSettings):
     POE_OFFICIAL_API: str = Field(default="https://www.pathofexile.com")
     TRADE_API_URL: str = Field(default="https://www.pathofexile.com/trade2/search/poe2")
     REQUEST_TIMEOUT: int = Field(default=30)
+    HTTP2_ENABLED: bool = Field(default=True)  # used when the h2 package is installed
+    HTTP_MAX_CONNECTIONS: int = Field(default=20)  # per shared client
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=10)  # idle connections kept per client
+    HTTP_KEEPALIVE_EXPIRY: float = Field(default=30.0)  # seconds an idle connection is kept
+    HTTP_REVALIDATE_TTL: int = Field(default=86400)  # seconds pages + ETags are kept for conditional requests
 
     # Rate Limiting
     POE_API_RATE_LIMIT: int = Field(default=10)
+    RATE_LIMIT_BACKEND: str = Field(default="memory")  # memory, sqlite or redis (shared across processes)
+    RATE_LIMIT_DB_PATH: str = Field(default=str(CACHE_DIR / "rate_limits.db"))  # sqlite backend file
     ENABLE_CACHING: bool = Field(default=False)
     CACHE_TTL: int = Field(default=3600)
+    CACHE_MEMORY_MAX_BYTES: int = Field(default=64 * 1024 * 1024)  # L1 budget
+    CACHE_STALE_TTL: int = Field(default=3600)  # serve-stale window after soft TTL
+    CACHE_NEGATIVE_TTL: int = Field(default=300)  # remember "not found" this long
+    CACHE_SERIALIZER: str = Field(default="msgpack")  # msgpack or orjson
+    CACHE_COMPRESSION: Optional[str] = Field(default="zlib")  # zlib, zstd or empty
+    CACHE_COMPRESS_THRESHOLD: int = Field(default=1024)  # bytes
+    CACHE_SQLITE_MAX_BYTES: int = Field(default=512 * 1024 * 1024)  # cache.db cap, 0 = unlimited
+    CACHE_SWEEP_INTERVAL: int = Field(default=300)  # seconds between maintenance sweeps, 0 = off
+    CACHE_WARMUP_ENTRIES: int = Field(default=500)  # L3 entries preloaded into L1 at startup, 0 = off
+    CACHE_WARMUP_SECONDS: float = Field(default=2.0)  # time budget for the warm-up
+    CACHE_WARMUP_ORDER: str = Field(default="recent")  # recent or frequent (most-read entries first)
+
+    # Circuit breakers (per upstream source)
+    CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5)  # consecutive failures that open a breaker
+    CIRCUIT_RECOVERY_TIMEOUT: float = Field(default=30.0)  # seconds before an open breaker is probed
+    CIRCUIT_SLOW_CALL_SECONDS: float = Field(default=10.0)  # slower calls count as failures
+
+    # Character lookups
+    CHARACTER_HEDGE_DELAY: float = Field(default=0.0)  # seconds before racing the next source, 0 = sequential
+    CHARACTER_FETCH_DEADLINE: float = Field(default=45.0)  # cap on one lookup across all sources, 0 = none
+    CHARACTER_BATCH_CONCURRENCY: int = Field(default=4)  # lookups in flight at once in get_characters()
+    TOP_PLAYER_SEARCH_DEADLINE: float = Field(default=60.0)  # cap on a similar-top-player search, 0 = none
+    LADDER_MAX_DEPTH: int = Field(default=1000)  # deepest ladder rank crawled (pages of 200)
+    LADDER_CRAWL_CONCURRENCY: int = Field(default=3)  # ladder pages fetched at once (rate limiter still applies)
+    LADDER_SNAPSHOT_ENABLED: bool = Field(default=True)  # answer ladder queries from a local snapshot
+    LADDER_SNAPSHOT_DB_PATH: str = Field(default=str(CACHE_DIR / "ladder_snapshots.db"))  # snapshot file
+    LADDER_SNAPSHOT_TTL: int = Field(default=900)  # seconds before a league's snapshot is refreshed
 
     # Feature Flags
     ENABLE_TRADE_INTEGRATION: bool = Field(default=True)
@@ -103,6 +137,7 @@ class Settings(BaseSettings):
     MAX_WORKERS: int = Field(default=4)
     REQUEST_TIMEOUT: int = Field(default=30)
     CALCULATION_TIMEOUT: int = Field(default=10)
+    HTML_PARSE_WORKERS: int = Field(default=2)  # threads parsing scraped pages off the event loop
 
     # Monitoring
     SENTRY_DSN: Optional[str] = Field(default=None)
@@ -24,8 +24,13 @@ try:
     from .config import settings
     from .database.manager import DatabaseManager
     from .api.poe_api import PoEAPIClient
-    from .api.rate_limiter import RateLimiter
-    from .api.cache_manager import CacheManager
+    from .api.rate_limiter import MultiRateLimiter, request_priority
+    from .api.rate_limit_backend import create_rate_limit_backend
+    from .api.http_client import HTTPClientFactory
+    from .api.circuit_breaker import CircuitBreakerRegistry
+    from .api.ladder_snapshot import LadderSnapshotStore
+    from .api.html_parsing import shutdown_parse_pool
+    from .api.cache_manager import CacheManager, NAMESPACES
     from .api.character_fetcher import CharacterFetcher
     from .api.trade_api import TradeAPI
     from .calculator.build_scorer import BuildScorer
@@ -54,8 +59,13 @@ except ImportError:
     from src.config import settings
     from src.database.manager import DatabaseManager
     from src.api.poe_api import PoEAPIClient
-    from src.api.rate_limiter import RateLimiter
-    from src.api.cache_manager import CacheManager
+    from src.api.rate_limiter import MultiRateLimiter, request_priority
+    from src.api.rate_limit_backend import create_rate_limit_backend
+    from src.api.http_client import HTTPClientFactory
+    from src.api.circuit_breaker import CircuitBreakerRegistry
+    from src.api.ladder_snapshot import LadderSnapshotStore
+    from src.api.html_parsing import shutdown_parse_pool
+    from src.api.cache_manager import CacheManager, NAMESPACES
     from src.api.character_fetcher import CharacterFetcher
     from src.api.trade_api import TradeAPI
     from src.calculator.build_scorer import BuildScorer
@@ -115,7 +125,10 @@ class PoE2BuildOptimizerMCP:
         self.db_manager: Optional[DatabaseManager] = None
         self.poe_api: Optional[PoEAPIClient] = None
         self.cache_manager: Optional[CacheManager] = None
-        self.rate_limiter: Optional[RateLimiter] = None
+        self.rate_limiters: Optional[MultiRateLimiter] = None
+        self.http_clients: Optional[HTTPClientFactory] = None
+        self.circuit_breakers: Optional[CircuitBreakerRegistry] = None
+        self.ladder_snapshots: Optional[LadderSnapshotStore] = None
         self.char_fetcher: Optional[CharacterFetcher] = None
         self.trade_api: Optional[TradeAPI] = None
 
@@ -178,21 +191,53 @@ class PoE2BuildOptimizerMCP:
             logger.info("Cache manager initialized")
             debug_log("Cache manager initialization complete")
 
-            # Initialize rate limiter
-            self.rate_limiter = RateLimiter()
-            logger.info("Rate limiter initialized")
+            # Initialize rate limiters: one per upstream host, limits from
+            # config.yaml, so poe.ninja and pathofexile.com don't share a budget.
+            # A shared backend makes several server processes share them too.
+            rate_limit_backend = create_rate_limit_backend(
+                settings.RATE_LIMIT_BACKEND,
+                sqlite_path=settings.RATE_LIMIT_DB_PATH,
+                redis_client=self.cache_manager.redis_client
+            )
+            self.rate_limiters = MultiRateLimiter.from_config(backend=rate_limit_backend)
+            official_limiter = self.rate_limiters.for_url(settings.POE_OFFICIAL_API)
+            logger.info(
+                "Rate limiters initialized"
+                + (f" (shared via {settings.RATE_LIMIT_BACKEND})" if rate_limit_backend else "")
+            )
+
+            # One pooled client per profile, shared by every API client and
+            # closed in cleanup()
+            self.http_clients = HTTPClientFactory()
+            logger.info(
+                f"HTTP client factory initialized "
+                f"({'HTTP/2' if self.http_clients.http2 else 'HTTP/1.1'})"
+            )
+
+            # One circuit breaker per upstream source, shared so every client
+            # skips a source that is down
+            self.circuit_breakers = CircuitBreakerRegistry()
+
+            # Local copy of each league's ladder top, shared by the ladder
+            # queries of the character and top player fetchers
+            if settings.LADDER_SNAPSHOT_ENABLED:
+                self.ladder_snapshots = LadderSnapshotStore(settings.LADDER_SNAPSHOT_DB_PATH)
 
             # Initialize API client
             self.poe_api = PoEAPIClient(
                 cache_manager=self.cache_manager,
-                rate_limiter=self.rate_limiter
+                rate_limiter=official_limiter,
+                http_clients=self.http_clients
             )
             logger.info("PoE API client initialized")
 
             # Initialize character fetcher
             self.char_fetcher = CharacterFetcher(
                 cache_manager=self.cache_manager,
-                rate_limiter=self.rate_limiter
+                rate_limiters=self.rate_limiters,
+                http_clients=self.http_clients,
+                circuit_breakers=self.circuit_breakers,
+                ladder_snapshots=self.ladder_snapshots
             )
             logger.info("Character fetcher initialized")
 
@@ -200,7 +245,9 @@ class PoE2BuildOptimizerMCP:
             if settings.ENABLE_TRADE_INTEGRATION:
                 self.trade_api = TradeAPI(
                     cache_manager=self.cache_manager,
-                    rate_limiter=self.rate_limiter
+                    rate_limiter=official_limiter,
+                    http_clients=self.http_clients,
+                    circuit_breakers=self.circuit_breakers
                 )
                 logger.info("Trade API initialized")
 
@@ -214,7 +261,10 @@ class PoE2BuildOptimizerMCP:
             # Initialize comparison system
             self.top_player_fetcher = TopPlayerFetcher(
                 cache_manager=self.cache_manager,
-                rate_limiter=self.rate_limiter
+                rate_limiters=self.rate_limiters,
+                http_clients=self.http_clients,
+                circuit_breakers=self.circuit_breakers,
+                ladder_snapshots=self.ladder_snapshots
             )
             self.comparator = CharacterComparator()
             logger.info("Comparison system initialized")
@@ -264,8 +314,21 @@ class PoE2BuildOptimizerMCP:
         try:
             logger.info("Cleaning up server resources...")
 
-            if self.trade_api:
-                await self.trade_api.close()
+            # Cancels their background ladder snapshot refreshes
+            for fetcher in (self.char_fetcher, self.top_player_fetcher):
+                if fetcher:
+                    await fetcher.close()
+
+            # Closes the connections of every API client created above
+            if self.http_clients:
+                await self.http_clients.close()
+
+            # Before the cache, whose Redis client a shared backend may use
+            if self.rate_limiters:
+                await self.rate_limiters.close()
+
+            if self.ladder_snapshots:
+                await self.ladder_snapshots.close()
 
             if self.cache_manager:
                 await self.cache_manager.close()
@@ -273,6 +336,8 @@ class PoE2BuildOptimizerMCP:
             if self.db_manager:
                 await self.db_manager.close()
 
+            shutdown_parse_pool()
+
             logger.info("Server cleanup complete")
 
         except Exception as e:
@@ -898,10 +963,24 @@ class PoE2BuildOptimizerMCP:
                 ),
                 types.Tool(
                     name="clear_cache",
-                    description="Clear all cached character data (in-memory, SQLite, Redis). Use this when character data seems stale or after code updates.",
+                    description="Clear cached data (in-memory, SQLite, Redis). With no arguments everything is cleared; pass namespace, tag and/or prefix to drop only matching entries (e.g. one stale character) and keep ladder and price data. Use this when data seems stale or after code updates.",
                     inputSchema={
                         "type": "object",
-                        "properties": {}
+                        "properties": {
+                            "namespace": {
+                                "type": "string",
+                                "enum": list(NAMESPACES),
+                                "description": "Only clear this kind of data"
+                            },
+                            "tag": {
+                                "type": "string",
+                                "description": "Only clear entries with this tag, e.g. 'account:Tomawar40-2671' or 'league:Standard'"
+                            },
+                            "prefix": {
+                                "type": "string",
+                                "description": "Only clear keys starting with this prefix, e.g. 'character:poeninja:Tomawar40-2671:'"
+                            }
+                        }
                     }
                 ),
                 types.Tool(
@@ -920,7 +999,6 @@ class PoE2BuildOptimizerMCP:
                 )
             ]
 
-        @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: dict) -> List[types.TextContent]:
             """Handle tool calls"""
             debug_log(f"Tool called: {name}")
@@ -995,6 +1073,14 @@ class PoE2BuildOptimizerMCP:
                     text=f"Error: {str(e)}"
                 )]
 
+        @self.server.call_tool()
+        async def handle_interactive_call_tool(name: str, arguments: dict) -> List[types.TextContent]:
+            """Handle tool calls in the interactive priority lane"""
+            # Tool calls are user-facing: their upstream requests are served
+            # ahead of background crawls and cache refreshes
+            with request_priority("interactive"):
+                return await handle_call_tool(name, arguments)
+
     def _register_resources(self):
         """Register MCP resources"""
 
@@ -2274,7 +2360,8 @@ Consider:
                         test_char = await self.char_fetcher.get_character(
                             account_name="Tomawar40-2671",
                             character_name="DoesFireWorkGoodNow",
-                            league="Abyss"
+                            league="Abyss",
+                            use_negative_cache=False
                         )
 
                         if test_char:
@@ -2321,7 +2408,107 @@ Consider:
                 response += "✗ Character fetcher NOT initialized\n"
                 issues.append("Character fetcher not initialized")
 
-            # Check 5: MCP Tool Handlers
+            # Check 5: Cache Status
+            response += "\n## Cache Status\n\n"
+            if self.cache_manager:
+                try:
+                    metrics = self.cache_manager.get_metrics()
+                    response += "| Tier | Hits | Misses | Hit Ratio | Sets | Evictions | Get p50/p95 (ms) |\n"
+                    response += "|------|------|--------|-----------|------|-----------|------------------|\n"
+                    for tier, counters in metrics["tiers"].items():
+                        get_latency = counters.get("get_latency", {})
+                        response += (
+                            f"| {tier.upper()} | {counters['hits']:,} | {counters['misses']:,} "
+                            f"| {counters['hit_ratio']:.1%} | {counters['sets']:,} "
+                            f"| {counters['evictions']:,} "
+                            f"| {get_latency.get('p50_ms', 0)} / {get_latency.get('p95_ms', 0)} |\n"
+                        )
+
+                    serialization = metrics["serialization"]
+                    response += (
+                        f"\nSerialization ({serialization['serializer']}, "
+                        f"{serialization['compression'] or 'no compression'}): "
+                        f"encode p95 {serialization['encode_latency']['p95_ms']} ms, "
+                        f"decode p95 {serialization['decode_latency']['p95_ms']} ms, "
+                        f"compression ratio {serialization['compression_ratio']}\n"
+                    )
+                    successes.append("Cache operational")
+
+                    if verbose and metrics["namespaces"]:
+                        response += "\n### Cache by Namespace\n\n"
+                        response += "| Namespace | Tier | Hits | Misses | Hit Ratio | Sets | Evictions |\n"
+                        response += "|-----------|------|------|--------|-----------|------|-----------|\n"
+                        for namespace, tiers in sorted(metrics["namespaces"].items()):
+                            for tier, counters in sorted(tiers.items()):
+                                response += (
+                                    f"| {namespace} | {tier.upper()} | {counters['hits']:,} "
+                                    f"| {counters['misses']:,} | {counters['hit_ratio']:.1%} "
+                                    f"| {counters['sets']:,} | {counters['evictions']:,} |\n"
+                                )
+
+                        response += "\n### Cache Latency\n\n"
+                        for tier, counters in metrics["tiers"].items():
+                            for name, latency in counters.items():
+                                if name.endswith("_latency") and latency["count"]:
+                                    response += (
+                                        f"- {tier.upper()} {name[:-len('_latency')]}: "
+                                        f"n={latency['count']:,}, avg {latency['avg_ms']} ms, "
+                                        f"p50 {latency['p50_ms']} ms, p95 {latency['p95_ms']} ms, "
+                                        f"p99 {latency['p99_ms']} ms, max {latency['max_ms']} ms\n"
+                                    )
+                except Exception as e:
+                    response += f"⚠ Cache metrics unavailable: {str(e)}\n"
+                    warnings.append(f"Cache metrics error: {e}")
+            else:
+                response += "⚠ Cache manager NOT initialized\n"
+                warnings.append("Cache manager not initialized")
+
+            # Check 6: Rate Limiters
+            response += "\n## Rate Limiters\n\n"
+            if self.rate_limiters:
+                limiter_stats = self.rate_limiters.get_statistics()
+                if not limiter_stats:
+                    response += "No upstream requests yet\n"
+                for endpoint, stats in limiter_stats.items():
+                    response += (
+                        f"**{endpoint}**: {stats['total_requests']:,} requests, "
+                        f"backoff {stats['current_backoff']}x\n"
+                    )
+                    for lane, lane_stats in stats["lanes"].items():
+                        if lane_stats["served"] or lane_stats["queued"]:
+                            response += (
+                                f"- {lane}: {lane_stats['queued']} queued, "
+                                f"{lane_stats['served']:,} served, "
+                                f"avg wait {lane_stats['average_wait_time']:.2f}s, "
+                                f"max wait {lane_stats['max_wait_time']:.2f}s\n"
+                            )
+            else:
+                response += "⚠ Rate limiters NOT initialized\n"
+                warnings.append("Rate limiters not initialized")
+
+            # Check 7: Circuit Breakers
+            response += "\n## Circuit Breakers\n\n"
+            if self.circuit_breakers:
+                breaker_stats = self.circuit_breakers.get_statistics()
+                if not breaker_stats:
+                    response += "No upstream requests yet\n"
+                for source, stats in sorted(breaker_stats.items()):
+                    symbol = {"closed": "✓", "half_open": "⚠"}.get(stats["state"], "✗")
+                    response += (
+                        f"{symbol} **{source}**: {stats['state']}, "
+                        f"{stats['success_rate']:.0%} success, p50 {stats['p50_ms']:.0f}ms"
+                    )
+                    if stats["state"] != "closed":
+                        response += f", retry in {stats['retry_in']:.0f}s"
+                        warnings.append(f"{source} circuit {stats['state']}: {stats['last_error']}")
+                    response += "\n"
+                    if verbose and stats["last_error"]:
+                        response += f"  - Last error: {stats['last_error']}\n"
+            else:
+                response += "⚠ Circuit breakers NOT initialized\n"
+                warnings.append("Circuit breakers not initialized")
+
+            # Check 8: MCP Tool Handlers
             response += "\n## MCP Tool Handlers\n\n"
             required_handlers = [
                 "_handle_analyze_character",
@@ -2400,7 +2587,13 @@ Consider:
             )]
 
     async def _handle_clear_cache(self, args: dict) -> List[types.TextContent]:
-        """Clear all caches (in-memory, SQLite, Redis)"""
+        """Clear all caches (in-memory, SQLite, Redis), or only matching entries"""
+        namespace = args.get("namespace")
+        tag = args.get("tag")
+        prefix = args.get("prefix")
+        if namespace or tag or prefix:
+            return await self._handle_invalidate_cache(namespace, tag, prefix)
+
         try:
             response = "# Cache Clear Operation\n\n"
             cleared = []
@@ -2478,6 +2671,45 @@ Consider:
                 text=f"Cache clear failed with error: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
             )]
 
+    async def _handle_invalidate_cache(
+        self,
+        namespace: Optional[str],
+        tag: Optional[str],
+        prefix: Optional[str]
+    ) -> List[types.TextContent]:
+        """Drop cache entries matching the given selectors from every tier"""
+        if not self.cache_manager:
+            return [types.TextContent(type="text", text="⚠ Cache manager not initialized")]
+
+        if namespace and namespace not in NAMESPACES:
+            return [types.TextContent(
+                type="text",
+                text=f"Error: unknown namespace '{namespace}'. Valid: {', '.join(NAMESPACES)}"
+            )]
+
+        try:
+            removed = await self.cache_manager.invalidate(
+                namespace=namespace, tag=tag, prefix=prefix
+            )
+        except Exception as e:
+            logger.error(f"Cache invalidation failed: {e}", exc_info=True)
+            return [types.TextContent(type="text", text=f"Cache invalidation failed: {str(e)}")]
+
+        selectors = ", ".join(
+            f"{name}=`{value}`"
+            for name, value in (("namespace", namespace), ("tag", tag), ("prefix", prefix))
+            if value
+        )
+        response = "# Cache Invalidation\n\n"
+        response += f"**Selectors:** {selectors}\n\n"
+        response += f"✓ L1 (Memory): {removed['l1']} items\n"
+        if self.cache_manager.redis_client:
+            response += f"✓ L2 (Redis): {removed['l2']} items\n"
+        response += f"✓ L3 (SQLite): {removed['l3']} items\n"
+        response += "\nAll other cached data was kept.\n"
+
+        return [types.TextContent(type="text", text=response)]
+
     # NEW ENHANCEMENT FEATURE HANDLERS
 
     async def _handle_find_best_supports(self, args: dict) -> List[types.TextContent]:
@@ -2992,6 +3224,9 @@ Consider:
         stat_comp = comparison.get("stat_comparison", {})
         key_diffs = comparison.get("key_differences", [])
         recommendations = comparison.get("recommendations", [])
+        partial_note = "" if comparison.get("complete", True) else (
+            "- **Note**: The search hit its time limit; fewer top players than requested were compared\n"
+        )
 
         response = f"""# Comparison to Top Players: {user_char.get('name', 'Unknown')}
 
@@ -3000,7 +3235,7 @@ Consider:
 - **Players Analyzed**: {pool.get('count', 0)} top players
 - **Average Level**: {pool.get('avg_level', 0):.0f}
 - **Level Range**: {pool.get('level_range', (0, 0))[0]} - {pool.get('level_range', (0, 0))[1]}
-
+{partial_note}
 ## ⚠️ Critical Differences
 {self._format_list(key_diffs[:5])}
 
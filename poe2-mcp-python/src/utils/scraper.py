@@ -3,20 +3,21 @@ Web Scraper for PoE2 Game Data
 Scrapes item data, skill gems, and passive tree information from poe2db.tw and other sources
 """
 
-import httpx
-import json
 import re
 import logging
 from typing import Dict, List, Optional, Any
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 try:
     from ..config import settings
     from ..api.rate_limiter import RateLimiter
+    from ..api.http_client import HTTPClientFactory
+    from ..api.html_parsing import extract_embedded_json, make_soup, run_parser
 except ImportError:
     from src.config import settings
     from src.api.rate_limiter import RateLimiter
+    from src.api.http_client import HTTPClientFactory
+    from src.api.html_parsing import extract_embedded_json, make_soup, run_parser
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +28,18 @@ class PoE2DataScraper:
     Primary source: poe2db.tw
     """
 
-    def __init__(self, rate_limiter: Optional[RateLimiter] = None) -> None:
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        http_clients: Optional[HTTPClientFactory] = None
+    ) -> None:
         self.base_url = settings.POE2DB_BASE_URL
         self.rate_limiter = rate_limiter or RateLimiter(rate_limit=30)
-        self.client = httpx.AsyncClient(
+        # Shared pooled client; a private factory when none is passed
+        self._owns_http_clients = http_clients is None
+        self.http_clients = http_clients or HTTPClientFactory()
+        self.client = self.http_clients.get_client(
+            "poe2db",
             timeout=30.0,
             follow_redirects=True,
             headers={
@@ -51,7 +60,6 @@ class PoE2DataScraper:
             List of unique item dictionaries
         """
         logger.info("Scraping unique items from poe2db.tw")
-        items = []
 
         try:
             # poe2db.tw unique items URL
@@ -63,36 +71,43 @@ class PoE2DataScraper:
                 logger.error(f"Failed to fetch unique items: {response.status_code}")
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            items = await run_parser(self._parse_unique_items_page, response.text, limit)
 
-            # Find item tables
-            tables = soup.find_all('table', class_=['item', 'wikitable'])
+            logger.info(f"Scraped {len(items)} unique items")
+            return items
 
-            for table in tables:
-                rows = table.find_all('tr')[1:]  # Skip header
+        except Exception as e:
+            logger.error(f"Error scraping unique items: {e}")
+            return []
 
-                for row in rows:
-                    try:
-                        item = self._parse_item_row(row)
-                        if item:
-                            items.append(item)
+    def _parse_unique_items_page(self, html: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Unique item rows of a poe2db.tw page (runs off the event loop)"""
+        items = []
+        soup = make_soup(html)
 
-                            if limit and len(items) >= limit:
-                                break
+        # Find item tables
+        tables = soup.find_all('table', class_=['item', 'wikitable'])
 
-                    except Exception as e:
-                        logger.debug(f"Failed to parse item row: {e}")
-                        continue
+        for table in tables:
+            rows = table.find_all('tr')[1:]  # Skip header
 
-                if limit and len(items) >= limit:
-                    break
+            for row in rows:
+                try:
+                    item = self._parse_item_row(row)
+                    if item:
+                        items.append(item)
 
-            logger.info(f"Scraped {len(items)} unique items")
-            return items
+                        if limit and len(items) >= limit:
+                            break
 
-        except Exception as e:
-            logger.error(f"Error scraping unique items: {e}")
-            return []
+                except Exception as e:
+                    logger.debug(f"Failed to parse item row: {e}")
+                    continue
+
+            if limit and len(items) >= limit:
+                break
+
+        return items
 
     def _parse_item_row(self, row) -> Optional[Dict[str, Any]]:
         """Parse a single item row from table"""
@@ -171,7 +186,6 @@ class PoE2DataScraper:
             List of skill gem dictionaries
         """
         logger.info("Scraping skill gems from poe2db.tw")
-        skills = []
 
         try:
             url = f"{self.base_url}/us/Skill_Gems"
@@ -182,22 +196,7 @@ class PoE2DataScraper:
                 logger.error(f"Failed to fetch skill gems: {response.status_code}")
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Find skill gem tables
-            tables = soup.find_all('table')
-
-            for table in tables:
-                rows = table.find_all('tr')[1:]  # Skip header
-
-                for row in rows:
-                    try:
-                        skill = self._parse_skill_row(row)
-                        if skill:
-                            skills.append(skill)
-                    except Exception as e:
-                        logger.debug(f"Failed to parse skill row: {e}")
-                        continue
+            skills = await run_parser(self._parse_gems_page, response.text, "Active")
 
             logger.info(f"Scraped {len(skills)} skill gems")
             return skills
@@ -206,6 +205,27 @@ class PoE2DataScraper:
             logger.error(f"Error scraping skill gems: {e}")
             return []
 
+    def _parse_gems_page(self, html: str, gem_type: str) -> List[Dict[str, Any]]:
+        """Gem rows of a poe2db.tw skill or support gem page (runs off the event loop)"""
+        gems = []
+        soup = make_soup(html)
+
+        # Find gem tables
+        for table in soup.find_all('table'):
+            rows = table.find_all('tr')[1:]  # Skip header
+
+            for row in rows:
+                try:
+                    gem = self._parse_skill_row(row)
+                    if gem:
+                        gem["gem_type"] = gem_type
+                        gems.append(gem)
+                except Exception as e:
+                    logger.debug(f"Failed to parse {gem_type.lower()} gem row: {e}")
+                    continue
+
+        return gems
+
     def _parse_skill_row(self, row) -> Optional[Dict[str, Any]]:
         """Parse a single skill gem row"""
         try:
@@ -248,7 +268,6 @@ class PoE2DataScraper:
             List of support gem dictionaries
         """
         logger.info("Scraping support gems from poe2db.tw")
-        supports = []
 
         try:
             url = f"{self.base_url}/us/Support_Gems"
@@ -259,21 +278,7 @@ class PoE2DataScraper:
                 logger.error(f"Failed to fetch support gems: {response.status_code}")
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            tables = soup.find_all('table')
-
-            for table in tables:
-                rows = table.find_all('tr')[1:]
-
-                for row in rows:
-                    try:
-                        support = self._parse_skill_row(row)
-                        if support:
-                            support["gem_type"] = "Support"
-                            supports.append(support)
-                    except Exception as e:
-                        logger.debug(f"Failed to parse support row: {e}")
-                        continue
+            supports = await run_parser(self._parse_gems_page, response.text, "Support")
 
             logger.info(f"Scraped {len(supports)} support gems")
             return supports
@@ -300,21 +305,13 @@ class PoE2DataScraper:
                 logger.error(f"Failed to fetch passive tree: {response.status_code}")
                 return None
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Look for embedded passive tree JSON data
-            scripts = soup.find_all('script')
-            for script in scripts:
-                if script.string and 'passiveSkillTree' in script.string:
-                    try:
-                        # Extract JSON data
-                        json_match = re.search(r'passiveSkillTree\s*=\s*({.*?});', script.string, re.DOTALL)
-                        if json_match:
-                            tree_data = json.loads(json_match.group(1))
-                            logger.info("Successfully extracted passive tree data")
-                            return tree_data
-                    except json.JSONDecodeError:
-                        continue
+            # The tree is embedded as a script assignment; no DOM needed
+            tree_data = await run_parser(
+                extract_embedded_json, response.text, r'passiveSkillTree\s*='
+            )
+            if isinstance(tree_data, dict):
+                logger.info("Successfully extracted passive tree data")
+                return tree_data
 
             logger.warning("Could not find passive tree JSON data")
             return None
@@ -346,20 +343,9 @@ class PoE2DataScraper:
 
                 response = await self.client.get(url)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    tables = soup.find_all('table')
-
-                    for table in tables:
-                        rows = table.find_all('tr')[1:]
-
-                        for row in rows:
-                            try:
-                                item = self._parse_base_item_row(row, category)
-                                if item:
-                                    base_items.append(item)
-                            except Exception as e:
-                                logger.debug(f"Failed to parse base item: {e}")
-                                continue
+                    base_items.extend(
+                        await run_parser(self._parse_base_items_page, response.text, category)
+                    )
 
             except Exception as e:
                 logger.error(f"Error scraping {category}: {e}")
@@ -368,6 +354,23 @@ class PoE2DataScraper:
         logger.info(f"Scraped {len(base_items)} base items")
         return base_items
 
+    def _parse_base_items_page(self, html: str, category: str) -> List[Dict[str, Any]]:
+        """Base item rows of a poe2db.tw category page (runs off the event loop)"""
+        base_items = []
+        for table in make_soup(html).find_all('table'):
+            rows = table.find_all('tr')[1:]
+
+            for row in rows:
+                try:
+                    item = self._parse_base_item_row(row, category)
+                    if item:
+                        base_items.append(item)
+                except Exception as e:
+                    logger.debug(f"Failed to parse base item: {e}")
+                    continue
+
+        return base_items
+
     def _parse_base_item_row(self, row, category: str) -> Optional[Dict[str, Any]]:
         """Parse a single base item row"""
         try:
@@ -405,8 +408,9 @@ class PoE2DataScraper:
             return None
 
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """Close the HTTP client if this instance created its own factory"""
+        if self._owns_http_clients:
+            await self.http_clients.close()
 
     async def __aenter__(self):
         return self
@@ -0,0 +1,973 @@
+"""
+Unit tests for the multi-tier CacheManager
+
+Covers the value codec, the L1 memory tier and the SQLite-backed L3 tier.
+Redis (L2) is optional and not exercised here.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from src.api.cache_codec import CacheCodec, CacheCodecError
+from src.api.cache_manager import CacheManager, MemoryCache
+from src.api.cache_metrics import CacheMetrics, LatencyHistogram
+
+
+# Suppress logging during tests
+logging.disable(logging.CRITICAL)
+
+
+class TestCacheCodec(unittest.TestCase):
+    """Test the versioned value codec."""
+
+    CHARACTER = {
+        "name": "Exile",
+        "level": 92,
+        "items": [{"slot": "Weapon", "mods": ["+1 to Level of all Skills"] * 20}] * 10,
+        "fetched_at": datetime(2025, 1, 1, 12, 0),
+    }
+
+    def test_roundtrip_msgpack(self):
+        codec = CacheCodec(serializer="msgpack")
+        self.assertEqual(codec.decode(codec.encode(self.CHARACTER)), self.CHARACTER)
+
+    def test_roundtrip_orjson(self):
+        codec = CacheCodec(serializer="orjson")
+        value = {"name": "Exile", "level": 92, "tags": ["a", "b"]}
+        self.assertEqual(codec.decode(codec.encode(value)), value)
+
+    def test_large_values_are_compressed(self):
+        codec = CacheCodec(compress_threshold=256)
+        blob, raw_size = codec.encode_with_size(self.CHARACTER)
+
+        self.assertLess(len(blob), raw_size)
+        self.assertGreater(codec.get_statistics()["compression_ratio"], 1.0)
+
+    def test_small_values_are_not_compressed(self):
+        codec = CacheCodec(compress_threshold=1024)
+        blob, raw_size = codec.encode_with_size({"level": 1})
+        self.assertEqual(len(blob), raw_size + 2)
+
+    def test_blobs_decode_regardless_of_reader_settings(self):
+        blob = CacheCodec(serializer="orjson", compress_threshold=0).encode(["x"] * 100)
+        self.assertEqual(CacheCodec(serializer="msgpack", compression=None).decode(blob), ["x"] * 100)
+
+    def test_unknown_format_is_rejected(self):
+        codec = CacheCodec()
+        with self.assertRaises(CacheCodecError):
+            codec.decode(b"\x80\x04legacy pickle")
+        with self.assertRaises(CacheCodecError):
+            codec.encode(object())
+
+
+class TestMemoryCache(unittest.TestCase):
+    """Test the L1 LRU + TTL tier."""
+
+    def test_get_and_set(self):
+        cache = MemoryCache(max_bytes=1000)
+        cache.set("a", {"x": 1}, ttl=60, size=10)
+
+        self.assertEqual(cache.get("a"), {"x": 1})
+        self.assertIsNone(cache.get("missing"))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_bytes=30)
+        cache.set("a", 1, ttl=60, size=10)
+        cache.set("b", 2, ttl=60, size=10)
+        cache.set("c", 3, ttl=60, size=10)
+
+        # Touch "a" so "b" becomes the least recently used
+        cache.get("a")
+        cache.set("d", 4, ttl=60, size=10)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertIn("d", cache)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_byte_budget_evicts_many_small_for_one_large(self):
+        cache = MemoryCache(max_bytes=100)
+        for i in range(10):
+            cache.set(f"small{i}", i, ttl=60, size=10)
+
+        cache.set("large", "x", ttl=60, size=60)
+
+        self.assertIn("large", cache)
+        self.assertLessEqual(cache.current_bytes, 100)
+        self.assertEqual(len(cache), 5)
+        self.assertEqual(cache.evictions, 6)
+
+    def test_oversized_value_is_not_cached(self):
+        cache = MemoryCache(max_bytes=50)
+        cache.set("a", 1, ttl=60, size=10)
+        cache.set("huge", 2, ttl=60, size=500)
+
+        self.assertNotIn("huge", cache)
+        self.assertIn("a", cache)
+
+    def test_expired_entries_are_misses(self):
+        cache = MemoryCache(max_bytes=1000)
+        with mock.patch("src.api.cache_manager.time.monotonic", return_value=100.0):
+            cache.set("a", 1, ttl=5, size=10)
+
+        with mock.patch("src.api.cache_manager.time.monotonic", return_value=106.0):
+            self.assertIsNone(cache.get("a"))
+
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(cache.current_bytes, 0)
+
+    def test_purge_expired_prefers_expired_over_lru(self):
+        cache = MemoryCache(max_bytes=30)
+        with mock.patch("src.api.cache_manager.time.monotonic", return_value=100.0):
+            cache.set("short", 1, ttl=1, size=10)
+            cache.set("long1", 2, ttl=60, size=10)
+            cache.set("long2", 3, ttl=60, size=10)
+
+        with mock.patch("src.api.cache_manager.time.monotonic", return_value=110.0):
+            cache.set("new", 4, ttl=60, size=10)
+            self.assertIn("long1", cache)
+            self.assertIn("long2", cache)
+            self.assertIn("new", cache)
+
+        self.assertEqual(cache.evictions, 0)
+        self.assertEqual(cache.expirations, 1)
+
+    def test_overwrite_updates_size(self):
+        cache = MemoryCache(max_bytes=100)
+        cache.set("a", 1, ttl=60, size=40)
+        cache.set("a", 2, ttl=60, size=10)
+
+        self.assertEqual(cache.current_bytes, 10)
+        self.assertEqual(cache.get("a"), 2)
+
+    def test_size_estimated_when_not_given(self):
+        cache = MemoryCache(max_bytes=1_000_000)
+        cache.set("a", {"items": ["x" * 100] * 10}, ttl=60)
+
+        self.assertGreater(cache.current_bytes, 1000)
+
+
+class TestCacheManager(unittest.IsolatedAsyncioTestCase):
+    """Test CacheManager against a temporary SQLite file."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(
+            memory_max_bytes=1024 * 1024,
+            sqlite_path=Path(self._tmpdir.name) / "cache.db"
+        )
+        await self.cache.initialize()
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    async def test_set_and_get_roundtrip(self):
+        await self.cache.set("character:a", {"name": "a", "level": 90}, ttl=60)
+        self.assertEqual(await self.cache.get("character:a"), {"name": "a", "level": 90})
+
+    async def test_l3_hit_promotes_to_l1(self):
+        await self.cache.set("character:a", {"level": 90}, ttl=60)
+        self.cache.memory_cache.clear()
+
+        self.assertEqual(await self.cache.get("character:a"), {"level": 90})
+        self.assertIn("character:a", self.cache.memory_cache)
+
+    async def test_delete_removes_from_all_tiers(self):
+        await self.cache.set("character:a", {"level": 90}, ttl=60)
+        await self.cache.delete("character:a")
+
+        self.assertIsNone(await self.cache.get("character:a"))
+
+    async def test_legacy_l3_rows_are_treated_as_misses(self):
+        await self.cache.sqlite_conn.execute(
+            "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            ("character:old", b"\x80\x04legacy", (datetime.now() + timedelta(hours=1)).isoformat())
+        )
+
+        self.assertIsNone(await self.cache.get("character:old"))
+        self.assertIsNone(self.cache._pending_writes["character:old"])
+
+    async def test_statistics_report_codec_counters(self):
+        await self.cache.set("character:a", {"level": 90}, ttl=60)
+
+        stats = await self.cache.get_statistics()
+        self.assertEqual(stats["codec_encodes"], 1)
+        self.assertIn("codec_compression_ratio", stats)
+        self.assertIn("codec_avg_decode_ms", stats)
+
+    async def test_statistics_report_l1_counters(self):
+        await self.cache.set("character:a", {"level": 90}, ttl=60)
+        await self.cache.get("character:a")
+        await self.cache.get("character:missing")
+
+        stats = await self.cache.get_statistics()
+        self.assertEqual(stats["l1_memory_items"], 1)
+        self.assertEqual(stats["l1_hits"], 1)
+        self.assertEqual(stats["l1_misses"], 1)
+        self.assertIn("l1_evictions", stats)
+        self.assertGreater(stats["l1_memory_bytes"], 0)
+
+
+class TestCacheWriteBehind(unittest.IsolatedAsyncioTestCase):
+    """Test batched L3 writes."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.sqlite_path = Path(self._tmpdir.name) / "cache.db"
+        self.cache = CacheManager(
+            sqlite_path=self.sqlite_path,
+            write_batch_size=1000,
+            write_flush_interval=60.0
+        )
+        await self.cache.initialize()
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    async def _count_rows(self) -> int:
+        async with self.cache.sqlite_conn.execute("SELECT COUNT(*) FROM cache") as cursor:
+            row = await cursor.fetchone()
+            return row[0]
+
+    async def test_uses_wal_journal(self):
+        async with self.cache.sqlite_conn.execute("PRAGMA journal_mode") as cursor:
+            row = await cursor.fetchone()
+        self.assertEqual(row[0].lower(), "wal")
+
+    async def test_writes_are_deferred_until_flush(self):
+        await self.cache.set("character:a", {"level": 1}, ttl=60)
+        await self.cache.set("character:b", {"level": 2}, ttl=60)
+
+        self.assertEqual(await self._count_rows(), 0)
+
+        await self.cache.flush()
+        self.assertEqual(await self._count_rows(), 2)
+        self.assertEqual(self.cache.l3_flushes, 1)
+
+    async def test_pending_writes_are_readable(self):
+        await self.cache.set("character:a", {"level": 1}, ttl=60)
+        self.cache.memory_cache.clear()
+
+        self.assertEqual(await self.cache.get("character:a"), {"level": 1})
+
+    async def test_set_then_delete_merges_to_delete(self):
+        await self.cache.set("character:a", {"level": 1}, ttl=60)
+        await self.cache.flush()
+        await self.cache.set("character:a", {"level": 2}, ttl=60)
+        await self.cache.delete("character:a")
+
+        self.assertEqual(len(self.cache._pending_writes), 1)
+        self.assertIsNone(await self.cache.get("character:a"))
+
+        await self.cache.flush()
+        self.assertEqual(await self._count_rows(), 0)
+
+    async def test_full_batch_triggers_flush(self):
+        self.cache.write_batch_size = 5
+        for i in range(5):
+            await self.cache.set(f"ladder:{i}", i, ttl=60)
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(await self._count_rows(), 5)
+
+    async def test_clear_during_flush_drops_the_batch(self):
+        await self.cache.set("character:a", {"level": 1}, ttl=60)
+        self.cache.memory_cache.clear()
+
+        # Stand in for a flush that has taken the batch but not committed it
+        async with self.cache._write_lock:
+            self.cache._flushing_writes = self.cache._pending_writes
+            self.cache._pending_writes = {}
+            clearing = asyncio.create_task(self.cache.clear())
+            await asyncio.sleep(0)
+            self.assertIsNone(await self.cache.get("character:a"))
+            await self.cache.sqlite_conn.execute(
+                "INSERT INTO cache (key, value, expires_at, namespace) VALUES (?, ?, ?, ?)",
+                ("character:a", b"", time.time() + 60, "character")
+            )
+            await self.cache.sqlite_conn.commit()
+
+        await clearing
+        self.assertEqual(await self._count_rows(), 0)
+
+    async def test_close_flushes_pending_writes(self):
+        await self.cache.set("character:a", {"level": 1}, ttl=60)
+        await self.cache.close()
+
+        reopened = CacheManager(sqlite_path=self.sqlite_path)
+        await reopened.initialize()
+        try:
+            reopened.memory_cache.clear()
+            self.assertEqual(await reopened.get("character:a"), {"level": 1})
+        finally:
+            await reopened.close()
+
+
+class TestGetOrCompute(unittest.IsolatedAsyncioTestCase):
+    """Test single-flight loading."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(sqlite_path=Path(self._tmpdir.name) / "cache.db")
+        await self.cache.initialize()
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    async def test_concurrent_misses_share_one_loader(self):
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"name": "a"}
+
+        results = await asyncio.gather(*[
+            self.cache.get_or_compute("character:a", loader, ttl=60)
+            for _ in range(10)
+        ])
+
+        self.assertEqual(calls, 1)
+        self.assertTrue(all(r == {"name": "a"} for r in results))
+        self.assertEqual(self.cache.coalesced_requests, 9)
+        self.assertEqual(await self.cache.get("character:a"), {"name": "a"})
+
+    async def test_loader_error_reaches_every_waiter(self):
+        async def loader():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(*[
+            self.cache.get_or_compute("character:a", loader, ttl=60)
+            for _ in range(3)
+        ], return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertIsNone(await self.cache.get("character:a"))
+        self.assertEqual(self.cache._inflight, {})
+
+    async def test_falsy_results_are_not_cached(self):
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return []
+
+        self.assertEqual(await self.cache.get_or_compute("ladder:x", loader, ttl=60), [])
+        self.assertEqual(await self.cache.get_or_compute("ladder:x", loader, ttl=60), [])
+        self.assertEqual(calls, 2)
+
+    async def test_negative_ttl_remembers_misses(self):
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return None
+
+        for _ in range(3):
+            self.assertIsNone(await self.cache.get_or_compute(
+                "character:missing", loader, ttl=60, negative_ttl=30
+            ))
+        self.assertEqual(calls, 1)
+        self.assertEqual(self.cache.negative_hits, 2)
+
+    async def test_negative_entry_does_not_shadow_later_value(self):
+        await self.cache.set_negative("character:a", ttl=30)
+        await self.cache.set("character:a", {"name": "a"}, ttl=60)
+
+        async def loader():
+            raise AssertionError("loader should not run")
+
+        self.assertEqual(
+            await self.cache.get_or_compute("character:a", loader, ttl=60, negative_ttl=30),
+            {"name": "a"}
+        )
+
+    async def test_cancelled_waiter_does_not_cancel_load(self):
+        started = asyncio.Event()
+
+        async def loader():
+            started.set()
+            await asyncio.sleep(0.05)
+            return {"name": "a"}
+
+        first = asyncio.create_task(self.cache.get_or_compute("character:a", loader, ttl=60))
+        await started.wait()
+        second = asyncio.create_task(self.cache.get_or_compute("character:a", loader, ttl=60))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, {"name": "a"})
+
+    async def test_last_cancelled_waiter_cancels_load(self):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def loader():
+            started.set()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {"name": "a"}
+
+        waiters = [
+            asyncio.create_task(self.cache.get_or_compute("character:a", loader, ttl=60, negative_ttl=30))
+            for _ in range(2)
+        ]
+        await started.wait()
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        self.assertFalse(cancelled.is_set())
+
+        waiters[1].cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.gather(*waiters, return_exceptions=True)
+        self.assertEqual(self.cache._inflight, {})
+        self.assertFalse(await self.cache.is_negative("character:a"))
+
+
+class TestStaleWhileRevalidate(unittest.IsolatedAsyncioTestCase):
+    """Test soft TTLs and background refresh."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(
+            sqlite_path=Path(self._tmpdir.name) / "cache.db",
+            max_concurrent_refreshes=1
+        )
+        await self.cache.initialize()
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    def _set_stale(self, key, value):
+        self.cache.memory_cache.set(
+            key, value, ttl=60, refresh_at=datetime.now() - timedelta(seconds=1)
+        )
+
+    async def test_fresh_value_is_not_refreshed(self):
+        async def loader():
+            raise AssertionError("loader should not run")
+
+        await self.cache.set("character:a", {"v": 1}, ttl=60, soft_ttl=30)
+        self.assertEqual(
+            await self.cache.get_or_compute("character:a", loader, ttl=60, soft_ttl=30),
+            {"v": 1}
+        )
+        self.assertEqual(self.cache.stale_hits, 0)
+
+    async def test_stale_value_is_served_and_refreshed_once(self):
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"v": 2}
+
+        self._set_stale("character:a", {"v": 1})
+        results = await asyncio.gather(*[
+            self.cache.get_or_compute("character:a", loader, ttl=60, soft_ttl=30)
+            for _ in range(5)
+        ])
+
+        self.assertTrue(all(r == {"v": 1} for r in results))
+        await asyncio.sleep(0.05)
+        self.assertEqual(calls, 1)
+        self.assertEqual(self.cache.refreshes_scheduled, 1)
+        self.assertEqual(await self.cache.get("character:a"), {"v": 2})
+
+    async def test_failed_refresh_keeps_stale_value(self):
+        async def loader():
+            raise RuntimeError("upstream down")
+
+        self._set_stale("character:a", {"v": 1})
+        self.assertEqual(
+            await self.cache.get_or_compute("character:a", loader, ttl=60, soft_ttl=30),
+            {"v": 1}
+        )
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(self.cache.refresh_failures, 1)
+        self.assertEqual(await self.cache.get("character:a"), {"v": 1})
+        self.assertEqual(self.cache._inflight, {})
+
+    async def test_close_waits_for_cancelled_refreshes(self):
+        cancelled = asyncio.Event()
+
+        async def loader():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {"v": 2}
+
+        self._set_stale("character:a", {"v": 1})
+        await self.cache.get_or_compute("character:a", loader, ttl=60, soft_ttl=30)
+        await asyncio.sleep(0)
+        tasks = list(self.cache._inflight.values())
+
+        await self.cache.close()
+
+        self.assertTrue(cancelled.is_set())
+        self.assertTrue(all(task.done() for task in tasks))
+
+    async def test_refreshes_respect_concurrency_cap(self):
+        running = 0
+        peak = 0
+
+        async def loader():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"v": 2}
+
+        for i in range(4):
+            self._set_stale(f"character:{i}", {"v": 1})
+            await self.cache.get_or_compute(f"character:{i}", loader, ttl=60, soft_ttl=30)
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(peak, 1)
+        self.assertEqual(self.cache.refreshes_scheduled, 4)
+
+    async def test_soft_ttl_survives_l3_round_trip(self):
+        await self.cache.set("character:a", {"v": 1}, ttl=60, soft_ttl=30)
+        await self.cache.flush()
+        self.cache.memory_cache.clear()
+
+        value, refresh_at = await self.cache._get_entry("character:a")
+        self.assertEqual(value, {"v": 1})
+        self.assertIsNotNone(refresh_at)
+        self.assertGreater(refresh_at, datetime.now())
+
+
+class TestBatchOperations(unittest.IsolatedAsyncioTestCase):
+    """Test get_many/set_many."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(sqlite_path=Path(self._tmpdir.name) / "cache.db")
+        await self.cache.initialize()
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    async def test_set_many_then_get_many(self):
+        items = {f"ladder:char:Abyss:{i}": {"level": i} for i in range(20)}
+        await self.cache.set_many(items, ttl=60, tags=["league:Abyss"])
+
+        found = await self.cache.get_many(list(items) + ["ladder:char:Abyss:missing"])
+        self.assertEqual(found, items)
+
+    async def test_set_many_commits_in_one_flush(self):
+        items = {f"ladder:char:Abyss:{i}": {"level": i} for i in range(50)}
+        await self.cache.set_many(items, ttl=60)
+        await self.cache.flush()
+
+        self.assertEqual(self.cache.l3_flushes, 1)
+        self.assertEqual(self.cache.l3_rows_written, 50)
+
+    async def test_get_many_reads_l3_in_chunks(self):
+        self.cache.SQLITE_IN_CHUNK = 7
+        items = {f"ladder:char:Abyss:{i}": {"level": i} for i in range(30)}
+        await self.cache.set_many(items, ttl=60, tags=["league:Abyss"])
+        await self.cache.flush()
+        self.cache.memory_cache.clear()
+
+        found = await self.cache.get_many(items)
+        self.assertEqual(found, items)
+        # Promoted entries keep their tags
+        self.assertEqual(
+            len(self.cache.memory_cache.keys_matching(tag="league:abyss")), 30
+        )
+
+    async def test_get_many_skips_expired_and_deleted(self):
+        await self.cache.set_many({"ladder:a": 1, "ladder:b": 2}, ttl=60)
+        await self.cache.delete("ladder:a")
+        past = (datetime.now() - timedelta(seconds=1)).isoformat()
+        await self.cache.sqlite_conn.execute(
+            "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            ("ladder:c", CacheCodec().encode(3), past)
+        )
+
+        self.assertEqual(
+            await self.cache.get_many(["ladder:a", "ladder:b", "ladder:c"]),
+            {"ladder:b": 2}
+        )
+
+
+class TestWarmUp(unittest.IsolatedAsyncioTestCase):
+    """Test preloading L1 from SQLite at startup."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.sqlite_path = Path(self._tmpdir.name) / "cache.db"
+        cache = CacheManager(sqlite_path=self.sqlite_path, warmup_entries=0)
+        await cache.initialize()
+        for i in range(20):
+            await cache.set(f"ladder:char:Abyss:{i}", {"level": i}, ttl=600, tags=["league:Abyss"])
+        await cache.flush()
+        # Make 15..19 the most recently accessed
+        for i in range(15, 20):
+            await cache.get(f"ladder:char:Abyss:{i}")
+        await cache.close()
+
+    async def asyncTearDown(self):
+        self._tmpdir.cleanup()
+
+    async def test_initialize_preloads_most_recent_entries(self):
+        cache = CacheManager(sqlite_path=self.sqlite_path, warmup_entries=5)
+        await cache.initialize()
+        try:
+            await cache._warmup_task
+            self.assertEqual(len(cache.memory_cache), 5)
+            for i in range(15, 20):
+                self.assertIn(f"ladder:char:Abyss:{i}", cache.memory_cache)
+
+            stats = await cache.get_statistics()
+            self.assertEqual(stats["warmup_loaded"], 5)
+            self.assertTrue(stats["warmup_complete"])
+            self.assertGreater(stats["warmup_bytes"], 0)
+        finally:
+            await cache.close()
+
+    async def test_warm_up_respects_time_budget(self):
+        cache = CacheManager(sqlite_path=self.sqlite_path, warmup_entries=0)
+        await cache.initialize()
+        try:
+            result = await cache.warm_up(max_entries=100, time_budget=0)
+            self.assertEqual(result["loaded"], 0)
+            self.assertFalse(result["complete"])
+        finally:
+            await cache.close()
+
+    async def test_frequent_order_prefers_most_read_entries(self):
+        cache = CacheManager(sqlite_path=self.sqlite_path, warmup_entries=0)
+        await cache.initialize()
+        for _ in range(3):
+            await cache.get("ladder:char:Abyss:3")
+        await cache.set("ladder:char:Abyss:3", {"level": 3}, ttl=600)
+        await cache.close()
+
+        cache = CacheManager(sqlite_path=self.sqlite_path, warmup_entries=0)
+        await cache.initialize()
+        try:
+            result = await cache.warm_up(max_entries=1, order="frequent")
+            self.assertEqual(result["loaded"], 1)
+            self.assertIn("ladder:char:Abyss:3", cache.memory_cache)
+        finally:
+            await cache.close()
+
+    async def test_warm_up_pages_by_keyset(self):
+        cache = CacheManager(sqlite_path=self.sqlite_path, warmup_entries=0)
+        cache.SQLITE_IN_CHUNK = 3
+        await cache.initialize()
+        try:
+            for order in ("recent", "frequent"):
+                cache.memory_cache.clear()
+                result = await cache.warm_up(max_entries=100, order=order)
+                self.assertEqual(result["loaded"], 20)
+        finally:
+            await cache.close()
+
+    async def test_warm_up_keeps_tags_and_skips_expired(self):
+        cache = CacheManager(sqlite_path=self.sqlite_path, warmup_entries=0)
+        await cache.initialize()
+        try:
+            past = (datetime.now() - timedelta(seconds=1)).isoformat()
+            await cache.sqlite_conn.execute(
+                "INSERT INTO cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                ("ladder:old", CacheCodec().encode(1), past, 1e12)
+            )
+            result = await cache.warm_up(max_entries=100)
+
+            self.assertEqual(result["loaded"], 20)
+            self.assertNotIn("ladder:old", cache.memory_cache)
+            self.assertEqual(len(cache.memory_cache.keys_matching(tag="league:abyss")), 20)
+        finally:
+            await cache.close()
+
+
+class TestInvalidate(unittest.IsolatedAsyncioTestCase):
+    """Test namespace, tag and prefix invalidation."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(sqlite_path=Path(self._tmpdir.name) / "cache.db")
+        await self.cache.initialize()
+
+        await self.cache.set("character:ninja:acct:a", {"v": 1}, tags=["account:acct", "league:Abyss"])
+        await self.cache.set("character:ninja:other:b", {"v": 2}, tags=["account:other", "league:Abyss"])
+        await self.cache.set("ladder:top:Abyss:100", [1, 2], tags=["league:Abyss"])
+        await self.cache.set("prices:ninja:Standard:UniqueWeapon", [3], tags=["league:Standard"])
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    async def _keys_left(self):
+        keys = []
+        for key in ("character:ninja:acct:a", "character:ninja:other:b",
+                    "ladder:top:Abyss:100", "prices:ninja:Standard:UniqueWeapon"):
+            self.cache.memory_cache.clear()
+            if await self.cache.get(key) is not None:
+                keys.append(key)
+        return keys
+
+    async def test_invalidate_namespace(self):
+        removed = await self.cache.invalidate(namespace="character")
+
+        self.assertEqual(removed["l1"], 2)
+        self.assertEqual(removed["l3"], 2)
+        self.assertEqual(
+            await self._keys_left(),
+            ["ladder:top:Abyss:100", "prices:ninja:Standard:UniqueWeapon"]
+        )
+
+    async def test_invalidate_tag_is_case_insensitive(self):
+        await self.cache.invalidate(tag="League:abyss")
+        self.assertEqual(await self._keys_left(), ["prices:ninja:Standard:UniqueWeapon"])
+
+    async def test_invalidate_namespace_and_tag(self):
+        await self.cache.invalidate(namespace="character", tag="account:acct")
+        self.assertEqual(
+            await self._keys_left(),
+            ["character:ninja:other:b", "ladder:top:Abyss:100",
+             "prices:ninja:Standard:UniqueWeapon"]
+        )
+
+    async def test_invalidate_prefix(self):
+        await self.cache.invalidate(prefix="character:ninja:other:")
+        self.assertNotIn("character:ninja:other:b", await self._keys_left())
+        self.assertIn("character:ninja:acct:a", await self._keys_left())
+
+    async def test_invalidate_reaches_entries_promoted_without_tags(self):
+        await self.cache.flush()
+        self.cache.memory_cache.clear()
+        self.cache.memory_cache.set("character:ninja:acct:a", {"v": 1}, ttl=60)
+
+        await self.cache.invalidate(tag="account:acct")
+        self.assertNotIn("character:ninja:acct:a", self.cache.memory_cache)
+
+    async def test_l2_promotion_keeps_tags(self):
+        await self.cache.flush()
+        self.cache.memory_cache.clear()
+        redis = mock.AsyncMock()
+        redis.get.return_value = self.cache._pack_redis_value(
+            self.cache.codec.encode({"v": 1}), None
+        )
+        redis.mget.return_value = [redis.get.return_value]
+        self.cache.redis_client = redis
+        try:
+            await self.cache.get("character:ninja:acct:a")
+            await self.cache.get_many(["ladder:top:Abyss:100"])
+        finally:
+            self.cache.redis_client = None
+
+        self.assertEqual(
+            sorted(self.cache.memory_cache.keys_matching(tag="league:abyss")),
+            ["character:ninja:acct:a", "ladder:top:Abyss:100"]
+        )
+
+    async def test_tags_are_replaced_on_overwrite(self):
+        await self.cache.set("character:ninja:acct:a", {"v": 3}, tags=["league:Standard"])
+        await self.cache.invalidate(tag="account:acct")
+
+        self.assertIn("character:ninja:acct:a", await self._keys_left())
+
+    async def test_selector_required(self):
+        with self.assertRaises(ValueError):
+            await self.cache.invalidate()
+
+
+class TestMaintenance(unittest.IsolatedAsyncioTestCase):
+    """Test the expiry sweep, size cap and incremental vacuum."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(
+            sqlite_path=Path(self._tmpdir.name) / "cache.db",
+            sqlite_max_bytes=0,
+            sweep_interval=0
+        )
+        await self.cache.initialize()
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    async def _count_rows(self) -> int:
+        async with self.cache.sqlite_conn.execute("SELECT COUNT(*) FROM cache") as cursor:
+            return (await cursor.fetchone())[0]
+
+    async def test_expired_rows_are_swept_in_batches(self):
+        self.cache.SWEEP_BATCH_SIZE = 7
+        past = (datetime.now() - timedelta(seconds=1)).isoformat()
+        await self.cache.sqlite_conn.executemany(
+            "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            [(f"ladder:{i}", b"", past) for i in range(20)]
+        )
+        await self.cache.set("ladder:live", [1], ttl=60)
+
+        result = await self.cache.sweep()
+
+        self.assertEqual(result["expired"], 20)
+        self.assertEqual(await self._count_rows(), 1)
+        self.assertEqual(self.cache.swept_expired, 20)
+
+    async def test_size_cap_evicts_least_recently_accessed(self):
+        payload = os.urandom(4000)
+        for i in range(40):
+            await self.cache.set(f"character:{i}", {"blob": payload, "i": i}, ttl=600)
+        await self.cache.flush()
+
+        # Touch the first ten so they become the most recently accessed
+        self.cache.memory_cache.clear()
+        for i in range(10):
+            await self.cache.get(f"character:{i}")
+        await self.cache.flush()
+
+        usage = await self.cache.get_disk_usage()
+        self.cache.sqlite_max_bytes = usage["used_bytes"] * 3 // 4
+        evicted = await self.cache.enforce_size_cap()
+
+        self.assertGreater(evicted, 0)
+        usage = await self.cache.get_disk_usage()
+        self.assertLessEqual(usage["used_bytes"], self.cache.sqlite_max_bytes)
+        self.cache.memory_cache.clear()
+        for i in range(10):
+            self.assertIsNotNone(await self.cache.get(f"character:{i}"))
+
+    async def test_idle_sweep_vacuums_free_pages(self):
+        payload = os.urandom(4000)
+        for i in range(40):
+            await self.cache.set(f"character:{i}", {"blob": payload, "i": i}, ttl=600)
+        await self.cache.flush()
+        await self.cache.invalidate(namespace="character")
+
+        result = await self.cache.sweep()
+
+        self.assertGreater(result["vacuumed_pages"], 0)
+        self.assertEqual((await self.cache.get_disk_usage())["free_bytes"], 0)
+
+    async def test_statistics_report_sweep_metrics(self):
+        await self.cache.sweep()
+        stats = await self.cache.get_statistics()
+
+        self.assertEqual(stats["sweeps"], 1)
+        self.assertIn("l3_disk_bytes", stats)
+        self.assertIn("swept_evicted", stats)
+
+
+class TestCacheMetrics(unittest.IsolatedAsyncioTestCase):
+    """Test per-tier, per-namespace metrics."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(
+            sqlite_path=Path(self._tmpdir.name) / "cache.db",
+            sweep_interval=0,
+            warmup_entries=0
+        )
+        await self.cache.initialize()
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.observe(0.0002)
+        for _ in range(10):
+            histogram.observe(0.04)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 100)
+        self.assertEqual(snapshot["p50_ms"], 0.25)
+        self.assertEqual(snapshot["p95_ms"], 40.0)
+        self.assertAlmostEqual(snapshot["max_ms"], 40.0)
+
+    def test_snapshot_aggregates_namespaces(self):
+        metrics = CacheMetrics()
+        metrics.record("character", "l1", "hits", 3)
+        metrics.record("ladder", "l1", "misses")
+        metrics.record(None, "l3", "sets")
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["tiers"]["l1"]["hits"], 3)
+        self.assertEqual(snapshot["tiers"]["l1"]["hit_ratio"], 0.75)
+        self.assertEqual(snapshot["namespaces"]["other"]["l3"]["sets"], 1)
+
+    async def test_hits_and_misses_are_counted_per_tier(self):
+        await self.cache.set("character:acct:hero", {"level": 90}, ttl=60)
+        await self.cache.flush()
+        self.assertIsNotNone(await self.cache.get("character:acct:hero"))
+        self.cache.memory_cache.clear()
+        self.assertIsNotNone(await self.cache.get("character:acct:hero"))
+        self.assertIsNone(await self.cache.get("ladder:missing"))
+
+        metrics = self.cache.get_metrics()
+        character = metrics["namespaces"]["character"]
+        self.assertEqual(character["l1"], {
+            "hits": 1, "misses": 1, "sets": 1, "evictions": 0, "hit_ratio": 0.5
+        })
+        self.assertEqual(character["l3"]["hits"], 1)
+        self.assertEqual(character["l3"]["sets"], 1)
+        self.assertEqual(metrics["namespaces"]["ladder"]["l3"]["misses"], 1)
+        self.assertEqual(metrics["tiers"]["l1"]["get_latency"]["count"], 3)
+        self.assertEqual(metrics["tiers"]["l3"]["flush_latency"]["count"], 1)
+        self.assertGreater(metrics["serialization"]["encode_latency"]["count"], 0)
+        self.assertGreater(metrics["serialization"]["decode_latency"]["count"], 0)
+
+    async def test_get_many_counts_each_key(self):
+        await self.cache.set_many({"prices:a": 1, "prices:b": 2}, ttl=60)
+        await self.cache.get_many(["prices:a", "prices:b", "prices:c"])
+
+        prices = self.cache.get_metrics()["namespaces"]["prices"]
+        self.assertEqual(prices["l1"]["hits"], 2)
+        self.assertEqual(prices["l1"]["misses"], 1)
+        self.assertEqual(prices["l3"]["misses"], 1)
+
+    async def test_l1_evictions_are_attributed_to_namespace(self):
+        cache = CacheManager(
+            memory_max_bytes=1000,
+            sqlite_path=Path(self._tmpdir.name) / "small.db",
+            sweep_interval=0,
+            warmup_entries=0
+        )
+        try:
+            for i in range(5):
+                await cache.set(f"pob:{i}", "x" * 400, ttl=60)
+            evictions = cache.get_metrics()["namespaces"]["pob"]["l1"]["evictions"]
+            self.assertEqual(evictions, cache.memory_cache.evictions)
+            self.assertGreater(evictions, 0)
+        finally:
+            await cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,414 @@
+"""
+Unit tests for CharacterFetcher
+
+Upstream HTTP calls are mocked; the cache runs against a temporary SQLite file.
+"""
+
+import asyncio
+import tempfile
+import time
+import unittest
+import logging
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+from src.api.cache_manager import CacheManager
+from src.api.character_fetcher import CharacterFetcher
+from src.api.rate_limiter import RateLimiter
+
+
+# Suppress logging during tests
+logging.disable(logging.CRITICAL)
+
+
+def _not_found(url, *args, **kwargs):
+    return httpx.Response(404, request=httpx.Request("GET", url))
+
+
+class TestNegativeCaching(unittest.IsolatedAsyncioTestCase):
+    """A missing character should only run the fallback chain once."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(sqlite_path=Path(self._tmpdir.name) / "cache.db")
+        await self.cache.initialize()
+        self.fetcher = CharacterFetcher(
+            cache_manager=self.cache,
+            rate_limiter=RateLimiter(rate_limit=60000, burst=100),
+            official_rate_limiter=RateLimiter(rate_limit=60000, burst=100)
+        )
+        self.fetcher_get = mock.AsyncMock(side_effect=_not_found)
+        self.ninja_get = mock.AsyncMock(side_effect=_not_found)
+        self.fetcher.client.get = self.fetcher_get
+        self.fetcher.ninja_api.client.get = self.ninja_get
+
+    async def asyncTearDown(self):
+        await self.fetcher.close()
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    def _requests(self) -> int:
+        return self.fetcher_get.await_count + self.ninja_get.await_count
+
+    async def test_second_lookup_makes_no_requests(self):
+        self.assertIsNone(await self.fetcher.get_character("acct", "Missing", "Abyss"))
+        first = self._requests()
+        self.assertGreater(first, 1)
+
+        self.assertIsNone(await self.fetcher.get_character("acct", "Missing", "Abyss"))
+        self.assertEqual(self._requests(), first)
+        self.assertIn("not found", self.fetcher.last_error_message)
+
+    async def test_per_source_entries_survive_chain_invalidation(self):
+        await self.fetcher.get_character("acct", "Missing", "Abyss")
+        first = self._requests()
+
+        await self.cache.delete("character:chain:acct:Missing:Abyss#notfound")
+        await self.fetcher.get_character("acct", "Missing", "Abyss")
+        self.assertEqual(self._requests(), first)
+
+    async def test_negative_cache_can_be_bypassed(self):
+        await self.fetcher.get_character("acct", "Missing", "Abyss")
+        first = self._requests()
+
+        await self.fetcher.get_character("acct", "Missing", "Abyss", use_negative_cache=False)
+        self.assertEqual(self._requests(), 2 * first)
+
+    async def test_clearing_the_account_tag_drops_negative_entries(self):
+        await self.fetcher.get_character("acct", "Missing", "Abyss")
+        first = self._requests()
+
+        await self.cache.invalidate(tag="account:acct")
+        await self.fetcher.get_character("acct", "Missing", "Abyss")
+        self.assertGreater(self._requests(), first)
+
+    async def test_upstream_failures_are_not_remembered(self):
+        def unavailable(url, *args, **kwargs):
+            return httpx.Response(503, request=httpx.Request("GET", url))
+
+        def unreachable(url, *args, **kwargs):
+            raise httpx.ConnectError("connection refused", request=httpx.Request("GET", url))
+
+        for failure in (unavailable, unreachable):
+            self.fetcher_get.side_effect = failure
+            self.ninja_get.side_effect = failure
+
+            first = self._requests()
+            self.assertIsNone(await self.fetcher.get_character("acct", "Down", "Abyss"))
+            self.assertGreater(self._requests(), first)
+            self.assertIn("Source errors", self.fetcher.last_error_message)
+            self.assertIn("Try again shortly", self.fetcher.last_error_message)
+            self.assertFalse(await self.cache.is_negative("character:chain:acct:Down:Abyss"))
+            self.assertFalse(await self.cache.is_negative("character:poeninja:acct:Down"))
+
+        # Once upstream recovers the next lookup asks the sources again
+        self.fetcher_get.side_effect = _not_found
+        self.ninja_get.side_effect = _not_found
+        first = self._requests()
+        await self.fetcher.get_character("acct", "Down", "Abyss")
+        self.assertGreater(self._requests(), first)
+
+    async def test_league_tag_uses_the_api_league_name(self):
+        await self.fetcher.get_character("acct", "Missing", "Rise of the Abyssal")
+        first = self._requests()
+
+        await self.cache.invalidate(tag="league:Abyss")
+        await self.fetcher.get_character("acct", "Missing", "Rise of the Abyssal")
+        self.assertGreater(self._requests(), first)
+
+
+class TestHedgedFetch(unittest.IsolatedAsyncioTestCase):
+    """Slow sources are raced instead of waited out."""
+
+    CHARACTER = {"name": "Fast", "account": "acct", "level": 90}
+
+    async def asyncSetUp(self):
+        self.fetcher = CharacterFetcher(rate_limiter=RateLimiter(rate_limit=60000, burst=100))
+        self.started = []
+        self.cancelled = []
+
+    async def asyncTearDown(self):
+        await self.fetcher.close()
+
+    def source(self, name, delay, result=None):
+        async def load(*args, **kwargs):
+            self.started.append((name, time.monotonic()))
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            return result
+        return load
+
+    def use_sources(self, ninja, sse, ladder, scrape):
+        self.fetcher.ninja_api.get_character = ninja
+        self.fetcher.get_character_from_poe_ninja = sse
+        self.fetcher.get_character_from_ladder = ladder
+        self.fetcher._scrape_character_direct = scrape
+
+    async def test_slow_source_is_hedged(self):
+        self.use_sources(
+            self.source("ninja", 5),
+            self.source("sse", 0.01, self.CHARACTER),
+            self.source("ladder", 5),
+            self.source("scrape", 5),
+        )
+
+        started = time.monotonic()
+        result = await self.fetcher.get_character("acct", "Fast", hedge_delay=0.05, deadline=2)
+
+        self.assertEqual(result, self.CHARACTER)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual([name for name, _ in self.started], ["ninja", "sse"])
+        self.assertEqual(self.cancelled, ["ninja"])
+
+    async def test_empty_source_hands_over_at_once(self):
+        self.use_sources(
+            self.source("ninja", 0),
+            self.source("sse", 0),
+            self.source("ladder", 0, self.CHARACTER),
+            self.source("scrape", 0),
+        )
+
+        result = await self.fetcher.get_character("acct", "Fast", hedge_delay=0, deadline=0)
+
+        self.assertEqual(result, self.CHARACTER)
+        self.assertEqual([name for name, _ in self.started], ["ninja", "sse", "ladder"])
+
+    async def test_deadline_caps_the_lookup(self):
+        self.use_sources(*(self.source(name, 5) for name in ("ninja", "sse", "ladder", "scrape")))
+
+        started = time.monotonic()
+        result = await self.fetcher.get_character("acct", "Slow", hedge_delay=0.02, deadline=0.2)
+
+        self.assertIsNone(result)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertIn("Timed out", self.fetcher.last_error_message)
+        self.assertEqual(len(self.cancelled), 4)
+
+    async def test_hedge_loser_stops_its_cached_load(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        cache = CacheManager(sqlite_path=Path(tmpdir.name) / "cache.db")
+        await cache.initialize()
+        self.addAsyncCleanup(cache.close)
+        await self.fetcher.close()
+        self.fetcher = CharacterFetcher(
+            cache_manager=cache,
+            rate_limiter=RateLimiter(rate_limit=60000, burst=100)
+        )
+        # The real cached poe.ninja source, with a slow upstream call
+        self.fetcher.ninja_api._fetch_character_from_api = self.source("ninja", 5)
+        self.fetcher.get_character_from_poe_ninja = self.source("sse", 0.01, self.CHARACTER)
+
+        result = await self.fetcher.get_character("acct", "Fast", hedge_delay=0.05, deadline=2)
+
+        self.assertEqual(result, self.CHARACTER)
+        self.assertEqual(self.cancelled, ["ninja"])
+        self.assertEqual(cache._inflight, {})
+        self.assertFalse(await cache.is_negative(
+            self.fetcher.ninja_api.character_cache_key("acct", "Fast", "Standard")
+        ))
+
+    async def test_source_errors_stay_with_their_lookup(self):
+        async def broken(account, character, *args, **kwargs):
+            await asyncio.sleep(0)
+            if character == "Broken":
+                raise RuntimeError("upstream down")
+            return None
+
+        self.use_sources(broken, *(self.source(name, 0) for name in ("sse", "ladder", "scrape")))
+
+        failed, ok = await asyncio.gather(
+            self.fetcher._lookup_character("acct", "Broken", "Standard", hedge_delay=0, deadline=0),
+            self.fetcher._lookup_character("acct", "Fine", "Standard", hedge_delay=0, deadline=0),
+        )
+
+        self.assertIn("poe.ninja API error: upstream down", failed[1])
+        self.assertNotIn("error", ok[1])
+        self.assertEqual(self.fetcher.last_error_message, "")
+
+
+class TestBatchFetch(unittest.IsolatedAsyncioTestCase):
+    """get_characters() streams results with bounded concurrency."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CacheManager(sqlite_path=Path(self._tmpdir.name) / "cache.db")
+        await self.cache.initialize()
+        self.fetcher = CharacterFetcher(
+            cache_manager=self.cache,
+            rate_limiter=RateLimiter(rate_limit=60000, burst=100)
+        )
+        self.in_flight = 0
+        self.peak = 0
+        self.looked_up = []
+
+        async def lookup(account, character, league, **kwargs):
+            self.looked_up.append(character)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                await asyncio.sleep(0.05 if character != "Fast" else 0)
+            finally:
+                self.in_flight -= 1
+            if character == "Broken":
+                raise RuntimeError("boom")
+            if character.startswith("Missing"):
+                return None, f"Character '{character}' not found"
+            return {"name": character, "account": account, "level": 90}, ""
+
+        self.fetcher._lookup_character = lookup
+
+    async def asyncTearDown(self):
+        await self.fetcher.close()
+        await self.cache.close()
+        self._tmpdir.cleanup()
+
+    async def collect(self, requests, **kwargs):
+        return [result async for result in self.fetcher.get_characters(requests, **kwargs)]
+
+    async def test_concurrency_is_bounded(self):
+        requests = [("acct", f"Char{i}", "Abyss") for i in range(6)]
+        results = await self.collect(requests, concurrency=2)
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(self.peak, 2)
+        self.assertTrue(all(result.data and not result.error for result in results))
+
+    async def test_results_arrive_as_they_finish(self):
+        results = await self.collect([("acct", "Slow", "Abyss"), ("acct", "Fast", "Abyss")])
+        self.assertEqual([result.character for result in results], ["Fast", "Slow"])
+
+    async def test_cache_is_checked_in_bulk_first(self):
+        await self.cache.set(
+            self.fetcher.ninja_api.character_cache_key("acct", "Cached", "Abyss"),
+            {"name": "Cached", "level": 95}, ttl=60
+        )
+        await self.cache.set_negative("character:chain:acct:Gone:Abyss", ttl=60)
+
+        with mock.patch.object(self.cache, "get_many", wraps=self.cache.get_many) as get_many:
+            results = await self.collect(
+                [("acct", "Cached", "Abyss"), ("acct", "Gone", "Abyss"), ("acct", "New", "Abyss")]
+            )
+
+        get_many.assert_awaited_once()
+        self.assertEqual(self.looked_up, ["New"])
+        by_name = {result.character: result for result in results}
+        self.assertTrue(by_name["Cached"].cached)
+        self.assertEqual(by_name["Cached"].data["level"], 95)
+        self.assertIsNone(by_name["Gone"].data)
+        self.assertIn("not found", by_name["Gone"].error)
+
+    async def test_failures_are_reported_per_entry(self):
+        results = await self.collect([
+            ("acct", "Broken", "Abyss"), ("acct", "Missing", "Abyss"), ("acct", "Fine", "Abyss")
+        ])
+
+        by_name = {result.character: result for result in results}
+        self.assertIn("boom", by_name["Broken"].error)
+        self.assertIn("not found", by_name["Missing"].error)
+        self.assertEqual(by_name["Fine"].data["name"], "Fine")
+        self.assertEqual(self.fetcher.last_error_message, "")
+
+    async def test_leaving_early_cancels_the_rest(self):
+        requests = [("acct", f"Char{i}", "Abyss") for i in range(6)]
+        results = self.fetcher.get_characters(requests, concurrency=2)
+        async for _ in results:
+            break
+        await results.aclose()
+
+        self.assertEqual(self.in_flight, 0)
+        await asyncio.sleep(0.1)
+        self.assertLess(len(self.looked_up), 6)
+
+
+class TestLadderCrawl(unittest.IsolatedAsyncioTestCase):
+    """Ladder pages are fetched concurrently and streamed in order."""
+
+    async def asyncSetUp(self):
+        self.fetcher = CharacterFetcher(
+            rate_limiter=RateLimiter(rate_limit=60000, burst=100),
+            official_rate_limiter=RateLimiter(rate_limit=60000, burst=100)
+        )
+        self.addAsyncCleanup(self.fetcher.close)
+        self.requested = []
+        self.in_flight = 0
+        self.peak = 0
+        self.pages = 10  # full pages before the ladder ends
+
+        async def fetch_page(league, offset):
+            self.requested.append(offset)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                # Later pages answer first
+                await asyncio.sleep(0.05 if offset % 400 == 0 else 0.01)
+            finally:
+                self.in_flight -= 1
+            page = offset // 200
+            if page > self.pages:
+                return []
+            size = 200 if page < self.pages else 50
+            return [
+                {
+                    "rank": offset + i + 1,
+                    "account": {"name": f"acct{offset + i}"},
+                    "character": {
+                        "name": f"char{offset + i}",
+                        "level": 95,
+                        "class": "Titan" if (offset + i) % 500 == 0 else "Stormweaver",
+                    },
+                }
+                for i in range(size)
+            ]
+
+        self.fetcher._fetch_ladder_page = fetch_page
+
+    async def test_pages_stream_in_rank_order(self):
+        ranks = []
+        async for page in self.fetcher.crawl_ladder("Abyss", max_depth=5000, concurrency=3):
+            ranks.append(page[0]["rank"])
+
+        self.assertEqual(ranks, [offset + 1 for offset in range(0, 2001, 200)])
+        self.assertEqual(self.peak, 3)
+        # Nothing past the short page that ended the ladder
+        self.assertLessEqual(max(self.requested), 2400)
+
+    async def test_max_depth_and_start_rank(self):
+        offsets = []
+        async for page in self.fetcher.crawl_ladder("Abyss", max_depth=1000, start_rank=450):
+            offsets.append(page[0]["rank"] - 1)
+        self.assertEqual(offsets, [400, 600, 800])
+
+    async def test_refused_offset_ends_the_crawl(self):
+        async def refuse(league, offset):
+            if offset >= 400:
+                request = httpx.Request("GET", "https://www.pathofexile.com/api/ladders/Abyss")
+                raise httpx.HTTPStatusError(
+                    "bad offset", request=request, response=httpx.Response(400, request=request)
+                )
+            return [{"rank": offset + i + 1} for i in range(200)]
+
+        self.fetcher._fetch_ladder_page = refuse
+        pages = [page async for page in self.fetcher.crawl_ladder("Abyss", max_depth=5000)]
+        self.assertEqual(len(pages), 2)
+
+    async def test_filtered_query_reaches_past_1000_and_stops_early(self):
+        with mock.patch("src.api.character_fetcher.settings.LADDER_MAX_DEPTH", 5000):
+            titans = await self.fetcher.get_top_ladder_characters(
+                "Abyss", limit=3, class_filter="Titan"
+            )
+
+        self.assertEqual([entry["rank"] for entry in titans], [1, 501, 1001])
+        # Stopped at the page holding rank 1001 plus the pages already in flight
+        await asyncio.sleep(0.1)
+        self.assertLessEqual(max(self.requested), 1000 + 3 * 200)
+        self.assertEqual(self.in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+Unit tests for the per-source circuit breakers
+"""
+
+import tempfile
+import unittest
+import logging
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+from src.api.cache_manager import CacheManager
+from src.api.character_fetcher import CharacterFetcher
+from src.api.circuit_breaker import (
+    CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError
+)
+from src.api.rate_limiter import RateLimiter
+
+
+# Suppress logging during tests
+logging.disable(logging.CRITICAL)
+
+
+def _response(status: int) -> httpx.Response:
+    return httpx.Response(status, request=httpx.Request("GET", "https://poe.ninja/"))
+
+
+class TestCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+    """Test opening, probing and closing."""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch(
+            "src.api.circuit_breaker.time.monotonic", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(
+            "poe_ninja_api", failure_threshold=3, recovery_timeout=30, slow_call_seconds=5
+        )
+
+    async def test_opens_after_consecutive_failures(self):
+        send = mock.AsyncMock(return_value=_response(503))
+        for _ in range(3):
+            await self.breaker.request(send)
+        self.assertEqual(self.breaker.state, "open")
+
+        with self.assertRaises(CircuitOpenError):
+            await self.breaker.request(send)
+        self.assertEqual(send.await_count, 3)
+        self.assertEqual(self.breaker.get_statistics()["rejected_calls"], 1)
+
+    async def test_not_found_is_not_a_failure(self):
+        for status in (503, 503, 404, 503, 503):
+            await self.breaker.request(mock.AsyncMock(return_value=_response(status)))
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertAlmostEqual(self.breaker.success_rate, 0.2)
+
+    async def test_half_open_probe(self):
+        for _ in range(3):
+            self.breaker.record_failure(reason="HTTP 500")
+
+        self.now += 30
+        self.assertFalse(self.breaker.is_open)
+        self.assertTrue(self.breaker.allow())
+        # Only one probe at a time
+        self.assertFalse(self.breaker.allow())
+
+        # A failed probe opens the breaker for another interval
+        self.breaker.record_failure(reason="HTTP 500")
+        self.assertTrue(self.breaker.is_open)
+
+        self.now += 30
+        await self.breaker.request(mock.AsyncMock(return_value=_response(200)))
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_slow_calls_count_as_failures(self):
+        for _ in range(3):
+            self.breaker.record_success(seconds=6)
+        self.assertEqual(self.breaker.state, "open")
+        self.assertIn("slow", self.breaker.last_error)
+
+
+class TestSourceOrdering(unittest.IsolatedAsyncioTestCase):
+    """CharacterFetcher skips open sources and tries healthy ones first."""
+
+    CHARACTER = {"name": "Char", "account": "acct", "level": 90}
+
+    async def asyncSetUp(self):
+        self.breakers = CircuitBreakerRegistry(failure_threshold=2)
+        self.fetcher = CharacterFetcher(
+            rate_limiter=RateLimiter(rate_limit=60000, burst=100),
+            circuit_breakers=self.breakers
+        )
+        self.calls = []
+
+        def source(name, result=None):
+            async def load(*args, **kwargs):
+                self.calls.append(name)
+                return result
+            return load
+
+        self.fetcher.ninja_api.get_character = source("ninja")
+        self.fetcher.get_character_from_poe_ninja = source("sse")
+        self.fetcher.get_character_from_ladder = source("ladder", self.CHARACTER)
+        self.fetcher._scrape_character_direct = source("scrape")
+
+    async def asyncTearDown(self):
+        await self.fetcher.close()
+
+    async def test_open_source_is_skipped(self):
+        for _ in range(2):
+            self.breakers.get("poe_ninja_api").record_failure(reason="HTTP 500")
+
+        result = await self.fetcher.get_character("acct", "Char", hedge_delay=0)
+
+        self.assertEqual(result, self.CHARACTER)
+        self.assertEqual(self.calls, ["sse", "ladder"])
+
+    async def test_unhealthy_source_goes_last(self):
+        sse = self.breakers.get("poe_ninja_sse")
+        for _ in range(3):
+            sse.record_success(0.1)
+            sse.record_failure(reason="HTTP 500")
+
+        await self.fetcher.get_character("acct", "Char", hedge_delay=0)
+
+        self.assertEqual(self.calls, ["ninja", "ladder"])
+
+    async def test_skipped_sources_are_not_cached_as_missing(self):
+        self.fetcher.get_character_from_ladder = mock.AsyncMock(return_value=None)
+        for name in ("poe_ninja_api", "poe_ninja_sse"):
+            for _ in range(2):
+                self.breakers.get(name).record_failure(reason="down")
+
+        self.assertIsNone(await self.fetcher.get_character("acct", "Char", hedge_delay=0))
+        self.assertIn("unavailable sources skipped", self.fetcher.last_error_message)
+
+    async def test_circuit_opening_mid_lookup_counts_as_skipped(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        cache = CacheManager(sqlite_path=Path(tmpdir.name) / "cache.db")
+        await cache.initialize()
+        self.addAsyncCleanup(cache.close)
+        await self.fetcher.close()
+        self.fetcher = CharacterFetcher(
+            cache_manager=cache,
+            rate_limiter=RateLimiter(rate_limit=60000, burst=100),
+            circuit_breakers=self.breakers
+        )
+        self.fetcher.ninja_api.get_character = mock.AsyncMock(return_value=None)
+        self.fetcher.get_character_from_ladder = mock.AsyncMock(return_value=None)
+        self.fetcher._scrape_character_direct = mock.AsyncMock(return_value=None)
+
+        # The real poe.ninja profile loader; its breaker opens while it
+        # waits for the rate limiter, after the open check
+        async def acquire(*args, **kwargs):
+            for _ in range(2):
+                self.breakers.get("poe_ninja_sse").record_failure(reason="down")
+
+        self.fetcher.rate_limiter.acquire = acquire
+        self.fetcher.client.get = mock.AsyncMock(return_value=_response(200))
+
+        self.assertIsNone(await self.fetcher.get_character("acct", "Char", hedge_delay=0))
+        self.assertIn("skipped: poe.ninja SSE API", self.fetcher.last_error_message)
+        self.fetcher.client.get.assert_not_awaited()
+        self.assertFalse(await cache.is_negative("character:poeninja:acct:Char"))
+        self.assertFalse(await cache.is_negative("character:chain:acct:Char:Standard"))
+
+
+if __name__ == "__main__":
+    unittest.main()
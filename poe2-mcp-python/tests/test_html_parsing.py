@@ -0,0 +1,75 @@
+"""
+Unit tests for off-loop HTML parsing
+"""
+
+import json
+import threading
+import unittest
+import logging
+
+from src.api import html_parsing
+from src.api.html_parsing import extract_embedded_json, run_parser
+from src.api.poe_ninja_api import PoeNinjaAPI, NUXT_MARKER, DATA_MARKER
+from src.api.rate_limiter import RateLimiter
+
+
+# Suppress logging during tests
+logging.disable(logging.CRITICAL)
+
+
+def _page(script: str, body: str = "") -> str:
+    return f"<html><head><script>{script}</script></head><body>{body}</body></html>"
+
+
+class TestExtractEmbeddedJson(unittest.TestCase):
+    """Embedded script JSON is decoded without a DOM parse."""
+
+    def test_decodes_value_after_marker(self):
+        payload = {"data": [{"class": "Stormweaver", "note": "a;b</b>"}]}
+        html = _page(f"window.__NUXT__= {json.dumps(payload)};console.log(1)")
+
+        self.assertEqual(extract_embedded_json(html, NUXT_MARKER), payload)
+
+    def test_skips_occurrences_that_are_not_json(self):
+        html = _page("window.__NUXT__=(function(a){return a})(1)") + _page(
+            'window.__NUXT__={"state": {}}'
+        )
+
+        self.assertEqual(extract_embedded_json(html, NUXT_MARKER), {"state": {}})
+        self.assertIsNone(extract_embedded_json(html, DATA_MARKER))
+
+
+class TestParsePool(unittest.IsolatedAsyncioTestCase):
+    """Parsing runs on the pool and falls back to the DOM."""
+
+    async def asyncSetUp(self):
+        self.api = PoeNinjaAPI(rate_limiter=RateLimiter(rate_limit=60000, burst=100))
+        self.addAsyncCleanup(self.api.close)
+        self.addCleanup(html_parsing.shutdown_parse_pool)
+
+    async def test_runs_off_event_loop_thread(self):
+        worker = await run_parser(threading.get_ident)
+        self.assertNotEqual(worker, threading.get_ident())
+
+    async def test_character_page_fast_path(self):
+        html = _page('window.__NUXT__={"data": [{"class": "Titan", "level": 93}]}')
+
+        char = await self.api._parse_character_html(html, "acct", "Char")
+
+        self.assertEqual((char["class"], char["level"]), ("Titan", 93))
+        self.assertEqual(char["source"], "poe.ninja")
+
+    async def test_builds_page_falls_back_to_html(self):
+        html = _page(
+            "window.__NUXT__=(function(){})()",
+            '<div class="build-row">Char</div>'
+        )
+        self.api._extract_build_info = lambda elem: {"character": elem.text, "class": "Titan"}
+
+        builds = await self.api._parse_builds_page(html, None, None, 5)
+
+        self.assertEqual(builds, [{"character": "Char", "class": "Titan"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Unit tests for the shared HTTP client factory
+"""
+
+import unittest
+import logging
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+from src.api.cache_manager import CacheManager
+from src.api.http_client import ConditionalFetcher, HTTPClientFactory, http2_available
+from src.api.poe_ninja_api import PoeNinjaAPI
+from src.analyzer.top_player_fetcher import TopPlayerFetcher
+
+
+# Suppress logging during tests
+logging.disable(logging.CRITICAL)
+
+
+class TestHTTPClientFactory(unittest.IsolatedAsyncioTestCase):
+    """Test pooled client reuse and lifecycle."""
+
+    async def asyncSetUp(self):
+        self.factory = HTTPClientFactory(max_connections=5, keepalive_expiry=10)
+        self.addAsyncCleanup(self.factory.close)
+
+    async def test_profiles_share_one_client(self):
+        first = self.factory.get_client("poe_ninja", headers={"User-Agent": "a"})
+        second = self.factory.get_client("poe_ninja")
+        self.assertIs(first, second)
+        self.assertIsNot(first, self.factory.get_client("trade"))
+        self.assertEqual(self.factory.get_statistics()["clients"], ["poe_ninja", "trade"])
+        self.assertEqual(self.factory.limits.max_connections, 5)
+
+    async def test_conflicting_profile_options_raise(self):
+        client = self.factory.get_client("poe2db", timeout=10.0, follow_redirects=True)
+        # Options left out accept the existing client's
+        self.assertIs(self.factory.get_client("poe2db", timeout=10.0), client)
+        with self.assertRaises(ValueError):
+            self.factory.get_client("poe2db", timeout=30.0)
+        with self.assertRaises(ValueError):
+            self.factory.get_client("poe2db", follow_redirects=False)
+        with self.assertRaises(ValueError):
+            self.factory.get_client("poe2db", headers={"Accept": "*/*"})
+
+    async def test_http2_requires_h2(self):
+        self.assertEqual(HTTPClientFactory(http2=True).http2, http2_available())
+        self.assertFalse(HTTPClientFactory(http2=False).http2)
+
+    async def test_close_closes_every_client(self):
+        client = self.factory.get_client("poe2db")
+        await self.factory.close()
+        self.assertTrue(client.is_closed)
+        # A closed profile is recreated on the next request
+        self.assertFalse(self.factory.get_client("poe2db").is_closed)
+
+    async def test_api_clients_only_close_their_own_factory(self):
+        shared = PoeNinjaAPI(http_clients=self.factory)
+        await shared.close()
+        self.assertFalse(shared.client.is_closed)
+
+        private = PoeNinjaAPI()
+        await private.close()
+        self.assertTrue(private.client.is_closed)
+
+    async def test_top_player_fetcher_reuses_ninja_client(self):
+        fetcher = TopPlayerFetcher(http_clients=self.factory)
+        self.assertIs(fetcher.ninja_api, fetcher.char_fetcher.ninja_api)
+        self.assertIs(fetcher.ninja_api.client, self.factory.get_client("poe_ninja"))
+        self.assertIs(fetcher.char_fetcher.client, self.factory.get_client("browser"))
+
+
+def _response(status: int, headers=None, json=None) -> httpx.Response:
+    return httpx.Response(
+        status, headers=headers, json=json,
+        request=httpx.Request("GET", "https://poe.ninja/api/data/itemoverview")
+    )
+
+
+class TestConditionalFetcher(unittest.IsolatedAsyncioTestCase):
+    """Test ETag / Last-Modified revalidation."""
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = CacheManager(
+            memory_max_bytes=1024 * 1024,
+            sqlite_path=Path(self.tmpdir.name) / "cache.db"
+        )
+        await self.cache.initialize()
+        self.addAsyncCleanup(self.cache.close)
+        self.fetcher = ConditionalFetcher(self.cache, ttl=600)
+        self.parse = mock.Mock(side_effect=lambda response: response.json()["lines"])
+
+    async def test_not_modified_reuses_parsed_page(self):
+        send = mock.AsyncMock(side_effect=[
+            _response(200, {"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"},
+                      {"lines": [{"name": "Headhunter"}]}),
+            _response(304),
+        ])
+
+        first = await self.fetcher.fetch("prices:ninja_page:Standard:UniqueBelt", send, self.parse)
+        second = await self.fetcher.fetch("prices:ninja_page:Standard:UniqueBelt", send, self.parse)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.parse.call_count, 1)
+        self.assertEqual(send.await_args_list[0].args[0], {})
+        self.assertEqual(send.await_args_list[1].args[0], {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Sat, 17 Oct 2026 10:00:00 GMT",
+        })
+        self.assertEqual(self.fetcher.get_statistics(), {"not_modified": 1, "modified": 1})
+
+    async def test_not_modified_extends_ttl(self):
+        key = "prices:ninja_page:Standard:UniqueBelt"
+        send = mock.AsyncMock(return_value=_response(200, {"ETag": '"v1"'}, {"lines": []}))
+        await self.fetcher.fetch(key, send, self.parse)
+
+        with mock.patch.object(self.cache, "set", wraps=self.cache.set) as cache_set:
+            send.return_value = _response(304)
+            await self.fetcher.fetch(key, send, self.parse)
+        cache_set.assert_awaited_once()
+        self.assertEqual(cache_set.await_args.kwargs["ttl"], 600)
+
+    async def test_changed_page_is_parsed_again(self):
+        send = mock.AsyncMock(side_effect=[
+            _response(200, {"ETag": '"v1"'}, {"lines": [1]}),
+            _response(200, {"ETag": '"v2"'}, {"lines": [2]}),
+        ])
+        await self.fetcher.fetch("prices:ninja_page:Standard:Currency", send, self.parse)
+        self.assertEqual(
+            await self.fetcher.fetch("prices:ninja_page:Standard:Currency", send, self.parse), [2]
+        )
+        stored = await self.cache.get("prices:ninja_page:Standard:Currency")
+        self.assertEqual(stored["etag"], '"v2"')
+
+    async def test_pages_without_validators_are_not_stored(self):
+        send = mock.AsyncMock(return_value=_response(200, json={"lines": []}))
+        await self.fetcher.fetch("prices:ninja_page:Standard:Map", send, self.parse)
+        self.assertIsNone(await self.cache.get("prices:ninja_page:Standard:Map"))
+
+    async def test_error_status_raises(self):
+        send = mock.AsyncMock(return_value=_response(503))
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self.fetcher.fetch("prices:ninja_page:Standard:Map", send, self.parse)
+        self.parse.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Unit tests for the ladder snapshot store
+"""
+
+import asyncio
+import tempfile
+import unittest
+import logging
+from pathlib import Path
+from unittest import mock
+
+from src.api.character_fetcher import CharacterFetcher
+from src.api.ladder_snapshot import LadderSnapshotStore
+from src.api.rate_limiter import RateLimiter
+
+
+# Suppress logging during tests
+logging.disable(logging.CRITICAL)
+
+
+def _entry(name, rank, level=90, char_class="Stormweaver", experience=1000):
+    return {
+        "character": name, "account": f"{name}-acct", "level": level, "class": char_class,
+        "rank": rank, "experience": experience, "dead": False, "online": True,
+    }
+
+
+def _api_entry(name, rank, level=90, char_class="Stormweaver"):
+    return {
+        "rank": rank,
+        "account": {"name": f"{name}-acct"},
+        "character": {"name": name, "level": level, "class": char_class, "experience": 1000},
+    }
+
+
+class TestLadderSnapshotStore(unittest.IsolatedAsyncioTestCase):
+    """Test delta refresh and indexed queries."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.store = LadderSnapshotStore(Path(self._tmpdir.name) / "ladder.db")
+        self.addAsyncCleanup(self.store.close)
+
+    async def test_apply_writes_only_changes(self):
+        await self.store.apply("Abyss", [_entry("A", 1), _entry("B", 2), _entry("C", 3)])
+
+        delta = await self.store.apply(
+            "Abyss", [_entry("B", 1), _entry("A", 2), _entry("C", 3), _entry("D", 4)]
+        )
+
+        self.assertEqual(delta, {"added": 1, "updated": 2, "removed": 0, "unchanged": 1})
+        delta = await self.store.apply("Abyss", [_entry("B", 1), _entry("A", 2)])
+        self.assertEqual(delta["removed"], 2)
+        self.assertIsNone(await self.store.find("Abyss", "C"))
+
+    async def test_rank_changes_keep_previous_rank(self):
+        await self.store.apply("Abyss", [_entry("A", 1), _entry("B", 2)])
+        await self.store.apply("Abyss", [_entry("B", 1), _entry("A", 2)])
+
+        conn = await self.store._connection()
+        async with conn.execute(
+            "SELECT character, previous_rank FROM ladder_entries ORDER BY rank"
+        ) as cursor:
+            self.assertEqual(await cursor.fetchall(), [("B", 2), ("A", 1)])
+
+    async def test_query_filters(self):
+        await self.store.apply("Abyss", [
+            _entry("A", 1, level=95),
+            _entry("B", 2, level=80),
+            _entry("C", 3, level=92, char_class="Titan"),
+            _entry("D", 4, level=91),
+        ])
+        await self.store.apply("Standard", [_entry("S", 1)])
+
+        names = lambda entries: [entry["character"] for entry in entries]
+        self.assertEqual(names(await self.store.query("Abyss", min_level=90)), ["A", "C", "D"])
+        self.assertEqual(
+            names(await self.store.query("Abyss", class_filter="Stormweaver")), ["A", "B", "D"]
+        )
+        self.assertEqual(names(await self.store.query("Abyss", min_rank=2, max_rank=3)), ["B", "C"])
+        self.assertEqual(names(await self.store.query("Abyss", limit=2)), ["A", "B"])
+        self.assertIsNone(await self.store.age("Hardcore"))
+        self.assertLess(await self.store.age("Abyss"), 60)
+
+
+class TestSnapshotBackedQueries(unittest.IsolatedAsyncioTestCase):
+    """CharacterFetcher answers ladder queries from the snapshot."""
+
+    async def asyncSetUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.store = LadderSnapshotStore(Path(self._tmpdir.name) / "ladder.db")
+        self.addAsyncCleanup(self.store.close)
+        self.fetcher = CharacterFetcher(
+            rate_limiter=RateLimiter(rate_limit=60000, burst=100),
+            official_rate_limiter=RateLimiter(rate_limit=60000, burst=100),
+            ladder_snapshots=self.store
+        )
+        self.addAsyncCleanup(self.fetcher.close)
+        self.pages = {
+            0: [_api_entry(f"Char{i}", i + 1, level=100 - i) for i in range(200)],
+            200: [_api_entry("Titan1", 201, char_class="Titan")],
+        }
+        self.fetch_page = mock.AsyncMock(side_effect=lambda league, offset: self.pages.get(offset, []))
+        self.fetcher._fetch_ladder_page = self.fetch_page
+
+    async def _background_refreshes(self):
+        await asyncio.gather(*self.fetcher._snapshot_refreshes.values())
+
+    async def test_filter_combinations_share_one_refresh(self):
+        # No snapshot yet: the first query pages the ladder and starts one
+        top = await self.fetcher.get_top_ladder_characters("Abyss", limit=5)
+        await self._background_refreshes()
+        pages_fetched = self.fetch_page.await_count
+        titans = await self.fetcher.get_top_ladder_characters("Abyss", class_filter="Titan")
+        ranked = await self.fetcher.get_top_ladder_characters(
+            "Abyss", min_level=95, min_rank=3, max_rank=10
+        )
+
+        self.assertEqual(self.fetch_page.await_count, pages_fetched)
+        self.assertEqual([entry["character"] for entry in top], [f"Char{i}" for i in range(5)])
+        self.assertEqual(top[0]["account"], "Char0-acct")
+        self.assertNotIn("experience", top[0])
+        self.assertEqual([entry["character"] for entry in titans], ["Titan1"])
+        self.assertEqual([entry["rank"] for entry in ranked], [3, 4, 5, 6])
+
+    async def test_ladder_lookup_uses_snapshot(self):
+        char = await self.fetcher.get_character_from_ladder("Titan1", "Abyss")
+        self.assertEqual(char["class"], "Titan")
+        self.assertEqual(char["rank"], 201)
+        await self._background_refreshes()
+        pages_fetched = self.fetch_page.await_count
+
+        self.assertIsNone(await self.fetcher.get_character_from_ladder("Nobody", "Abyss"))
+        self.assertEqual(self.fetch_page.await_count, pages_fetched)
+
+    async def test_stale_snapshot_refresh_writes_delta(self):
+        await self.fetcher.refresh_ladder_snapshot("Abyss")
+        self.pages[200] = [_api_entry("Titan1", 201, level=95, char_class="Titan")]
+
+        self.assertIsNone(await self.fetcher.refresh_ladder_snapshot("Abyss"))
+        delta = await self.fetcher.refresh_ladder_snapshot("Abyss", force=True)
+        self.assertEqual(delta, {"added": 0, "updated": 1, "removed": 0, "unchanged": 200})
+
+    async def test_failed_refresh_serves_stale_snapshot(self):
+        await self.fetcher.refresh_ladder_snapshot("Abyss")
+        self.fetch_page.side_effect = RuntimeError("ladder down")
+
+        with mock.patch("src.api.character_fetcher.settings.LADDER_SNAPSHOT_TTL", 0):
+            titans = await self.fetcher.get_top_ladder_characters("Abyss", class_filter="Titan")
+            await self._background_refreshes()
+        self.assertEqual([entry["character"] for entry in titans], ["Titan1"])
+
+    async def test_expired_snapshot_refreshes_in_background(self):
+        await self.fetcher.refresh_ladder_snapshot("Abyss")
+        crawl_started = asyncio.Event()
+
+        async def hang(league, offset):
+            crawl_started.set()
+            await asyncio.Event().wait()
+
+        self.fetch_page.side_effect = hang
+        with mock.patch("src.api.character_fetcher.settings.LADDER_SNAPSHOT_TTL", 0):
+            char = await asyncio.wait_for(
+                self.fetcher.get_character_from_ladder("Titan1", "Abyss"), 1
+            )
+            titans = await asyncio.wait_for(
+                self.fetcher.get_top_ladder_characters("Abyss", class_filter="Titan"), 1
+            )
+        await asyncio.wait_for(crawl_started.wait(), 1)
+
+        self.assertEqual(char["rank"], 201)
+        self.assertEqual([entry["character"] for entry in titans], ["Titan1"])
+        refreshes = list(self.fetcher._snapshot_refreshes.values())
+        self.assertEqual(len(refreshes), 1)
+
+        await self.fetcher.close()
+        self.assertTrue(refreshes[0].cancelled())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,381 @@
+"""
+Unit tests for the API rate limiters
+"""
+
+import asyncio
+import tempfile
+import time
+import unittest
+import logging
+from unittest import mock
+
+from src.api.rate_limit_backend import SQLiteRateLimitBackend, create_rate_limit_backend
+from src.api.rate_limiter import (
+    HeaderRateLimiter, MultiRateLimiter, RateLimiter, request_priority
+)
+
+
+# Suppress logging during tests
+logging.disable(logging.CRITICAL)
+
+
+class VirtualClockMixin:
+    """Run the limiter on a fake clock that asyncio.sleep() advances."""
+
+    def start_virtual_clock(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def sleep(seconds):
+            # Let woken waiters run before time moves on
+            self.sleeps.append(seconds)
+            await real_sleep(0)
+            self.now += max(0.0, seconds)
+
+        for target, side_effect in (
+            ("src.api.rate_limiter.time.monotonic", lambda: self.now),
+            ("src.api.rate_limiter.asyncio.sleep", sleep),
+        ):
+            patcher = mock.patch(target, side_effect=side_effect)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def acquire_all(self, limiter, requests):
+        """Acquire concurrently, returns [(label, virtual send time)] in grant order"""
+        granted = []
+
+        async def request(label, kwargs):
+            await limiter.acquire(**kwargs)
+            granted.append((label, self.now))
+
+        # Tasks start in creation order, so they queue up in list order
+        await asyncio.gather(*(request(label, kwargs) for label, kwargs in requests))
+        return granted
+
+
+class TestRateLimiter(VirtualClockMixin, unittest.IsolatedAsyncioTestCase):
+    """Test the GCRA token bucket."""
+
+    async def test_concurrent_waiters_get_evenly_spaced_fifo_slots(self):
+        self.start_virtual_clock()
+        limiter = RateLimiter(rate_limit=600, burst=2)  # one request per 0.1s
+
+        granted = await self.acquire_all(limiter, [(i, {}) for i in range(50)])
+
+        # Two burst tokens, then exactly one request per interval, in FIFO order
+        self.assertEqual([label for label, _ in granted], list(range(50)))
+        expected = [0.0, 0.0] + [0.1 * n for n in range(1, 49)]
+        for (_, sent), slot in zip(granted, expected):
+            self.assertAlmostEqual(sent - 1000.0, slot, places=9)
+        self.assertEqual(limiter.total_requests, 50)
+
+    async def test_aggregate_throughput_matches_rate(self):
+        limiter = RateLimiter(rate_limit=1200, burst=1)  # one request per 0.05s
+        send_times = []
+
+        async def request():
+            await limiter.acquire()
+            send_times.append(time.monotonic())
+
+        started = time.monotonic()
+        await asyncio.gather(*(request() for _ in range(10)))
+
+        # 9 intervals after the first request, never faster
+        elapsed = max(send_times) - started
+        self.assertGreaterEqual(elapsed, 0.45 - 0.005)
+        self.assertLess(elapsed, 0.45 + 0.1)
+        gaps = [b - a for a, b in zip(send_times, send_times[1:])]
+        self.assertGreaterEqual(min(gaps), 0.05 - 0.005)
+
+    async def test_lock_is_not_held_while_waiting(self):
+        limiter = RateLimiter(rate_limit=60, burst=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        self.assertFalse(limiter._lock.locked())
+
+        # A cancelled waiter never takes a slot
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertAlmostEqual(limiter._tat - time.monotonic(), 1.0, delta=0.05)
+        self.assertEqual(limiter.get_statistics()["lanes"]["normal"]["queued"], 0)
+
+    async def test_backoff_stretches_the_interval(self):
+        limiter = RateLimiter(rate_limit=600, burst=1)
+        limiter.record_failure()  # 2x backoff
+
+        await limiter.acquire()
+        started = time.monotonic()
+        await limiter.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.195)
+
+
+class TestPriorityLanes(VirtualClockMixin, unittest.IsolatedAsyncioTestCase):
+    """Test interactive/normal/background lanes."""
+
+    def setUp(self):
+        self.start_virtual_clock()
+
+    async def test_interactive_waiters_are_served_first(self):
+        limiter = RateLimiter(rate_limit=60, burst=1)
+        await limiter.acquire()
+
+        granted = await self.acquire_all(limiter, [
+            ("bg1", {"priority": "background"}),
+            ("bg2", {"priority": "background"}),
+            ("normal", {}),
+            ("ui1", {"priority": "interactive"}),
+            ("ui2", {"priority": "interactive"}),
+        ])
+
+        self.assertEqual(
+            [label for label, _ in granted], ["ui1", "ui2", "normal", "bg1", "bg2"]
+        )
+        # Priorities reorder requests, they don't add any
+        self.assertAlmostEqual(granted[-1][1] - 1000.0, 5.0)
+
+    async def test_background_wait_is_bounded(self):
+        limiter = RateLimiter(rate_limit=60, burst=1, starvation_timeout=5)
+        await limiter.acquire()
+
+        granted = await self.acquire_all(
+            limiter,
+            [("bg", {"priority": "background"})]
+            + [(f"ui{i}", {"priority": "interactive"}) for i in range(20)]
+        )
+
+        position, sent = next(
+            (index, sent) for index, (label, sent) in enumerate(granted) if label == "bg"
+        )
+        self.assertEqual(position, 4)
+        self.assertAlmostEqual(sent - 1000.0, 5.0)
+
+    async def test_request_priority_context(self):
+        limiter = RateLimiter(rate_limit=60, burst=1)
+        await limiter.acquire()
+
+        async def interactive():
+            with request_priority("interactive"):
+                await limiter.acquire()
+            return self.now
+
+        background = asyncio.create_task(limiter.acquire(priority="background"))
+        await asyncio.sleep(0)
+        interactive_sent = await interactive()
+
+        self.assertFalse(background.done())
+        await background
+        self.assertLess(interactive_sent, self.now)
+
+        with self.assertRaises(ValueError):
+            with request_priority("urgent"):
+                pass
+
+    async def test_lane_statistics(self):
+        limiter = RateLimiter(rate_limit=60, burst=1)
+        await limiter.acquire()
+        tasks = [
+            asyncio.create_task(limiter.acquire(priority="background")) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        lanes = limiter.get_statistics()["lanes"]
+        self.assertEqual(lanes["background"]["queued"], 3)
+        self.assertEqual(lanes["normal"]["served"], 1)
+
+        await asyncio.gather(*tasks)
+        lanes = limiter.get_statistics()["lanes"]
+        self.assertEqual(lanes["background"]["queued"], 0)
+        self.assertEqual(lanes["background"]["served"], 3)
+        self.assertAlmostEqual(lanes["background"]["average_wait_time"], 2.0)
+        self.assertAlmostEqual(lanes["background"]["max_wait_time"], 3.0)
+
+
+TRADE_HEADERS = {
+    "X-Rate-Limit-Policy": "trade-search-request-limit",
+    "X-Rate-Limit-Rules": "Ip",
+    "X-Rate-Limit-Ip": "3:10:60,15:60:120",
+    "X-Rate-Limit-Ip-State": "1:10:0,1:60:0",
+}
+
+
+class TestHeaderRateLimiter(VirtualClockMixin, unittest.IsolatedAsyncioTestCase):
+    """Test header-driven rate limiting."""
+
+    def setUp(self):
+        self.start_virtual_clock()
+
+    def test_parses_policy_rules(self):
+        limiter = HeaderRateLimiter()
+        limiter.update_from_headers(TRADE_HEADERS, "search")
+
+        policy = limiter.get_statistics()["policies"]["search"]
+        self.assertEqual(policy["name"], "trade-search-request-limit")
+        self.assertEqual(policy["rules"], {"ip:10s": "1/3", "ip:60s": "1/15"})
+
+    async def test_runs_up_to_the_rule_limit(self):
+        limiter = HeaderRateLimiter(rate_limit=1, window_padding=0.5)
+        limiter.update_from_headers({**TRADE_HEADERS, "X-Rate-Limit-Ip-State": "0:10:0"}, "search")
+
+        for _ in range(3):
+            await limiter.acquire("search")
+        self.assertEqual(self.sleeps, [])
+
+        # The fourth request has to wait for the 10s window to roll over
+        await limiter.acquire("search")
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertAlmostEqual(self.sleeps[0], 10.5, delta=0.1)
+
+    async def test_priority_applies_to_policies(self):
+        limiter = HeaderRateLimiter(window_padding=0)
+        limiter.update_from_headers(
+            {**TRADE_HEADERS, "X-Rate-Limit-Ip-State": "3:10:0,3:60:0"}, "search"
+        )
+
+        granted = await self.acquire_all(limiter, [
+            ("bg", {"policy": "search", "priority": "background"}),
+            ("ui", {"policy": "search", "priority": "interactive"}),
+        ])
+
+        self.assertEqual([label for label, _ in granted], ["ui", "bg"])
+
+    async def test_server_state_counts_unseen_requests(self):
+        limiter = HeaderRateLimiter()
+        limiter.update_from_headers(
+            {**TRADE_HEADERS, "X-Rate-Limit-Ip-State": "3:10:0,3:60:0"}, "search"
+        )
+
+        await limiter.acquire("search")
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertGreater(self.sleeps[0], 9)
+
+    async def test_restriction_and_retry_after_block_the_policy(self):
+        limiter = HeaderRateLimiter()
+        limiter.update_from_headers(
+            {**TRADE_HEADERS, "X-Rate-Limit-Ip-State": "4:10:60,4:60:0", "Retry-After": "60"},
+            "search"
+        )
+
+        await limiter.acquire("search")
+        self.assertAlmostEqual(self.sleeps[0], 60, delta=0.5)
+
+        # Other policies are not affected
+        limiter.update_from_headers(TRADE_HEADERS, "fetch")
+        self.sleeps.clear()
+        await limiter.acquire("fetch")
+        self.assertEqual(self.sleeps, [])
+
+    async def test_unknown_policy_uses_token_bucket(self):
+        limiter = HeaderRateLimiter(rate_limit=60, burst=1)
+
+        await limiter.acquire("ladder")
+        await limiter.acquire("ladder")
+
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertAlmostEqual(self.sleeps[0], 1.0, delta=0.1)
+
+    async def test_plain_limiter_honors_retry_after(self):
+        limiter = RateLimiter(rate_limit=600, burst=5)
+        limiter.update_from_headers({"Retry-After": "5"})
+
+        await limiter.acquire()
+
+        self.assertAlmostEqual(self.sleeps[0], 5, delta=0.1)
+        self.assertLessEqual(limiter.blocked_until, time.monotonic() + 5)
+
+
+class TestSharedBackend(unittest.IsolatedAsyncioTestCase):
+    """Test coordinating limiters through a shared SQLite backend."""
+
+    async def asyncSetUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = f"{tmp.name}/rate_limits.db"
+        self.backends = []
+
+    async def asyncTearDown(self):
+        for backend in self.backends:
+            await backend.close()
+
+    def process_limiter(self, **kwargs) -> RateLimiter:
+        """A limiter as another server process would build it"""
+        backend = SQLiteRateLimitBackend(self.path)
+        self.backends.append(backend)
+        return RateLimiter(backend=backend, name="poe_ninja", **kwargs)
+
+    async def test_processes_share_one_budget(self):
+        first = self.process_limiter(rate_limit=600, burst=1)  # one request per 0.1s
+        second = self.process_limiter(rate_limit=600, burst=1)
+        send_times = []
+
+        async def request(limiter):
+            await limiter.acquire()
+            send_times.append(time.monotonic())
+
+        started = time.monotonic()
+        await asyncio.gather(*(request(limiter) for limiter in (first, second) * 2))
+
+        # Each limiter alone would send its two requests 0.1s apart; together
+        # they are paced as one limiter
+        self.assertGreaterEqual(max(send_times) - started, 0.3 - 0.01)
+
+    async def test_restarted_process_keeps_budget_and_backoff(self):
+        before = self.process_limiter(rate_limit=60, burst=1)
+        await before.acquire()
+        before.record_failure()
+        before.update_from_headers({"Retry-After": "30"})
+        await before.close()
+
+        after = self.process_limiter(rate_limit=60, burst=1)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(after.acquire(), timeout=0.2)
+
+        self.assertEqual(after.consecutive_failures, 1)
+        self.assertAlmostEqual(after.blocked_until - time.monotonic(), 30, delta=1)
+        # The shared bucket also still holds the first process's request
+        wait_time = await after.backend.take("poe_ninja", 1.0, 0.0)
+        self.assertAlmostEqual(wait_time, 30, delta=1)
+
+    def test_memory_backend_is_in_process(self):
+        self.assertIsNone(create_rate_limit_backend("memory"))
+        self.assertIsNone(create_rate_limit_backend("redis", redis_client=None))
+        with self.assertRaises(ValueError):
+            create_rate_limit_backend("etcd")
+
+
+class TestMultiRateLimiter(unittest.TestCase):
+    """Test the per-host limiter registry."""
+
+    def setUp(self):
+        self.registry = MultiRateLimiter.from_config({
+            "poe_official": {"base_url": "https://www.pathofexile.com/api", "rate_limit": 12},
+            "poe_ninja": {"base_url": "https://poe.ninja/api/data", "rate_limit": 40, "burst": 5},
+        })
+
+    def test_limits_come_from_config(self):
+        ninja = self.registry.for_url("https://poe.ninja/poe2/api/builds")
+        self.assertEqual(ninja.rate_limit, 40)
+        self.assertEqual(ninja.max_tokens, 5)
+        # Unconfigured keys keep the built-in defaults
+        self.assertEqual(self.registry.get_limiter("poe2db").rate_limit, 30)
+
+    def test_same_host_shares_one_limiter(self):
+        ladder = self.registry.for_url("https://www.pathofexile.com/api/ladders/Abyss")
+        trade = self.registry.for_url("https://www.pathofexile.com/api/trade2/search")
+        self.assertIs(ladder, trade)
+        self.assertIsInstance(ladder, HeaderRateLimiter)
+        self.assertEqual(ladder.rate_limit, 12)
+        self.assertIsNot(ladder, self.registry.for_url("https://poe.ninja/"))
+
+    def test_unknown_host_gets_own_limiter(self):
+        limiter = self.registry.for_url("https://example.com/data")
+        self.assertEqual(limiter.rate_limit, self.registry.default_rate_limit)
+        self.assertIn("example.com", self.registry.get_statistics())
+
+
+if __name__ == "__main__":
+    unittest.main()
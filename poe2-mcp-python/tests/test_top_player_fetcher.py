@@ -0,0 +1,105 @@
+"""
+Unit tests for the top player discovery pipeline
+"""
+
+import asyncio
+import unittest
+import logging
+
+from src.analyzer.top_player_fetcher import TopPlayerFetcher
+from src.api.rate_limiter import RateLimiter
+
+
+# Suppress logging during tests
+logging.disable(logging.CRITICAL)
+
+
+class TestSimilarPlayerSearch(unittest.IsolatedAsyncioTestCase):
+    """Ladder pages stream into concurrent fetches that stop early."""
+
+    USER = {"name": "Me", "level": 90, "class": "Unknown", "skills": ["Spark"]}
+
+    async def asyncSetUp(self):
+        self.fetcher = TopPlayerFetcher(rate_limiter=RateLimiter(rate_limit=60000, burst=100))
+        self.addAsyncCleanup(self.fetcher.char_fetcher.close)
+        self.fetcher.comparator.extract_main_skills = lambda char: set(char.get("skills", []))
+
+        self.pages_fetched = 0
+        self.looked_up = []
+        self.cancelled = []
+        # character name -> (seconds to fetch, skills)
+        self.characters = {}
+
+        async def pages(league, limit, min_level, class_filter):
+            names = list(self.characters)
+            for start in range(0, len(names), 4):
+                self.pages_fetched += 1
+                yield [
+                    {"account": "acct", "character": name, "level": 95, "rank": start + i + 1}
+                    for i, name in enumerate(names[start:start + 4])
+                ]
+
+        async def lookup(account, character, league, **kwargs):
+            self.looked_up.append(character)
+            delay, skills = self.characters[character]
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.cancelled.append(character)
+                raise
+            return {"name": character, "level": 95, "skills": skills}, ""
+
+        self.fetcher.char_fetcher.iter_top_ladder_pages = pages
+        self.fetcher.char_fetcher._lookup_character = lookup
+
+    async def test_stops_at_limit(self):
+        self.characters = {
+            "A": (0.01, ["Spark"]),
+            "B": (0.01, ["Spark"]),
+            "C": (5, ["Spark"]),
+            "D": (5, ["Spark"]),
+        }
+        for i in range(12):
+            self.characters[f"Later{i}"] = (5, ["Fireball"])
+
+        found, complete = await self.fetcher.find_similar_top_players(self.USER, limit=2, deadline=0)
+
+        self.assertEqual([char["name"] for char in found], ["A", "B"])
+        self.assertTrue(complete)
+        self.assertTrue({"C", "D"} <= set(self.cancelled))
+        # Pages are pulled only as the workers catch up, so the last one
+        # was never fetched
+        self.assertLess(self.pages_fetched, 4)
+        self.assertNotIn("Later11", self.looked_up)
+
+    async def test_deadline_returns_partial_results(self):
+        self.characters = {
+            "Slow": (5, ["Spark"]),
+            "Fast": (0, ["Spark"]),
+            "Slower": (5, ["Spark"]),
+        }
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        found, complete = await self.fetcher.find_similar_top_players(self.USER, limit=3, deadline=0.2)
+
+        self.assertLess(loop.time() - started, 1)
+        self.assertEqual([char["name"] for char in found], ["Fast"])
+        self.assertFalse(complete)
+        self.assertEqual(sorted(self.cancelled), ["Slow", "Slower"])
+
+    async def test_results_follow_ladder_order(self):
+        self.characters = {
+            "First": (0.05, ["Spark"]),
+            "Other": (0, ["Fireball"]),
+            "Second": (0, ["Spark"]),
+        }
+
+        found, complete = await self.fetcher.find_similar_top_players(self.USER, limit=5, deadline=0)
+
+        self.assertEqual([char["name"] for char in found], ["First", "Second"])
+        self.assertTrue(complete)
+
+
+if __name__ == "__main__":
+    unittest.main()